@@ -0,0 +1,6 @@
+-- This statement applies every campground update of a bulk write-back with one joined UPDATE
+
+UPDATE b
+SET b.campground_id = u.campground_id
+FROM camping.booking b
+JOIN #campground_updates u ON b.booking_id = u.booking_id;
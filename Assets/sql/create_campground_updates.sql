@@ -0,0 +1,3 @@
+-- This statement creates the session temp table that holds the campground updates of a bulk write-back
+
+CREATE TABLE #campground_updates (booking_id INT PRIMARY KEY, campground_id INT NOT NULL);
@@ -0,0 +1,3 @@
+-- This statement drops the write-back temp table once the updates are applied
+
+DROP TABLE #campground_updates;
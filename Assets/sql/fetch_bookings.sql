@@ -14,4 +14,6 @@ FROM
 JOIN 
     camping.customers c ON b.customer_id = c.customer_id  -- Join customers to bookings based on customer_id
 WHERE 
-    b.campground_id = ?  -- Placeholder for the campground_id to be supplied when executing the query
+    b.campground_id = /*campground_id*/1  -- Placeholder for the campground_id to be supplied when executing the query
+ORDER BY 
+    b.booking_id;                  -- Booking order, so the last row is the new ingestion checkpoint
@@ -0,0 +1,3 @@
+-- This statement adds one (booking_id, campground_id) row to the write-back temp table; it is run with executemany
+
+INSERT INTO #campground_updates (booking_id, campground_id) VALUES (?, ?);
@@ -0,0 +1,7 @@
+-- This query finds the highest booking_id of a campground after a high-water mark, the end of the key ranges for parallel extraction
+
+SELECT MAX(booking_id)
+FROM camping.booking
+WHERE 
+    campground_id = /*campground_id*/1            -- Placeholder for the campground_id
+    AND booking_id > /*after_booking_id*/0;       -- Placeholder for the last booking_id already processed
@@ -0,0 +1,6 @@
+-- SQLite version of apply_campground_updates.sql: UPDATE ... FROM names the target table rather than an alias
+
+UPDATE camping.booking
+SET campground_id = u.campground_id
+FROM campground_updates u
+WHERE booking.booking_id = u.booking_id;
@@ -0,0 +1,3 @@
+-- SQLite version of create_campground_updates.sql: temp tables are created with TEMP instead of a # prefix
+
+CREATE TEMP TABLE campground_updates (booking_id INTEGER PRIMARY KEY, campground_id INT NOT NULL);
@@ -0,0 +1,35 @@
+-- SQLite version of the camping schema, used by the local backend for load testing without Azure SQL (see Database/sql_backend.py)
+-- The database file is attached as 'camping', so the tables keep their camping.* names
+
+-- Create the 'customers' table if it does not exist
+CREATE TABLE IF NOT EXISTS camping.customers (
+    customer_id INTEGER PRIMARY KEY,            -- Primary key with auto-increment (rowid alias)
+    first_name VARCHAR(255) NOT NULL,           -- Customer's first name
+    last_name VARCHAR(255) NOT NULL,            -- Customer's last name
+    phone VARCHAR(25) NULL,                     -- Customer's phone number (optional)
+    address VARCHAR(255) NULL,                  -- Customer's address (optional)
+    post_code VARCHAR(4) NULL                   -- Customer's postal code (optional)
+);
+
+-- Create the 'booking' table if it does not exist
+CREATE TABLE IF NOT EXISTS camping.booking (
+    booking_id INTEGER PRIMARY KEY,                                 -- Primary key with auto-increment (rowid alias)
+    customer_id INT NULL REFERENCES customers(customer_id),         -- Foreign key referencing 'customers' table
+    booking_date DATE NOT NULL,                                     -- Date when the booking was made (YYYY-MM-DD)
+    arrival_date DATE NOT NULL,                                     -- Customer's arrival date (YYYY-MM-DD)
+    campground_id INT NOT NULL,                                     -- Identifier of the campground
+    campsite_size VARCHAR(10),                                      -- Size category of the campsite (e.g., 'Small', 'Medium', 'Large')
+    num_campsites INT                                               -- Number of campsites booked
+);
+
+-- Index the campground's bookings in booking_id order, as every bookings query reads them
+CREATE INDEX IF NOT EXISTS camping.booking_campground_booking_id ON booking (campground_id, booking_id);
+
+-- Create the 'summary' table if it does not exist
+CREATE TABLE IF NOT EXISTS camping.summary (
+    summary_id INTEGER PRIMARY KEY,             -- Primary key with auto-increment (rowid alias)
+    campground_id INT NOT NULL,                 -- Identifier of the campground
+    summary_date DATE NOT NULL,                 -- Date of the summary
+    total_sales DECIMAL(10, 2) NOT NULL,        -- Total sales amount for the day
+    total_bookings INT NOT NULL                 -- Total number of bookings for the day
+);
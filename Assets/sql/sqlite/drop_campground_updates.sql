@@ -0,0 +1,3 @@
+-- SQLite version of drop_campground_updates.sql
+
+DROP TABLE campground_updates;
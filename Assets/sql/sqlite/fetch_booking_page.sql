@@ -0,0 +1,22 @@
+-- SQLite version of fetch_booking_page.sql: the row limit is a LIMIT clause instead of TOP
+
+SELECT 
+    b.booking_id,                  -- Booking identifier
+    b.customer_id,                 -- Customer identifier associated with the booking
+    b.booking_date,                -- Date when the booking was made
+    b.arrival_date,                -- Customer's arrival date
+    b.campground_id,               -- Identifier of the campground where the booking was made
+    b.campsite_size,               -- Size category of the campsite booked (e.g., 'Small', 'Medium', 'Large')
+    b.num_campsites,               -- Number of campsites booked
+    CONCAT(c.first_name, ' ', c.last_name) AS customer_name  -- Full name of the customer (first and last name concatenated)
+FROM 
+    camping.booking b
+JOIN 
+    camping.customers c ON b.customer_id = c.customer_id  -- Join customers to bookings based on customer_id
+WHERE 
+    b.campground_id = /*campground_id*/1          -- Placeholder for the campground_id
+    AND b.booking_id > /*after_booking_id*/0      -- The page starts after the last booking_id seen
+    AND b.booking_id <= /*last_booking_id*/5000   -- The page ends with the key range
+ORDER BY 
+    b.booking_id
+LIMIT /*page_size*/5000;           -- Maximum number of rows in the page
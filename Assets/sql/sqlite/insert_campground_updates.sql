@@ -0,0 +1,3 @@
+-- SQLite version of insert_campground_updates.sql
+
+INSERT INTO campground_updates (booking_id, campground_id) VALUES (?, ?);
@@ -0,0 +1,5 @@
+-- This query moves a single booking to a new campground
+
+UPDATE camping.booking 
+SET campground_id = /*campground_id*/1121132      -- Placeholder for the new campground ID
+WHERE booking_id = /*booking_id*/1;               -- Placeholder for the booking to update
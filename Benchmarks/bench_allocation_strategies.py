@@ -0,0 +1,81 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from Models.allocation_strategy import ALLOCATION_STRATEGIES, get_allocation_strategy
+from Models.booking import Booking
+from Utils.campsite_manager import initialize_campsites
+
+def synthetic_bookings(count, weeks, seed):
+    """
+    Generates an oversubscribed workload with skewed sizes and mixed group sizes.
+
+    :param count: Number of bookings to generate.
+    :param weeks: Number of weeks the arrivals are spread over.
+    :param seed: Random seed so every strategy sees the same workload.
+    :return: List of Booking objects.
+    """
+    rng = random.Random(seed)
+    season_start = datetime(2026, 1, 3)
+    return [
+        Booking(booking_id, booking_id, season_start,
+                season_start + timedelta(days=rng.randrange(weeks * 7)),
+                rng.choices(('Small', 'Medium', 'Large'), weights=(5, 3, 2))[0],
+                rng.choice((1, 1, 2, 3, 4, 6)))
+        for booking_id in range(count)
+    ]
+
+def run_strategy(name, vectorized, count, weeks, sites_per_size, seed):
+    """
+    Runs one strategy on a fresh inventory.
+
+    :param name: Strategy name.
+    :param vectorized: Use the vectorized engine (greedy only).
+    :param count: Number of bookings.
+    :param weeks: Number of weeks in the season.
+    :param sites_per_size: Number of sites of each size.
+    :param seed: Workload seed.
+    :return: Tuple (seconds, allocated bookings, allocated sites, revenue).
+    """
+    bookings = synthetic_bookings(count, weeks, seed)
+    layout = (('Small', sites_per_size, 50), ('Medium', sites_per_size, 60), ('Large', sites_per_size, 70))
+    campsites = initialize_campsites(layout)
+    strategy = get_allocation_strategy(name, vectorized=vectorized)
+    started = time.perf_counter()
+    results = strategy.allocate(bookings, campsites)
+    elapsed = time.perf_counter() - started
+    allocated = [sites for sites in results if sites]
+    revenue = sum(booking.total_cost for booking, sites in zip(bookings, results) if sites)
+    return elapsed, len(allocated), sum(map(len, allocated)), revenue
+
+def main():
+    """
+    Compares solve time and revenue of every allocation strategy on the same workload.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark campsite allocation strategies.")
+    parser.add_argument('--bookings', type=int, default=10_000)
+    parser.add_argument('--weeks', type=int, default=52)
+    parser.add_argument('--sites-per-size', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    # Allocation logging would dominate the timings
+    logging.disable(logging.CRITICAL)
+
+    runs = [(name, False) for name in ALLOCATION_STRATEGIES] + [('greedy', True)]
+    print(f"{'strategy':>20} {'time (s)':>9} {'bookings':>9} {'sites':>8} {'revenue':>12}")
+    for name, vectorized in runs:
+        elapsed, bookings, sites, revenue = run_strategy(name, vectorized, args.bookings, args.weeks,
+                                                         args.sites_per_size, args.seed)
+        label = f"{name} (vectorized)" if vectorized else name
+        print(f"{label:>20} {elapsed:>9.2f} {bookings:>9} {sites:>8} {revenue:>12,.0f}")
+
+if __name__ == '__main__':
+    main()
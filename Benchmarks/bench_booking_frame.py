@@ -0,0 +1,110 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from Models.booking import Booking
+from Models.booking_frame import BookingFrame
+from Utils.campsite_manager import initialize_campsites
+from Utils.summary_manager import generate_summary
+
+def synthetic_documents(count, seed, sites=30):
+    """
+    Generates allocated booking documents in the Booking.to_dict format.
+
+    :param count: Number of documents.
+    :param seed: Random seed.
+    :param sites: Number of campsites allocations are spread over.
+    :return: List of booking dictionaries, about one in ten unallocated.
+    """
+    rng = random.Random(seed)
+    season_start = datetime(2026, 1, 3)
+    documents = []
+    for booking_id in range(count):
+        arrival_date = season_start + timedelta(days=rng.randrange(364))
+        allocated = rng.random() >= 0.1
+        first_site = rng.randrange(1, sites)
+        documents.append({
+            "booking_id": booking_id,
+            "customer_id": rng.randrange(1, 50_000),
+            "booking_date": arrival_date - timedelta(days=rng.randrange(1, 90)),
+            "arrival_date": arrival_date,
+            "campsite_size": rng.choice(('Small', 'Medium', 'Large')),
+            "num_campsites": 1,
+            "campground_id": 1121132,
+            "campsite_id": first_site if allocated else None,
+            "campsite_allocations": [first_site] if allocated else [],
+            "total_cost": 420 if allocated else 0
+        })
+    return documents
+
+def legacy_summary(bookings, campsites):
+    """
+    Computes the summary totals with the per-booking loops generate_summary used before BookingFrame.
+
+    :param bookings: List of Booking objects.
+    :param campsites: List of Campsite objects.
+    :return: Tuple (total sales, successful allocations, utilization dictionary).
+    """
+    total_sales = sum(booking.total_cost for booking in bookings if booking.campsite_id is not None)
+    successful_allocations = sum(1 for booking in bookings if booking.campsite_id is not None)
+    utilization = {c.site_number: {'size': c.size, 'rate_per_night': c.rate_per_night, 'bookings_count': 0}
+                   for c in campsites}
+    for booking in bookings:
+        if booking.campsite_id is not None:
+            for site_number in booking.campsite_allocations or [booking.campsite_id]:
+                utilization[site_number]['bookings_count'] += 1
+    return total_sales, successful_allocations, utilization
+
+def timed(function, *args, repeats=3):
+    """
+    Times a function, keeping the best of several calls.
+
+    :return: Tuple (seconds, result).
+    """
+    best = None
+    for _ in range(repeats):
+        started = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def main():
+    """
+    Reports the time to summarize a booking run with Python loops and with a BookingFrame.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark booking summaries over a BookingFrame.")
+    parser.add_argument('--bookings', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--repeats', type=int, default=3, help="Calls per step; the fastest is reported.")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    documents = synthetic_documents(args.bookings, args.seed)
+    bookings = Booking.from_dicts(documents)
+    campsites = initialize_campsites()
+
+    loop_time, (loop_sales, _, _) = timed(legacy_summary, bookings, campsites, repeats=args.repeats)
+    view_time, view = timed(BookingFrame.summary_view, bookings, repeats=args.repeats)
+    build_time, _ = timed(BookingFrame.from_bookings, bookings, repeats=args.repeats)
+    docs_time, frame = timed(BookingFrame.from_dicts, documents, repeats=args.repeats)
+    frame_time, summary = timed(generate_summary, frame, campsites, repeats=args.repeats)
+    assert summary['total_sales'] == loop_sales == generate_summary(view, campsites)['total_sales']
+
+    print(f"{'step':>32} {'time (s)':>9}")
+    print(f"{'summary, Python loops':>32} {loop_time:>9.3f}")
+    print(f"{'summary, BookingFrame':>32} {frame_time:>9.3f}")
+    print(f"{'summary view of Booking objects':>32} {view_time:>9.3f}")
+    print(f"{'frame from Booking objects':>32} {build_time:>9.3f}")
+    print(f"{'frame from documents':>32} {docs_time:>9.3f}")
+    print(f"Summary speedup on an existing frame: {loop_time / frame_time:.0f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import gc
+import logging
+import random
+import tracemalloc
+from datetime import datetime, timedelta
+from Models.booking import Booking
+from Models.booking_frame import BookingFrame
+
+class LegacyBooking:
+    """
+    Dict-backed booking with the same attributes as Booking, as it was before __slots__.
+    """
+
+    def __init__(self, booking_id, customer_id, booking_date, arrival_date, campsite_size, num_campsites,
+                 campground_id=None, customer_name=None):
+        self.booking_id = booking_id
+        self.customer_id = customer_id
+        self.booking_date = booking_date
+        self.arrival_date = arrival_date
+        self.campsite_size = campsite_size
+        self.num_campsites = num_campsites
+        self.campground_id = campground_id
+        self.campsite_id = None
+        self.campsite_allocations = []
+        self.total_cost = 0
+        self.customer_name = customer_name
+
+def synthetic_records(count, seed):
+    """
+    Generates Head Office style booking records with a fresh object for every field, as a database driver returns them.
+
+    :param count: Number of records to generate.
+    :param seed: Random seed.
+    :return: Generator of record tuples in from_db_record order.
+    """
+    rng = random.Random(seed)
+    season_start = datetime(2026, 1, 3)
+    for booking_id in range(count):
+        arrival_date = season_start + timedelta(days=rng.randrange(364))
+        # join builds a new size string per record, as a driver would
+        yield (booking_id, rng.randrange(1, 50_000), arrival_date - timedelta(days=rng.randrange(1, 90)),
+               arrival_date, 1121132, ''.join(rng.choice(('Small', 'Medium', 'Large'))), rng.choice((1, 1, 2, 3)),
+               f"Customer {rng.randrange(1_000_000)}")
+
+def allocate_site(booking, site_number):
+    """
+    Records a single-site allocation the way update_campsite_info does.
+
+    :param booking: Booking-like object.
+    :param site_number: Allocated site number.
+    """
+    booking.campsite_id = site_number
+    booking.campsite_allocations = [site_number]
+    booking.total_cost = 60 * 7 * booking.num_campsites
+
+def build_legacy(records):
+    """
+    Builds dict-backed LegacyBooking objects from records, each allocated one site.
+
+    :param records: Iterable of booking records.
+    :return: The collection of bookings.
+    """
+    bookings = []
+    for record in records:
+        booking = LegacyBooking(record[0], record[1], record[2], record[3], record[5], record[6], record[4], record[7])
+        allocate_site(booking, record[0] % 30 + 1)
+        bookings.append(booking)
+    return bookings
+
+def build_slotted(records):
+    """
+    Builds slotted Booking objects from records, each allocated one site.
+
+    :param records: Iterable of booking records.
+    :return: The collection of bookings.
+    """
+    bookings = []
+    for record in records:
+        booking = Booking.from_db_record(record)
+        allocate_site(booking, record[0] % 30 + 1)
+        bookings.append(booking)
+    return bookings
+
+def build_frame(records):
+    """
+    Builds a BookingFrame from records, each allocated one site.
+
+    :param records: Iterable of booking records.
+    :return: The collection of bookings.
+    """
+    return BookingFrame.from_bookings(build_slotted(records))
+
+def measure(build, count, seed):
+    """
+    Measures the memory still held after building a collection of bookings.
+
+    :param build: Function building the collection from records.
+    :param count: Number of bookings.
+    :param seed: Workload seed.
+    :return: Bytes per booking.
+    """
+    gc.collect()
+    tracemalloc.start()
+    collection = build(synthetic_records(count, seed))
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del collection
+    return held / count
+
+def main():
+    """
+    Reports bytes per booking for dict-backed objects, slotted Booking objects and a BookingFrame.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the memory used per booking.")
+    parser.add_argument('--records', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'representation':>16} {'bytes/booking':>14} {'MiB total':>10}")
+    for label, build in (('dict-backed', build_legacy), ('__slots__', build_slotted), ('BookingFrame', build_frame)):
+        per_booking = measure(build, args.records, args.seed)
+        print(f"{label:>16} {per_booking:>14.0f} {per_booking * args.records / 2 ** 20:>10.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from Models.booking import Booking, parse_iso_date
+
+def synthetic_documents(count, seed):
+    """
+    Generates Cosmos DB style booking documents with ISO date strings.
+
+    :param count: Number of documents.
+    :param seed: Random seed.
+    :return: List of booking dictionaries.
+    """
+    rng = random.Random(seed)
+    season_start = datetime(2026, 1, 3)
+    documents = []
+    for booking_id in range(count):
+        arrival_date = season_start + timedelta(days=rng.randrange(364))
+        site = rng.randrange(1, 31)
+        documents.append({
+            "booking_id": booking_id,
+            "customer_id": rng.randrange(1, 50_000),
+            "booking_date": (arrival_date - timedelta(days=rng.randrange(1, 90))).strftime('%Y-%m-%d'),
+            "arrival_date": arrival_date.strftime('%Y-%m-%d'),
+            "campsite_size": rng.choice(('Small', 'Medium', 'Large')),
+            "num_campsites": 1,
+            "campground_id": 1121132,
+            "campsite_id": site,
+            "campsite_allocations": [site],
+            "total_cost": 420
+        })
+    return documents
+
+def synthetic_records(documents):
+    """
+    Converts documents into Head Office records, with datetimes as the database driver returns them.
+
+    :param documents: List of booking dictionaries.
+    :return: List of record tuples in from_db_record order.
+    """
+    return [(document["booking_id"], document["customer_id"],
+             datetime.strptime(document["booking_date"], '%Y-%m-%d'),
+             datetime.strptime(document["arrival_date"], '%Y-%m-%d'),
+             document["campground_id"], document["campsite_size"], document["num_campsites"], None)
+            for document in documents]
+
+def timed(function, items):
+    """
+    Times one conversion of a list of items.
+
+    :param function: Function converting the whole list.
+    :param items: List of documents or records.
+    :return: Tuple (seconds, number of bookings built).
+    """
+    started = time.perf_counter()
+    bookings = function(items)
+    return time.perf_counter() - started, len(bookings)
+
+def main():
+    """
+    Reports booking construction throughput for the per-record and bulk paths.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark Booking construction from documents and records.")
+    parser.add_argument('--bookings', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    documents = synthetic_documents(args.bookings, args.seed)
+    records = synthetic_records(documents)
+
+    cases = (
+        ('strptime only', lambda items: [datetime.strptime(item["arrival_date"], '%Y-%m-%d') for item in items], documents),
+        ('cached parse only', lambda items: [parse_iso_date(item["arrival_date"]) for item in items], documents),
+        ('from_dict', lambda items: [Booking.from_dict(item) for item in items], documents),
+        ('from_dicts', Booking.from_dicts, documents),
+        ('from_db_record', lambda items: [Booking.from_db_record(item) for item in items], records),
+        ('from_db_records', Booking.from_db_records, records),
+    )
+
+    print(f"{'path':>18} {'time (s)':>9} {'bookings/s':>12}")
+    for label, function, items in cases:
+        parse_iso_date.cache_clear()
+        elapsed, built = timed(function, items)
+        print(f"{label:>18} {elapsed:>9.3f} {built / elapsed:>12,.0f}")
+
+if __name__ == '__main__':
+    main()
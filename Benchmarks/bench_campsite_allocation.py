@@ -0,0 +1,97 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+from Models.booking import Booking
+from Models.campsite import allocate_campsite
+from Utils.campsite_manager import initialize_campsites
+
+# First Saturday of the synthetic booking history
+HISTORY_START = datetime(2000, 1, 1)
+
+def legacy_is_available(campsite, start_date, end_date):
+    """
+    Reproduces the original list scan over campsite.bookings for comparison.
+
+    :param campsite: Campsite object to check.
+    :param start_date: Start date of the booking.
+    :param end_date: End date of the booking.
+    :return: True if no recorded booking overlaps the range, False otherwise.
+    """
+    current_date = start_date
+    while current_date < end_date:
+        next_week = current_date + timedelta(days=7)
+        for existing_start, existing_end in campsite.bookings:
+            if current_date < existing_end and next_week > existing_start:
+                return False
+        current_date = next_week
+    return True
+
+def build_history(seasons):
+    """
+    Creates the standard campsites with every week booked for the given number of seasons.
+
+    :param seasons: Number of 52-week seasons of history to book on each campsite.
+    :return: Tuple (campsites, first free Saturday after the history).
+    """
+    campsites = initialize_campsites()
+    weeks = seasons * 52
+    for campsite in campsites:
+        for week in range(weeks):
+            start_date = HISTORY_START + timedelta(weeks=week)
+            campsite.book_campsite(start_date, start_date + timedelta(days=7))
+    return campsites, HISTORY_START + timedelta(weeks=weeks)
+
+def time_allocations(campsites, start_date, repeats):
+    """
+    Times allocate_campsite and the legacy scan for a week that is fully booked.
+
+    :param campsites: Campsites carrying the booking history.
+    :param start_date: First week after the history, which is filled before timing.
+    :param repeats: Number of allocation attempts to time.
+    :return: Tuple (seconds per indexed allocation, seconds per legacy scan).
+    """
+    end_date = start_date + timedelta(days=7)
+    booking = Booking(0, 0, start_date, start_date, 'Small', 1)
+    for campsite in campsites:
+        campsite.book_campsite(start_date, end_date)
+
+    # Every site is full, so each attempt checks all campsites (the worst case)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        allocate_campsite(campsites, start_date, end_date, booking)
+    indexed = (time.perf_counter() - started) / repeats
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        for campsite in campsites:
+            legacy_is_available(campsite, start_date, end_date)
+    legacy = (time.perf_counter() - started) / repeats
+    return indexed, legacy
+
+def main():
+    """
+    Prints allocation time per booking as the booking history on every campsite grows.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark campsite allocation against booking history size.")
+    parser.add_argument('--seasons', type=int, nargs='+', default=[0, 1, 5, 10, 25])
+    parser.add_argument('--repeats', type=int, default=200)
+    args = parser.parse_args()
+
+    # Allocation logging would dominate the timings
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'seasons':>8} {'weeks/site':>11} {'indexed (us)':>13} {'legacy scan (us)':>17}")
+    for seasons in args.seasons:
+        campsites, next_week = build_history(seasons)
+        indexed, legacy = time_allocations(campsites, next_week, args.repeats)
+        print(f"{seasons:>8} {seasons * 52:>11} {indexed * 1e6:>13.1f} {legacy * 1e6:>17.1f}")
+
+if __name__ == '__main__':
+    main()
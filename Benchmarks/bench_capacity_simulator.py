@@ -0,0 +1,53 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import time
+from Utils.capacity_simulator import Scenario, display_scenario_results, run_scenarios, synthetic_booking_records
+
+def build_sweep(scenario_count):
+    """
+    Builds a sweep of extra-site and demand scenarios around the default campground.
+
+    :param scenario_count: Number of scenarios to build.
+    :return: List of Scenario objects.
+    """
+    base = Scenario('base')
+    scenarios = [base]
+    sizes = ('Small', 'Medium', 'Large')
+    while len(scenarios) < scenario_count:
+        index = len(scenarios)
+        scenario = base.with_extra_sites(sizes[index % 3], index % 20 + 1)
+        scenarios.append(scenario.with_demand(index % 12 + 1, 1 + (index % 4) / 2) if index % 2 else scenario)
+    return scenarios
+
+def main():
+    """
+    Times a sweep of hundreds of what-if scenarios over one synthetic booking set.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the capacity what-if simulator.")
+    parser.add_argument('--scenarios', type=int, default=300)
+    parser.add_argument('--bookings', type=int, default=5_000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, os.cpu_count() or 1])
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    records = synthetic_booking_records(args.bookings, seed=args.seed)
+    scenarios = build_sweep(args.scenarios)
+
+    print(f"{'workers':>8} {'scenarios':>10} {'time (s)':>9} {'scenarios/s':>12}")
+    for workers in dict.fromkeys(args.workers):
+        started = time.perf_counter()
+        results = run_scenarios(scenarios, records, max_workers=workers)
+        elapsed = time.perf_counter() - started
+        print(f"{workers:>8} {len(scenarios):>10} {elapsed:>9.2f} {len(scenarios) / elapsed:>12.1f}")
+
+    display_scenario_results(results[:10])
+
+if __name__ == '__main__':
+    main()
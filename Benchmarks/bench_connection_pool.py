@@ -0,0 +1,109 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from Database.connection_pool import ConnectionPool
+
+class SimulatedConnection:
+    """
+    Connection whose statements take a fixed time, as a round trip to the database would.
+    """
+
+    def __init__(self, query_seconds):
+        self.query_seconds = query_seconds
+
+    def cursor(self):
+        return self
+
+    def execute(self, query, *params):
+        time.sleep(self.query_seconds)
+        return self
+
+    def fetchall(self):
+        return [(1,)]
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+def simulated_connect(connect_seconds, query_seconds):
+    """
+    Returns a connect function that waits as a login and TLS handshake would.
+    """
+    def connect():
+        time.sleep(connect_seconds)
+        return SimulatedConnection(query_seconds)
+    return connect
+
+def run_unpooled(connect, requests, workers):
+    """
+    Opens and closes a connection for every request, as the summary insert and Flask routes did.
+
+    :return: Seconds taken.
+    """
+    def request(_):
+        conn = connect()
+        conn.cursor().execute("INSERT")
+        conn.commit()
+        conn.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(request, range(requests)))
+    return time.perf_counter() - started
+
+def run_pooled(connect, requests, workers, max_size):
+    """
+    Checks a connection out of a ConnectionPool for every request.
+
+    :return: Tuple (seconds taken, pool statistics).
+    """
+    pool = ConnectionPool(connect, "bench", max_size=max_size)
+
+    def request(_):
+        with pool.connection() as conn:
+            conn.cursor().execute("INSERT")
+            conn.commit()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(request, range(requests)))
+    elapsed = time.perf_counter() - started
+    stats = pool.stats()
+    pool.close_all()
+    return elapsed, stats
+
+def main():
+    """
+    Reports request throughput with a new connection per request against a connection pool.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark pooled against per-request database connections.")
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent requests, as Flask threads would issue.")
+    parser.add_argument('--max-size', type=int, default=5)
+    parser.add_argument('--connect-ms', type=float, default=40.0, help="Simulated connection setup time.")
+    parser.add_argument('--query-ms', type=float, default=2.0, help="Simulated statement round trip.")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    connect = simulated_connect(args.connect_ms / 1000, args.query_ms / 1000)
+
+    print(f"{'path':>12} {'time (s)':>9} {'req/s':>8} {'connects':>9}")
+    elapsed = run_unpooled(connect, args.requests, args.workers)
+    print(f"{'unpooled':>12} {elapsed:>9.2f} {args.requests / elapsed:>8.0f} {args.requests:>9}")
+    elapsed, stats = run_pooled(connect, args.requests, args.workers, args.max_size)
+    print(f"{'pooled':>12} {elapsed:>9.2f} {args.requests / elapsed:>8.0f} {stats['created']:>9}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import asyncio
+import logging
+import time
+from Database.cosmos_bulk import bulk_write_bookings
+from Database.cosmos_db import insert_booking_to_cosmos
+
+class InMemoryContainer:
+    """
+    Cosmos DB container stand-in holding documents in a dictionary, with a fixed latency per request.
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.items = {}
+
+    def query_items(self, query, parameters=None, **kwargs):
+        time.sleep(self.latency)
+        return [item for item in self.items.values() if item['booking_id'] == parameters[0]['value']]
+
+    def create_item(self, body):
+        time.sleep(self.latency)
+        self.items[body['id']] = body
+
+class InMemoryAsyncContainer:
+    """
+    azure.cosmos.aio container stand-in holding documents in a dictionary, with a fixed latency per request.
+    """
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.items = {}
+
+    async def create_item(self, body):
+        await asyncio.sleep(self.latency)
+        self.items[body['id']] = body
+
+    async def execute_item_batch(self, batch_operations, partition_key):
+        await asyncio.sleep(self.latency)
+        for _, (body,) in batch_operations:
+            self.items[body['id']] = body
+
+def bookings_data(count):
+    return [{'booking_id': booking_id, 'campground_id': 1121132, 'campsite_id': booking_id % 100}
+            for booking_id in range(1, count + 1)]
+
+def main():
+    """
+    Reports booking write throughput one at a time against the concurrent bulk writer.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark sequential against concurrent bulk Cosmos DB writes.")
+    parser.add_argument('--bookings', type=int, default=500)
+    parser.add_argument('--latency-ms', type=float, default=10.0, help="Simulated round trip per request.")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32, 128])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    latency = args.latency_ms / 1000
+
+    print(f"{'writer':>18} {'time (s)':>9} {'bookings/s':>11}")
+    for mode in ('query', 'create'):
+        container = InMemoryContainer(latency)
+        started = time.perf_counter()
+        for booking_data in bookings_data(args.bookings):
+            insert_booking_to_cosmos(container, booking_data, mode=mode)
+        elapsed = time.perf_counter() - started
+        print(f"{'sequential ' + mode:>18} {elapsed:>9.2f} {args.bookings / elapsed:>11,.0f}")
+
+    for concurrency in args.concurrency:
+        container = InMemoryAsyncContainer(latency)
+        started = time.perf_counter()
+        bulk_write_bookings(bookings_data(args.bookings), container=container, max_concurrency=concurrency, mode='create')
+        elapsed = time.perf_counter() - started
+        print(f"{f'bulk x{concurrency}':>18} {elapsed:>9.2f} {args.bookings / elapsed:>11,.0f}")
+
+if __name__ == '__main__':
+    main()
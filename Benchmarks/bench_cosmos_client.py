@@ -0,0 +1,68 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import time
+from unittest.mock import patch
+from Database.cosmos_db import connect_to_cosmos, reset_cosmos_client
+
+SETTINGS = {'cosmos_db': {'endpoint': 'https://example.documents.azure.com', 'key': 'key', 'database_name': 'CampgroundDB'}}
+
+class SimulatedCosmosClient:
+    """
+    CosmosClient stand-in whose construction waits as the handshake and account metadata fetch would.
+    """
+
+    def __init__(self, endpoint, key, setup_seconds=0.0):
+        time.sleep(setup_seconds)
+
+    def get_database_client(self, database_name):
+        return self
+
+    def get_container_client(self, container_name):
+        return object()
+
+def per_booking_overhead(bookings, shared):
+    """
+    Connects to the PDFs container once per booking, as generate_confirmation does.
+
+    :param bookings: Number of bookings.
+    :param shared: Whether the shared client is kept between bookings, or dropped as before.
+    :return: Seconds per booking.
+    """
+    reset_cosmos_client()
+    started = time.perf_counter()
+    for _ in range(bookings):
+        if not shared:
+            reset_cosmos_client()
+        connect_to_cosmos("PDFs")
+    return (time.perf_counter() - started) / bookings
+
+def main():
+    """
+    Reports the per-booking cost of connect_to_cosmos with a new client per call against the shared client.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark per-call Cosmos DB clients against the shared client.")
+    parser.add_argument('--bookings', type=int, default=200)
+    parser.add_argument('--setup-ms', type=float, default=25.0, help="Simulated client handshake and metadata fetch.")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    def client_class(endpoint, key):
+        return SimulatedCosmosClient(endpoint, key, args.setup_ms / 1000)
+
+    print(f"{'client':>10} {'per booking (ms)':>17} {'bookings/s':>11}")
+    with patch('Database.cosmos_db.CosmosClient', side_effect=client_class), \
+         patch('Database.cosmos_db.load_config', return_value=SETTINGS):
+        for label, shared in (('per call', False), ('shared', True)):
+            seconds = per_booking_overhead(args.bookings, shared)
+            print(f"{label:>10} {seconds * 1000:>17.4f} {1 / seconds:>11,.0f}")
+    reset_cosmos_client()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import contextlib
+import io
+import logging
+import shutil
+import tempfile
+import time
+from unittest.mock import patch
+import main as pipeline
+from Database.connection_pool import close_all_pools
+from Database.sql_backend import SqliteBackend, set_sql_backend
+
+class InMemoryContainer:
+    """
+    Cosmos DB container stand-in holding documents in a dictionary, so only the SQL side is measured.
+    """
+
+    def __init__(self):
+        self.items = {}
+
+    def query_items(self, query, parameters=None, **kwargs):
+        return []
+
+    def create_item(self, body):
+        self.items[body['id']] = body
+
+    def upsert_item(self, body):
+        self.items[body['id']] = body
+
+def main():
+    """
+    Loads synthetic bookings into a local SQLite Head Office and reports end-to-end throughput of the pipeline.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the booking pipeline end to end on the SQLite backend.")
+    parser.add_argument('--bookings', type=int, default=1_000_000)
+    parser.add_argument('--arraysize', type=int, default=5000, help="Batch size of the streamed run.")
+    parser.add_argument('--parallel', type=int, default=4, help="Key ranges of the parallel extraction run.")
+    parser.add_argument('--batch', action='store_true', help="Allocate with the vectorized batch engine.")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    temp_dir = tempfile.mkdtemp()
+    working_dir = os.getcwd()
+    try:
+        backend = SqliteBackend(os.path.join(temp_dir, 'sqlite'))
+        started = time.perf_counter()
+        backend.load_synthetic_bookings(args.bookings)
+        elapsed = time.perf_counter() - started
+        print(f"Loaded {args.bookings} bookings in {elapsed:.2f}s ({args.bookings / elapsed:,.0f} rows/s).")
+
+        # Confirmation and summary PDFs are written under the temporary directory
+        set_sql_backend(backend)
+        os.chdir(temp_dir)
+        container = InMemoryContainer()
+        runs = (
+            ('fetchall', {}),
+            ('streamed', {'arraysize': args.arraysize}),
+            (f'parallel x{args.parallel}', {'parallel': args.parallel}),
+        )
+        print(f"{'run':>14} {'time (s)':>9} {'bookings/s':>11} {'allocated':>10}")
+        with patch('main.connect_to_cosmos', return_value=container), \
+             patch('Utils.confirmation.connect_to_cosmos', return_value=container), \
+             patch('Utils.summary_manager.connect_to_cosmos', return_value=container):
+            for label, options in runs:
+                started = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    summary = pipeline.process_campground(1121132, 1, batch=args.batch, warm_start=False, display=False,
+                                                          incremental=False, checkpoint_dir=temp_dir, **options)
+                elapsed = time.perf_counter() - started
+                print(f"{label:>14} {elapsed:>9.2f} {summary['total_bookings'] / elapsed:>11,.0f} "
+                      f"{summary['successful_allocations']:>10}")
+    finally:
+        os.chdir(working_dir)
+        set_sql_backend(None)
+        close_all_pools()
+        shutil.rmtree(temp_dir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from Models.allocation_strategy import get_allocation_strategy
+from Models.booking import Booking
+from Utils.campsite_manager import initialize_campsites
+from Utils.summary_manager import consolidate_summaries, generate_summary
+
+def process_synthetic_campground(campground_id, bookings_per_campground):
+    """
+    Allocates and summarizes one campground's synthetic bookings, standing in for process_campground without databases.
+
+    :param campground_id: Campground ID, also used as the workload seed.
+    :param bookings_per_campground: Number of bookings to allocate.
+    :return: Tuple (campground_id, summary dictionary).
+    """
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(campground_id)
+    season_start = datetime(2026, 1, 3)
+    bookings = [
+        Booking(booking_id, booking_id, season_start, season_start + timedelta(days=rng.randrange(364)),
+                rng.choice(('Small', 'Medium', 'Large')), rng.choice((1, 1, 2, 3)), campground_id)
+        for booking_id in range(bookings_per_campground)
+    ]
+    campsites = initialize_campsites()
+    get_allocation_strategy('greedy').allocate(bookings, campsites)
+    return campground_id, generate_summary(bookings, campsites)
+
+def run(campgrounds, workers, bookings_per_campground):
+    """
+    Processes the synthetic campgrounds with a process pool.
+
+    :param campgrounds: Number of campgrounds.
+    :param workers: Number of worker processes.
+    :param bookings_per_campground: Number of bookings per campground.
+    :return: Tuple (seconds, consolidated report).
+    """
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(process_synthetic_campground, range(1, campgrounds + 1),
+                               [bookings_per_campground] * campgrounds)
+        report = consolidate_summaries(dict(results))
+    return time.perf_counter() - started, report
+
+def main():
+    """
+    Reports campground throughput as the number of worker processes grows.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark parallel multi-campground processing.")
+    parser.add_argument('--campgrounds', type=int, default=16)
+    parser.add_argument('--bookings', type=int, default=20_000, help="Bookings per campground.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    print(f"CPUs available: {os.cpu_count()}")
+    print(f"{'workers':>8} {'time (s)':>9} {'campgrounds/s':>14} {'speedup':>8} {'allocated':>10}")
+    baseline = None
+    for workers in args.workers:
+        elapsed, report = run(args.campgrounds, workers, args.bookings)
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {args.campgrounds / elapsed:>14.2f} {baseline / elapsed:>7.1f}x "
+              f"{report['successful_allocations']:>10}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import random
+import shutil
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+from Database.connection_pool import ConnectionPool
+from Database.head_office_db import fetch_bookings, fetch_bookings_parallel
+
+class NetworkCursor:
+    """
+    SQLite cursor that waits as a remote server would: a round trip per statement and a transfer time per row.
+    """
+
+    def __init__(self, cursor, round_trip, seconds_per_row):
+        self.cursor = cursor
+        self.round_trip = round_trip
+        self.seconds_per_row = seconds_per_row
+
+    def execute(self, query, params=()):
+        time.sleep(self.round_trip)
+        self.cursor.execute(query, params)
+        return self
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        rows = self.cursor.fetchall()
+        time.sleep(len(rows) * self.seconds_per_row)
+        return rows
+
+class NetworkConnection:
+    """
+    Connection to the local SQLite stand-in whose cursors simulate network latency.
+    """
+
+    def __init__(self, path, round_trip, seconds_per_row):
+        self.conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self.conn.execute("ATTACH DATABASE ? AS camping", (path,))
+        self.conn.create_function('CONCAT', -1, lambda *parts: ''.join(parts))  # SQLite before 3.44 has no CONCAT
+        self.round_trip = round_trip
+        self.seconds_per_row = seconds_per_row
+
+    def cursor(self):
+        return NetworkCursor(self.conn.cursor(), self.round_trip, self.seconds_per_row)
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def close(self):
+        self.conn.close()
+
+def build_database(path, bookings, seed):
+    """
+    Writes a SQLite copy of the Head Office camping tables with synthetic bookings for campground 1.
+    """
+    rng = random.Random(seed)
+    conn = sqlite3.connect(':memory:')
+    conn.execute("ATTACH DATABASE ? AS camping", (path,))
+    conn.execute("CREATE TABLE camping.customers (customer_id INTEGER PRIMARY KEY, first_name TEXT, last_name TEXT)")
+    conn.execute("CREATE TABLE camping.booking (booking_id INTEGER PRIMARY KEY, customer_id INT, booking_date TEXT, "
+                 "arrival_date TEXT, campground_id INT, campsite_size TEXT, num_campsites INT)")
+    conn.executemany("INSERT INTO camping.customers VALUES (?, ?, ?)",
+                     ((customer_id, f"First{customer_id}", f"Last{customer_id}") for customer_id in range(1, 50_001)))
+    season_start = date(2026, 1, 3)
+    rows = []
+    for booking_id in range(1, bookings + 1):
+        arrival_date = season_start + timedelta(days=rng.randrange(364))
+        rows.append((booking_id, rng.randrange(1, 50_001), (arrival_date - timedelta(days=30)).isoformat(),
+                     arrival_date.isoformat(), 1, rng.choice(('Small', 'Medium', 'Large')), rng.choice((1, 1, 2))))
+    conn.executemany("INSERT INTO camping.booking VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+def main():
+    """
+    Reports extraction time of the single fetch_bookings query against keyset ranges read in parallel.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark parallel keyset-partitioned extraction from Head Office.")
+    parser.add_argument('--bookings', type=int, default=200_000)
+    parser.add_argument('--page-size', type=int, default=5000)
+    parser.add_argument('--parallelism', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--round-trip-ms', type=float, default=20.0, help="Simulated round trip per statement.")
+    parser.add_argument('--latency-us', type=float, default=5.0, help="Simulated transfer time per row, in microseconds.")
+    parser.add_argument('--repeats', type=int, default=3, help="Best of this many runs is reported.")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    temp_dir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(temp_dir, 'camping.db')
+        build_database(path, args.bookings, args.seed)
+        round_trip, seconds_per_row = args.round_trip_ms / 1000, args.latency_us / 1e6
+
+        def best(run):
+            timings = []
+            for _ in range(args.repeats):
+                started = time.perf_counter()
+                rows = run()
+                timings.append(time.perf_counter() - started)
+            return min(timings), len(rows)
+
+        print(f"{'path':>22} {'time (s)':>9} {'rows':>9}")
+        conn = NetworkConnection(path, round_trip, seconds_per_row)
+        elapsed, rows = best(lambda: fetch_bookings(conn, 1))
+        conn.close()
+        print(f"{'single query':>22} {elapsed:>9.2f} {rows:>9}")
+        for parallelism in args.parallelism:
+            pool = ConnectionPool(lambda: NetworkConnection(path, round_trip, seconds_per_row), "bench", max_size=parallelism)
+            elapsed, rows = best(lambda: fetch_bookings_parallel(pool, 1, parallelism, page_size=args.page_size,
+                                                                 dialect='sqlite'))
+            pool.close_all()
+            print(f"{f'{parallelism} key ranges':>22} {elapsed:>9.2f} {rows:>9}")
+    finally:
+        shutil.rmtree(temp_dir)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+from Models.booking import Booking
+from Models.campsite import allocate_campsite
+from Utils.campsite_manager import initialize_campsites
+
+def time_week_fill(sites_per_size, use_inventory):
+    """
+    Times filling every Large site for one week, one booking at a time.
+
+    :param sites_per_size: Number of Small, Medium and Large sites each.
+    :param use_inventory: True to allocate through the inventory pools, False to scan a plain list.
+    :return: Average seconds per allocation.
+    """
+    layout = (('Small', sites_per_size, 50), ('Medium', sites_per_size, 60), ('Large', sites_per_size, 70))
+    inventory = initialize_campsites(layout)
+    campsites = inventory if use_inventory else list(inventory)
+    start_date = datetime(2026, 12, 5)
+    end_date = start_date + timedelta(days=7)
+
+    started = time.perf_counter()
+    for booking_id in range(sites_per_size):
+        booking = Booking(booking_id, booking_id, start_date, start_date, 'Large', 1)
+        allocate_campsite(campsites, start_date, end_date, booking)
+    return (time.perf_counter() - started) / sites_per_size
+
+def main():
+    """
+    Prints average allocation time per booking for the pooled and linear paths as inventory grows.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark size-aware allocation against inventory size.")
+    parser.add_argument('--sites-per-size', type=int, nargs='+', default=[10, 100, 1000, 5000])
+    args = parser.parse_args()
+
+    # Allocation logging would dominate the timings
+    logging.disable(logging.CRITICAL)
+
+    print(f"{'sites':>7} {'pooled (us)':>12} {'linear (us)':>12}")
+    for sites_per_size in args.sites_per_size:
+        pooled = time_week_fill(sites_per_size, use_inventory=True)
+        linear = time_week_fill(sites_per_size, use_inventory=False)
+        print(f"{sites_per_size * 3:>7} {pooled * 1e6:>12.1f} {linear * 1e6:>12.1f}")
+
+if __name__ == '__main__':
+    main()
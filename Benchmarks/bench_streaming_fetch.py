@@ -0,0 +1,131 @@
+import os
+import sys
+
+# Add the parent directory to the sys.path list to allow importing from the project packages
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import logging
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from Database.head_office_db import stream_booking_batches
+from Models.allocation_strategy import get_allocation_strategy
+from Models.booking import Booking
+from Models.booking_frame import BookingFrame
+from Utils.campsite_manager import initialize_campsites
+
+class SimulatedCursor:
+    """
+    Cursor over synthetic Head Office rows that waits as a network transfer would.
+
+    Rows are generated as they are fetched, so the simulated server does not count towards client memory.
+    """
+
+    def __init__(self, rows, seconds_per_row, seed):
+        self.arraysize = 1
+        self.remaining = rows
+        self.seconds_per_row = seconds_per_row
+        self.rng = random.Random(seed)
+        self.next_id = 1
+
+    def execute(self, query, params=()):
+        return self
+
+    def _rows(self, count):
+        count = min(count, self.remaining)
+        self.remaining -= count
+        time.sleep(count * self.seconds_per_row)
+        season_start = datetime(2026, 1, 3)
+        rows = []
+        for _ in range(count):
+            arrival_date = season_start + timedelta(days=self.rng.randrange(364))
+            rows.append((self.next_id, self.rng.randrange(1, 50_000), arrival_date - timedelta(days=30), arrival_date,
+                         1, self.rng.choice(('Small', 'Medium', 'Large')), self.rng.choice((1, 1, 2)),
+                         f"Customer {self.next_id}"))
+            self.next_id += 1
+        return rows
+
+    def fetchmany(self, size=None):
+        return self._rows(size or self.arraysize)
+
+    def fetchall(self):
+        return self._rows(self.remaining)
+
+class SimulatedConnection:
+    """
+    Connection handing out one SimulatedCursor.
+    """
+
+    def __init__(self, rows, seconds_per_row, seed):
+        self._cursor = SimulatedCursor(rows, seconds_per_row, seed)
+
+    def cursor(self):
+        return self._cursor
+
+def run_fetchall(conn):
+    """
+    Fetches every row, builds every Booking, then allocates them, as main does without streaming.
+
+    :return: Number of allocated bookings.
+    """
+    bookings = Booking.from_db_records(conn.cursor().execute(None).fetchall())
+    allocations = get_allocation_strategy('greedy').allocate(bookings, initialize_campsites())
+    return BookingFrame.summary_view(bookings).successful_allocations() if allocations else 0
+
+def run_streamed(conn, arraysize, prefetch):
+    """
+    Allocates each batch while the next is fetched, keeping only summary views, as process_booking_stream does.
+
+    :return: Number of allocated bookings.
+    """
+    campsites = initialize_campsites()
+    strategy = get_allocation_strategy('greedy')
+    frames = []
+    for bookings in stream_booking_batches(conn, arraysize=arraysize, prefetch=prefetch):
+        strategy.allocate(bookings, campsites)
+        frames.append(BookingFrame.summary_view(bookings))
+    return BookingFrame.concat(frames).successful_allocations()
+
+def measure(run, rows, seconds_per_row, seed):
+    """
+    Times a run, then repeats it under tracemalloc for its peak memory.
+
+    :return: Tuple (seconds, peak MiB, allocated bookings).
+    """
+    started = time.perf_counter()
+    allocated = run(SimulatedConnection(rows, seconds_per_row, seed))
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    run(SimulatedConnection(rows, 0, seed))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20, allocated
+
+def main():
+    """
+    Reports time and peak memory of fetchall against streamed fetching, with and without prefetch.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark streaming Head Office bookings with fetchmany.")
+    parser.add_argument('--rows', type=int, default=200_000)
+    parser.add_argument('--arraysize', type=int, default=1000)
+    parser.add_argument('--latency-us', type=float, default=5.0, help="Simulated transfer time per row, in microseconds.")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    seconds_per_row = args.latency_us / 1e6
+
+    print(f"{'path':>22} {'time (s)':>9} {'peak MiB':>9} {'allocated':>10}")
+    cases = (
+        ('fetchall', run_fetchall),
+        ('fetchmany', lambda conn: run_streamed(conn, args.arraysize, 0)),
+        ('fetchmany + prefetch', lambda conn: run_streamed(conn, args.arraysize, 2)),
+    )
+    for label, run in cases:
+        elapsed, peak, allocated = measure(run, args.rows, seconds_per_row, args.seed)
+        print(f"{label:>22} {elapsed:>9.2f} {peak:>9.1f} {allocated:>10}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+import gzip
+import hashlib
+import os
+import tempfile
+import threading
+from Utils.config_loader import load_config
+from Utils.logging_config import logger
+
+# Directory of the filesystem blob store when the configuration does not name one
+DEFAULT_BLOB_DIR = 'blobs'
+
+class BlobStore:
+    """
+    Base class for stores of file contents such as confirmation and summary PDFs.
+
+    Contents are addressed by the SHA-256 of their bytes, so storing the same content twice keeps
+    one copy, and Cosmos DB documents only hold the reference returned by put.
+    """
+
+    name = None
+
+    def put(self, data, content_type='application/octet-stream'):
+        """
+        Stores content unless the store already holds it.
+
+        :param data: Content as bytes.
+        :param content_type: MIME type recorded in the reference.
+        :return: Reference dictionary with 'store', 'key', 'size' and 'content_type'.
+        """
+        raise NotImplementedError
+
+    def open(self, key):
+        """
+        Opens stored content for reading.
+
+        :param key: Key from the reference returned by put.
+        :return: Binary file object that reads the original bytes.
+        :raises FileNotFoundError: If the store does not hold the key.
+        """
+        raise NotImplementedError
+
+    def exists(self, key):
+        """
+        Checks whether the store holds content.
+
+        :param key: Key from the reference returned by put.
+        :return: True if the content is stored.
+        """
+        raise NotImplementedError
+
+    def put_file(self, path, content_type='application/octet-stream'):
+        """
+        Stores the content of a file.
+
+        :param path: Path of the file.
+        :param content_type: MIME type recorded in the reference.
+        :return: Reference dictionary (see put).
+        """
+        with open(path, 'rb') as file:
+            return self.put(file.read(), content_type)
+
+    def get(self, key):
+        """
+        Reads stored content.
+
+        :param key: Key from the reference returned by put.
+        :return: Content as bytes.
+        :raises FileNotFoundError: If the store does not hold the key.
+        """
+        with self.open(key) as file:
+            return file.read()
+
+class FileSystemBlobStore(BlobStore):
+    """
+    Blob store in a local directory.
+
+    Each content is one file named by its SHA-256, under shard directories taken from the start of
+    the hash (e.g. 3f/a2/3fa2...), so no directory grows too large. With compress set, contents are
+    DEFLATE-compressed in gzip files, which read back as streams, and kept uncompressed when that
+    would not make them smaller. Files are written to a temporary name and renamed into place, so
+    readers never see a partial file.
+    """
+
+    name = 'filesystem'
+
+    def __init__(self, root=DEFAULT_BLOB_DIR, compress=False, compression_level=6, shard_depth=2, shard_width=2):
+        """
+        Initializes a FileSystemBlobStore.
+
+        :param root: Directory of the store; created if missing.
+        :param compress: If True, compress contents with zlib (DEFLATE) when that saves space.
+        :param compression_level: zlib compression level, 1 (fastest) to 9 (smallest).
+        :param shard_depth: Number of shard directory levels.
+        :param shard_width: Hash characters per shard directory name.
+        """
+        self.root = root
+        self.compress = compress
+        self.compression_level = compression_level
+        self.shard_depth = shard_depth
+        self.shard_width = shard_width
+
+    def __repr__(self):
+        """Provides a string representation of the FileSystemBlobStore object."""
+        return f"<FileSystemBlobStore {self.root} compress={self.compress}>"
+
+    def path_for(self, key):
+        """
+        Returns the path of a key's file without the compression suffix.
+
+        :param key: Hexadecimal SHA-256 of the content.
+        :return: Path of the file.
+        :raises ValueError: If the key is not a SHA-256 hex digest.
+        """
+        if len(key) != 64 or not all(character in '0123456789abcdef' for character in key):
+            raise ValueError(f"Invalid blob key '{key}'.")
+        shards = [key[level * self.shard_width:(level + 1) * self.shard_width] for level in range(self.shard_depth)]
+        return os.path.join(self.root, *shards, key)
+
+    def put(self, data, content_type='application/octet-stream'):
+        key = hashlib.sha256(data).hexdigest()
+        reference = {'store': self.name, 'key': key, 'size': len(data), 'content_type': content_type}
+        path = self.path_for(key)
+        if self._stored_path(path):
+            logger.info(f"Blob {key} already stored; not written again.")
+            return reference
+
+        if self.compress:
+            compressed = gzip.compress(data, compresslevel=self.compression_level, mtime=0)
+            if len(compressed) < len(data):
+                data, path = compressed, path + '.gz'
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            os.remove(temp_path)
+            raise
+        logger.info(f"Stored blob {key} ({reference['size']} bytes, {len(data)} on disk).")
+        return reference
+
+    def open(self, key):
+        path = self._stored_path(self.path_for(key))
+        if path is None:
+            raise FileNotFoundError(f"Blob {key} not found in {self.root}.")
+        if path.endswith('.gz'):
+            return gzip.open(path, 'rb')
+        return open(path, 'rb')
+
+    def exists(self, key):
+        return self._stored_path(self.path_for(key)) is not None
+
+    def _stored_path(self, path):
+        """
+        Returns the path a key is stored at, compressed or not, or None if it is not stored.
+        """
+        for candidate in (path, path + '.gz'):
+            if os.path.exists(candidate):
+                return candidate
+        return None
+
+BLOB_STORES = {
+    FileSystemBlobStore.name: FileSystemBlobStore,
+}
+
+# Blob store built from the configuration, with the settings it was built from
+_configured_store = (None, None)
+_store_lock = threading.Lock()
+
+def get_blob_store():
+    """
+    Returns the blob store for PDFs.
+
+    The store is set by the "blob_store" section of connection_strings.json, e.g.
+    {"type": "filesystem", "root": "blobs", "compress": true}. Without that section, or without a
+    readable configuration, a filesystem store in DEFAULT_BLOB_DIR is used.
+
+    :return: BlobStore instance.
+    :raises ValueError: If the configuration names an unknown store type.
+    """
+    global _configured_store
+    try:
+        settings = load_config().get('blob_store') or {'type': FileSystemBlobStore.name}
+    except (OSError, ValueError):
+        settings = {'type': FileSystemBlobStore.name}
+
+    with _store_lock:
+        cached_settings, store = _configured_store
+        if store is None or cached_settings != settings:
+            options = dict(settings)
+            store_type = options.pop('type', FileSystemBlobStore.name)
+            if store_type not in BLOB_STORES:
+                raise ValueError(f"Unknown blob store '{store_type}'. Choose from: {', '.join(BLOB_STORES)}.")
+            store = BLOB_STORES[store_type](**options)
+            _configured_store = (settings, store)
+            logger.info(f"Using the {store_type} blob store.")
+        return store
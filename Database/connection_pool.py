@@ -0,0 +1,249 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from Database.sql_backend import DATABASE_ERRORS
+from Utils.logging_config import logger
+
+# Pools by name, shared by every module of the process
+_pools = {}
+_pools_lock = threading.Lock()
+
+class ConnectionPool:
+    """
+    Thread-safe pool of database connections created by a connect function.
+
+    Connections are checked out with `connection()` and returned when the block ends, so repeated
+    work reuses open connections instead of paying the connection and TLS setup each time. At most
+    max_size connections are open at once; connections idle longer than max_idle_seconds are closed,
+    and a connection that has been idle for a while is checked with a cheap query before it is reused.
+    """
+
+    def __init__(self, connect, name="pool", max_size=5, max_idle_seconds=300, health_check_after=30,
+                 health_check_query="SELECT 1", timeout=30):
+        """
+        Initializes a ConnectionPool.
+
+        :param connect: Function returning a new connection (or None if connecting failed).
+        :param name: Name used in logs and statistics.
+        :param max_size: Maximum number of connections open at once.
+        :param max_idle_seconds: Idle connections older than this are closed.
+        :param health_check_after: Connections idle for longer than this many seconds are checked before reuse.
+        :param health_check_query: Query used to check a connection.
+        :param timeout: Default number of seconds to wait for a connection when all are in use.
+        """
+        self.connect = connect
+        self.name = name
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.health_check_after = health_check_after
+        self.health_check_query = health_check_query
+        self.timeout = timeout
+        self._idle = []  # (connection, time returned) pairs, most recently returned last
+        self._in_use = 0
+        self._condition = threading.Condition()
+        self._pid = os.getpid()
+        self._closed = False
+        self._stats = {'created': 0, 'reused': 0, 'evicted_idle': 0, 'failed_health_checks': 0,
+                       'discarded': 0, 'waits': 0, 'timeouts': 0}
+
+    def __repr__(self):
+        """Provides a string representation of the ConnectionPool object."""
+        return f"<ConnectionPool {self.name} {self._in_use} in use, {len(self._idle)} idle>"
+
+    def acquire(self, timeout=None):
+        """
+        Checks out a connection, reusing an idle one if possible.
+
+        :param timeout: Seconds to wait when max_size connections are in use (defaults to the pool timeout).
+        :return: Connection object, or None if the connect function failed.
+        :raises TimeoutError: If no connection became free in time.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._check_fork()
+            self._evict_idle()
+            while not self._idle and self._in_use >= self.max_size:
+                remaining = deadline - time.monotonic()
+                self._stats['waits'] += 1
+                if remaining <= 0 or not self._condition.wait(remaining):
+                    self._stats['timeouts'] += 1
+                    raise TimeoutError(f"No {self.name} connection became free within {timeout}s.")
+            self._in_use += 1
+
+            # Reuse the most recently returned connection that is still healthy
+            while self._idle:
+                conn, returned_at = self._idle.pop()
+                if time.monotonic() - returned_at < self.health_check_after or self._is_healthy(conn):
+                    self._stats['reused'] += 1
+                    return conn
+                self._stats['failed_health_checks'] += 1
+                _close_quietly(conn)
+
+        # Connect outside the lock so a slow connection does not block other threads
+        try:
+            conn = self.connect()
+        except Exception:
+            self._give_back_slot()
+            raise
+        if conn is None:
+            self._give_back_slot()
+            return None
+        with self._condition:
+            self._stats['created'] += 1
+        return conn
+
+    def release(self, conn, discard=False):
+        """
+        Returns a checked-out connection to the pool.
+
+        Any uncommitted work is rolled back so the next user starts with a clean transaction.
+
+        :param conn: Connection from acquire (None is ignored).
+        :param discard: If True, close the connection instead of keeping it, e.g. after a database error.
+        """
+        if conn is None:
+            return
+        if not discard:
+            try:
+                conn.rollback()
+            except Exception as e:
+                logger.warning(f"Discarding {self.name} connection that could not be reset: {e}")
+                discard = True
+        with self._condition:
+            self._in_use -= 1
+            if discard or self._closed or os.getpid() != self._pid:
+                self._stats['discarded'] += 1
+                _close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+                self._evict_idle()
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """
+        Checks out a connection for the duration of a with block.
+
+        The connection is discarded rather than reused if the block raises a database error.
+
+        :param timeout: Seconds to wait when max_size connections are in use (defaults to the pool timeout).
+        :return: Context manager yielding a connection, or None if the connect function failed.
+        """
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        except Exception as e:
+            self.release(conn, discard=isinstance(e, DATABASE_ERRORS))
+            raise
+        else:
+            self.release(conn)
+
+    def stats(self):
+        """
+        Returns counters for monitoring the pool.
+
+        :return: Dictionary with the pool size and reuse, eviction, health check and wait counters.
+        """
+        with self._condition:
+            return dict(self._stats, name=self.name, max_size=self.max_size, in_use=self._in_use, idle=len(self._idle))
+
+    def close_all(self):
+        """
+        Closes every idle connection. Checked-out connections are closed when they are returned.
+        """
+        with self._condition:
+            self._closed = True  # Connections returned from now on are closed instead of kept
+            while self._idle:
+                conn, _ = self._idle.pop()
+                _close_quietly(conn)
+
+    def _evict_idle(self):
+        """
+        Closes connections that have been idle longer than max_idle_seconds. Called with the lock held.
+        """
+        cutoff = time.monotonic() - self.max_idle_seconds
+        while self._idle and self._idle[0][1] < cutoff:
+            conn, _ = self._idle.pop(0)
+            self._stats['evicted_idle'] += 1
+            _close_quietly(conn)
+
+    def _check_fork(self):
+        """
+        Forgets connections inherited from a parent process, whose sockets belong to the parent. Called with the lock held.
+        """
+        if os.getpid() != self._pid:
+            self._idle = []
+            self._in_use = 0
+            self._pid = os.getpid()
+
+    def _is_healthy(self, conn):
+        """
+        Runs the health check query on a connection.
+
+        :param conn: Idle connection.
+        :return: True if the query succeeded.
+        """
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self.health_check_query)
+            cursor.fetchall()
+            return True
+        except Exception as e:
+            logger.warning(f"Health check failed for a {self.name} connection: {e}")
+            return False
+
+    def _give_back_slot(self):
+        """
+        Frees the slot reserved for a connection that could not be created.
+        """
+        with self._condition:
+            self._in_use -= 1
+            self._condition.notify()
+
+def get_pool(name, connect, **options):
+    """
+    Returns the process-wide pool with a name, creating it with a connect function the first time.
+
+    :param name: Pool name, e.g. 'sql' or 'head_office'.
+    :param connect: Function returning a new connection, used if the pool does not exist yet.
+    :param options: Keyword arguments for ConnectionPool, used if the pool does not exist yet.
+    :return: ConnectionPool object.
+    """
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = _pools[name] = ConnectionPool(connect, name, **options)
+        return pool
+
+def pool_stats():
+    """
+    Returns the statistics of every pool in the process.
+
+    :return: Dictionary mapping pool name to its statistics.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.name: pool.stats() for pool in pools}
+
+def close_all_pools():
+    """
+    Closes the idle connections of every pool and forgets the pools.
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+def _close_quietly(conn):
+    """
+    Closes a connection, ignoring errors from connections that are already broken.
+
+    :param conn: Connection object.
+    """
+    try:
+        conn.close()
+    except Exception as e:
+        logger.warning(f"Error closing pooled connection: {e}")
@@ -0,0 +1,147 @@
+import asyncio
+from azure.cosmos import exceptions
+from azure.cosmos.aio import CosmosClient
+from Database.cosmos_db import DEFAULT_BOOKING_WRITE_MODE, booking_document_id, get_booking_write_mode
+from Utils.config_loader import load_config
+from Utils.logging_config import logger
+
+# Requests a bulk write keeps in flight at once
+DEFAULT_MAX_CONCURRENCY = 32
+
+# Most operations Cosmos DB accepts in one transactional batch
+MAX_BATCH_OPERATIONS = 100
+
+# Modes of the bulk writer: 'create' skips documents already stored, 'upsert' overwrites them, and
+# 'query' skips documents whose partition key value is already stored under any id, as for bookings
+# in containers not yet re-keyed by migrate_booking_ids
+BULK_WRITE_MODES = ('create', 'upsert', 'query')
+
+# Function to write documents to an async Cosmos DB container concurrently
+async def write_documents_async(container, documents, partition_key='booking_id', max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                                mode=DEFAULT_BOOKING_WRITE_MODE):
+    """
+    Writes documents to a Cosmos DB container with a bounded number of requests in flight.
+
+    Documents are grouped by partition key value. Groups of several documents are written as
+    transactional batches of up to MAX_BATCH_OPERATIONS; a batch that fails, e.g. because one of its
+    documents already exists, is retried document by document so each gets its own outcome. Single
+    documents are written with one create or upsert each. In 'query' mode every document is written
+    singly after a query in its partition, so no batches are used.
+
+    Batches only help containers whose partition key is shared by several documents, e.g. one per
+    campground. The Bookings container is partitioned by booking_id, so its documents are written
+    singly and their throughput comes from the concurrent requests alone.
+
+    :param container: azure.cosmos.aio container client (or any object with the same async methods).
+    :param documents: List of documents, each with its 'id' and partition key property set.
+    :param partition_key: Name of the partition key property of the container.
+    :param max_concurrency: Most requests in flight at once.
+    :param mode: One of BULK_WRITE_MODES.
+    :return: List with one report per document, in input order: a dictionary with 'id', 'status'
+             ('created', 'upserted', 'exists' or 'failed') and 'error' (None unless failed).
+    :raises ValueError: If the mode is unknown.
+    """
+    if mode not in BULK_WRITE_MODES:
+        raise ValueError(f"Unknown bulk write mode '{mode}'. Choose from: {', '.join(BULK_WRITE_MODES)}.")
+    semaphore = asyncio.Semaphore(max_concurrency)
+    reports = [None] * len(documents)
+    written = 'upserted' if mode == 'upsert' else 'created'
+
+    async def stored(document):
+        # One document per partition key value, e.g. per booking_id: any document found means it is stored
+        key = document.get(partition_key)
+        items = container.query_items(query=f"SELECT VALUE c.id FROM c WHERE c.{partition_key} = @key",
+                                      parameters=[{"name": "@key", "value": key}], partition_key=key)
+        async for _ in items:
+            return True
+        return False
+
+    async def write_one(index, document):
+        report = {'id': document.get('id'), 'status': written, 'error': None}
+        async with semaphore:
+            try:
+                if mode == 'query' and await stored(document):
+                    report['status'] = 'exists'
+                elif mode == 'upsert':
+                    await container.upsert_item(document)
+                else:
+                    await container.create_item(document)
+            except exceptions.CosmosResourceExistsError:
+                report['status'] = 'exists'
+            except exceptions.CosmosHttpResponseError as e:
+                report['status'] = 'failed'
+                report['error'] = f"{e.status_code} {e.message}"
+        reports[index] = report
+
+    async def write_batch(key, chunk):
+        operations = [(mode, (document,)) for _, document in chunk]
+        try:
+            async with semaphore:
+                await container.execute_item_batch(batch_operations=operations, partition_key=key)
+        except exceptions.CosmosHttpResponseError as e:
+            # The batch was rolled back as a whole; write its documents one by one for their own outcomes
+            logger.info(f"Transactional batch for partition key {key} failed ({e.status_code}); writing its documents singly.")
+            await asyncio.gather(*(write_one(index, document) for index, document in chunk))
+            return
+        for index, document in chunk:
+            reports[index] = {'id': document.get('id'), 'status': written, 'error': None}
+
+    # Group documents by partition key, keeping their positions for the report
+    groups = {}
+    for index, document in enumerate(documents):
+        groups.setdefault(document.get(partition_key), []).append((index, document))
+
+    tasks = []
+    for key, group in groups.items():
+        if len(group) == 1 or mode == 'query':
+            tasks.extend(write_one(index, document) for index, document in group)
+            continue
+        for start in range(0, len(group), MAX_BATCH_OPERATIONS):
+            tasks.append(write_batch(key, group[start:start + MAX_BATCH_OPERATIONS]))
+    await asyncio.gather(*tasks)
+    return reports
+
+async def _write_to_container(documents, container, container_name, **options):
+    """
+    Writes documents to the given async container, or to a container of a new async client built from the configuration.
+    """
+    if container is not None:
+        return await write_documents_async(container, documents, **options)
+    config = load_config()['cosmos_db']
+    async with CosmosClient(config['endpoint'], config['key']) as client:
+        container = client.get_database_client(config['database_name']).get_container_client(container_name)
+        return await write_documents_async(container, documents, **options)
+
+# Function to bulk-write booking documents to Cosmos DB
+def bulk_write_bookings(bookings_data, container=None, container_name="Bookings", max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                        mode=None):
+    """
+    Writes many booking documents to Cosmos DB concurrently, each under the id derived from its booking_id.
+
+    Runs its own event loop, so it is called from synchronous code. An async client is opened for the
+    run unless an async container is given; async clients are bound to their event loop, so the shared
+    client of connect_to_cosmos cannot be used here. Every booking has its own partition key value,
+    so each is written with its own request rather than in a transactional batch.
+
+    :param bookings_data: List of booking data dictionaries, e.g. from create_booking_data.
+    :param container: azure.cosmos.aio container client to write to (optional).
+    :param container_name: Name of the container to write to when no container is given.
+    :param max_concurrency: Most requests in flight at once.
+    :param mode: One of BULK_WRITE_MODES (defaults to get_booking_write_mode()).
+    :return: List with one report per booking, in input order (see write_documents_async), with its 'booking_id'.
+    """
+    mode = mode or get_booking_write_mode()
+    for booking_data in bookings_data:
+        booking_data['id'] = booking_document_id(booking_data['booking_id'])
+    reports = asyncio.run(_write_to_container(bookings_data, container, container_name,
+                                              max_concurrency=max_concurrency, mode=mode))
+    for booking_data, report in zip(bookings_data, reports):
+        report['booking_id'] = booking_data['booking_id']
+        if report['status'] == 'failed':
+            logger.error(f"Error inserting booking {booking_data['booking_id']} into Cosmos DB: {report['error']}")
+
+    failed = sum(report['status'] == 'failed' for report in reports)
+    existing = sum(report['status'] == 'exists' for report in reports)
+    logger.info(f"Bulk-wrote {len(reports) - failed - existing} bookings to Cosmos DB "
+                f"({existing} already stored, {failed} failed).")
+    return reports
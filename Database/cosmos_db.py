@@ -1,39 +1,89 @@
-import uuid
-import json
+import io
+import os
+import threading
 from datetime import datetime
 from azure.cosmos import CosmosClient, exceptions
 import base64
+from Database.blob_store import get_blob_store
 from Models.booking import Booking  
+from Utils.config_loader import load_config  # Cached connection_strings.json settings
 from Utils.logging_config import logger
 
 
-#connection_strings.json file 
-def load_config():
+# MIME type of the PDFs kept in the blob store
+PDF_CONTENT_TYPE = 'application/pdf'
+
+# Process-wide Cosmos DB client, the settings and process it was built in, and its container clients by name
+_client = None
+_client_settings = None
+_client_pid = None
+_containers = {}
+_client_lock = threading.Lock()
+
+# Function to get the shared Cosmos DB client
+def get_cosmos_client():
     """
-    Loads the database connection configurations from a JSON file.
+    Returns the process-wide Cosmos DB client, creating it the first time.
+
+    The client is thread-safe and keeps its HTTP connections and account metadata between calls. A
+    new client is built when the cosmos_db settings change, and in a forked worker process, whose
+    inherited connections belong to the parent.
 
-    :return: A dictionary of configuration settings.
+    :return: CosmosClient object.
     """
-    with open('Assets/connection_strings.json', 'r') as file:
-        return json.load(file)  # Load and return the JSON configuration data
+    config = load_config()['cosmos_db']
+    with _client_lock:
+        return _current_client(config)
 
 # Function to connect to Cosmos DB
 def connect_to_cosmos(container_name):
     """
     Connects to the specified Cosmos DB container.
 
+    Container clients are cached by name on the shared client (see get_cosmos_client), so repeated
+    calls are a dictionary lookup.
+
     :param container_name: Name of the container to connect to.
     :return: Cosmos DB container client.
     """
     # Load the configuration settings for Cosmos DB
     config = load_config()['cosmos_db']
-    # Initialize the CosmosClient using endpoint and key from the config
-    client = CosmosClient(config['endpoint'], config['key'])
-    # Get the database and container clients
-    database = client.get_database_client(config['database_name'])
-    container = database.get_container_client(container_name)
-    logger.info(f"Connected to Cosmos DB container '{container_name}' successfully.")
-    return container
+    with _client_lock:
+        client = _current_client(config)
+        container = _containers.get(container_name)
+        if container is None:
+            # Get the database and container clients
+            database = client.get_database_client(config['database_name'])
+            container = _containers[container_name] = database.get_container_client(container_name)
+            logger.info(f"Connected to Cosmos DB container '{container_name}' successfully.")
+        return container
+
+def _current_client(config):
+    """
+    Returns the shared client for the settings, building a new one if they changed or the process forked. Called with the lock held.
+
+    :param config: The cosmos_db configuration settings.
+    :return: CosmosClient object.
+    """
+    global _client, _client_settings, _client_pid
+    if _client is None or _client_settings != config or _client_pid != os.getpid():
+        # Initialize the CosmosClient using endpoint and key from the config
+        _client = CosmosClient(config['endpoint'], config['key'])
+        _client_settings = config
+        _client_pid = os.getpid()
+        _containers.clear()
+        logger.info("Created Cosmos DB client.")
+    return _client
+
+# Function to drop the shared Cosmos DB client
+def reset_cosmos_client():
+    """
+    Forgets the shared Cosmos DB client and its container clients, so the next call builds new ones.
+    """
+    global _client, _client_settings, _client_pid
+    with _client_lock:
+        _client = _client_settings = _client_pid = None
+        _containers.clear()
 
 # Function to fetch bookings from Cosmos DB
 def fetch_cosmos_bookings(container):
@@ -46,8 +96,8 @@ def fetch_cosmos_bookings(container):
     try:
         query = "SELECT * FROM c"  # Query to fetch all items from the container
         items = list(container.query_items(query=query, enable_cross_partition_query=True))
-        # Convert the fetched items into Booking objects using the from_dict method
-        bookings = [Booking.from_dict(item) for item in items]
+        # Convert the fetched items into Booking objects in one pass
+        bookings = Booking.from_dicts(items)
         logger.info(f"Fetched {len(bookings)} bookings from Cosmos DB.")
         return bookings
     except exceptions.CosmosHttpResponseError as e:
@@ -55,95 +105,300 @@ def fetch_cosmos_bookings(container):
         logger.error(f"Error fetching bookings from Cosmos DB: {e}")
         return []
 
-# Function to fetch a booking by ID from Cosmos DB
-def insert_booking_to_cosmos(container, booking_data):
+# Fields of a booking document shown in booking lists
+BOOKING_LIST_FIELDS = ('booking_id', 'customer_name', 'arrival_date', 'campsite_size', 'num_campsites', 'total_cost')
+
+# Bookings per page of a booking list, and the most a request may ask for
+DEFAULT_BOOKINGS_PAGE_SIZE = 50
+MAX_BOOKINGS_PAGE_SIZE = 500
+
+# Function to read bookings from Cosmos DB page by page
+def iter_cosmos_booking_pages(container, page_size=DEFAULT_BOOKINGS_PAGE_SIZE, continuation_token=None,
+                              fields=BOOKING_LIST_FIELDS):
+    """
+    Reads bookings from the Cosmos DB container one page at a time, projecting only the given fields.
+
+    Only one page is held in memory and each request costs the same however large the container
+    grows. Pages the service returns empty while other partitions are still being read are skipped.
+
+    :param container: Cosmos DB container client.
+    :param page_size: Most bookings per page.
+    :param continuation_token: Token of a page returned earlier, to resume after it (optional).
+    :param fields: Booking fields to read.
+    :return: Generator of tuples (list of booking dictionaries, continuation token of the next page or None).
+    """
+    query = f"SELECT {', '.join(f'c.{field}' for field in fields)} FROM c"
+    try:
+        pager = container.query_items(query=query, enable_cross_partition_query=True,
+                                      max_item_count=page_size).by_page(continuation_token)
+        for page in pager:
+            items = list(page)
+            if items or not pager.continuation_token:
+                yield items, pager.continuation_token
+    except exceptions.CosmosHttpResponseError as e:
+        # Log any errors, e.g. an expired continuation token
+        logger.error(f"Error fetching a page of bookings from Cosmos DB: {e}")
+
+def _allocation_filter(campground_id=None):
+    """
+    Returns the WHERE clause and parameters selecting the allocated bookings, optionally of one campground.
+    """
+    clause = "WHERE IS_DEFINED(c.campsite_id) AND NOT IS_NULL(c.campsite_id)"
+    parameters = []
+    if campground_id is not None:
+        clause += " AND c.campground_id = @campground_id"
+        parameters.append({"name": "@campground_id", "value": campground_id})
+    return clause, parameters
+
+# Function to fetch the stored campsite allocations from Cosmos DB
+def fetch_booked_allocations(container, campground_id=None):
+    """
+    Fetches the campsite allocation of every allocated booking, projecting only the fields needed
+    to rebuild campsite occupancy.
+
+    :param container: Cosmos DB container client for the Bookings container.
+    :param campground_id: Only fetch allocations for this campground (optional).
+    :return: List of dictionaries with booking_id, arrival_date, campsite_id, campsite_allocations and total_cost.
+    :raises exceptions.CosmosHttpResponseError: If the query fails; an empty list would let campsites
+                                                that are already taken be allocated again.
+    """
+    try:
+        clause, parameters = _allocation_filter(campground_id)
+        query = ("SELECT c.booking_id, c.arrival_date, c.campsite_id, c.campsite_allocations, c.total_cost "
+                 f"FROM c {clause}")
+        allocations = list(container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True))
+        logger.info(f"Fetched {len(allocations)} stored allocations from Cosmos DB.")
+        return allocations
+    except exceptions.CosmosHttpResponseError as e:
+        # Log any errors
+        logger.error(f"Error fetching allocations from Cosmos DB: {e}")
+        raise
+
+# Function to check how many allocations are stored in Cosmos DB
+def fetch_allocation_stats(container, campground_id=None):
+    """
+    Counts the allocated bookings and finds the highest allocated booking_id, without reading the documents.
+
+    Used to tell whether a local allocation snapshot still matches Cosmos DB.
+
+    :param container: Cosmos DB container client for the Bookings container.
+    :param campground_id: Only count allocations for this campground (optional).
+    :return: Tuple (number of allocated bookings, highest allocated booking_id or None).
+    :raises exceptions.CosmosHttpResponseError: If a query fails.
+    """
+    try:
+        clause, parameters = _allocation_filter(campground_id)
+        stats = []
+        for aggregate in ("COUNT(1)", "MAX(c.booking_id)"):
+            results = list(container.query_items(query=f"SELECT VALUE {aggregate} FROM c {clause}",
+                                                 parameters=parameters, enable_cross_partition_query=True))
+            stats.append(results[0] if results else None)
+        return stats[0] or 0, stats[1]
+    except exceptions.CosmosHttpResponseError as e:
+        # Log any errors
+        logger.error(f"Error counting allocations in Cosmos DB: {e}")
+        raise
+
+# Ways of writing a booking document: 'create' skips bookings already stored, 'upsert' overwrites
+# them, and 'query' checks for the booking_id before creating. Documents written before ids were
+# derived from booking_ids have random ids that only the query finds, so 'query' stays the default
+# until migrate_booking_ids has run; then set "booking_write_mode" in the cosmos_db configuration.
+BOOKING_WRITE_MODES = ('create', 'upsert', 'query')
+DEFAULT_BOOKING_WRITE_MODE = 'query'
+
+# System properties Cosmos DB adds to every document, dropped when a document is re-keyed
+SYSTEM_PROPERTIES = ('_rid', '_self', '_etag', '_attachments', '_ts')
+
+# Function to get the document id of a booking
+def booking_document_id(booking_id):
+    """
+    Returns the id of the Cosmos DB document of a booking, derived from its booking_id so writes are idempotent.
+
+    :param booking_id: The booking ID.
+    :return: The document id as a string.
+    """
+    return str(booking_id)
+
+# Function to get the configured booking write mode
+def get_booking_write_mode():
+    """
+    Returns the booking write mode set by "booking_write_mode" in the cosmos_db configuration.
+
+    Without that setting, or without a readable configuration, DEFAULT_BOOKING_WRITE_MODE is used.
+
+    :return: One of BOOKING_WRITE_MODES.
+    :raises ValueError: If the configuration names an unknown mode.
+    """
+    try:
+        mode = load_config().get('cosmos_db', {}).get('booking_write_mode') or DEFAULT_BOOKING_WRITE_MODE
+    except (OSError, ValueError):
+        mode = DEFAULT_BOOKING_WRITE_MODE
+    if mode not in BOOKING_WRITE_MODES:
+        raise ValueError(f"Unknown booking write mode '{mode}'. Choose from: {', '.join(BOOKING_WRITE_MODES)}.")
+    return mode
+
+# Function to insert a booking into Cosmos DB
+def insert_booking_to_cosmos(container, booking_data, mode=None):
     """
     Inserts a booking into the Cosmos DB container if it does not already exist.
 
+    The document id is the booking_id, so a repeated insert is a conflict Cosmos DB rejects atomically
+    ('create') or an overwrite of the same document ('upsert'), without querying for it first. The
+    'query' mode also looks for documents of the booking stored under random ids before creating it.
+
     :param container: Cosmos DB container client.
     :param booking_data: The booking data to insert.
+    :param mode: One of BOOKING_WRITE_MODES (defaults to get_booking_write_mode()).
+    :return: True if the booking is stored, by this call or an earlier one; False if it could not be written.
+    :raises ValueError: If the mode is unknown.
     """
+    mode = mode or get_booking_write_mode()
+    if mode not in BOOKING_WRITE_MODES:
+        raise ValueError(f"Unknown booking write mode '{mode}'. Choose from: {', '.join(BOOKING_WRITE_MODES)}.")
     booking_id = booking_data.get('booking_id')
     if not booking_id:
         logger.error("Booking data is missing the 'booking_id'. Skipping insertion.")
-        return
+        return False
 
     # Try to insert the booking into the container
     try:
-        # Check if the booking already exists in the container
-        query = "SELECT * FROM c WHERE c.booking_id = @booking_id"
-        parameters = [{"name": "@booking_id", "value": booking_id}]
-        existing_booking = list(container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True))
+        if mode == 'query':
+            # Check if the booking already exists in the container
+            query = "SELECT * FROM c WHERE c.booking_id = @booking_id"
+            parameters = [{"name": "@booking_id", "value": booking_id}]
+            existing_booking = list(container.query_items(query=query, parameters=parameters, enable_cross_partition_query=True))
+            if existing_booking:
+                logger.info(f"Booking with ID {booking_id} already exists in Cosmos DB. Skipping insertion.")
+                return True
+        booking_data['id'] = booking_document_id(booking_id)
 
-        if existing_booking:
-            logger.info(f"Booking with ID {booking_id} already exists in Cosmos DB. Skipping insertion.")
+        if mode == 'upsert':
+            container.upsert_item(booking_data)
         else:
-            # Generate a unique ID for the item and insert it into the container
-            booking_data['id'] = str(uuid.uuid4())
             container.create_item(booking_data)
-            logger.info(f"Booking {booking_id} inserted into Cosmos DB successfully.")
+        logger.info(f"Booking {booking_id} inserted into Cosmos DB successfully.")
+        return True
+    except exceptions.CosmosResourceExistsError:
+        # A document with the booking's id exists: the booking was stored by an earlier run
+        logger.info(f"Booking with ID {booking_id} already exists in Cosmos DB. Skipping insertion.")
+        return True
     except exceptions.CosmosHttpResponseError as e:
         # Log HTTP errors
         logger.error(f"HTTP error while inserting booking {booking_id} into Cosmos DB: {e.status_code} {e.message}")
     except Exception as e:
         # Log other exceptions
         logger.error(f"Error inserting booking {booking_id} into Cosmos DB: {e}")
+    return False
+
+# Function to read a booking from Cosmos DB
+def read_booking_from_cosmos(container, booking_id):
+    """
+    Reads a booking document by its booking_id with a point read, the cheapest Cosmos DB read.
+
+    :param container: Cosmos DB container client for the Bookings container (partitioned by booking_id).
+    :param booking_id: The booking ID.
+    :return: The booking document, or None if it does not exist or cannot be read.
+    """
+    try:
+        return container.read_item(item=booking_document_id(booking_id), partition_key=booking_id)
+    except exceptions.CosmosResourceNotFoundError:
+        return None
+    except exceptions.CosmosHttpResponseError as e:
+        # Log HTTP errors
+        logger.error(f"HTTP error while reading booking {booking_id} from Cosmos DB: {e.status_code} {e.message}")
+        return None
+
+# Function to re-key booking documents
+def migrate_booking_ids(container):
+    """
+    Re-keys booking documents stored with random ids to the id derived from their booking_id.
+
+    Each document is upserted under its new id before the old one is deleted, so an interrupted
+    migration can be run again. Duplicates of a booking collapse into one document.
+
+    :param container: Cosmos DB container client for the Bookings container.
+    :return: Dictionary with the number of documents 'migrated' and 'failed'.
+    """
+    result = {'migrated': 0, 'failed': 0}
+    query = "SELECT * FROM c WHERE IS_DEFINED(c.booking_id) AND c.id != ToString(c.booking_id)"
+    try:
+        documents = container.query_items(query=query, enable_cross_partition_query=True)
+        for document in documents:
+            booking_id = document['booking_id']
+            old_id = document['id']
+            try:
+                body = {key: value for key, value in document.items() if key not in SYSTEM_PROPERTIES}
+                body['id'] = booking_document_id(booking_id)
+                container.upsert_item(body)
+                container.delete_item(item=old_id, partition_key=booking_id)
+                result['migrated'] += 1
+            except exceptions.CosmosHttpResponseError as e:
+                logger.error(f"Error re-keying booking {booking_id} (document {old_id}): {e}")
+                result['failed'] += 1
+    except exceptions.CosmosHttpResponseError as e:
+        # Log any errors
+        logger.error(f"Error querying bookings to re-key in Cosmos DB: {e}")
+    logger.info(f"Re-keyed {result['migrated']} booking documents ({result['failed']} failed).")
+    return result
 
 # Function to upsert a booking into Cosmos DB
-def upsert_booking_pdf_to_cosmos(container, pdf_path, booking_id):
+def upsert_booking_pdf_to_cosmos(container, pdf_path, booking_id, blob_store=None):
     """
-    Upserts a PDF file into the Cosmos DB container with the pdf_id matching the booking_id.
+    Stores a PDF file in the blob store and upserts a reference to it into the Cosmos DB container,
+    with the pdf_id matching the booking_id.
 
     :param container: Cosmos DB container client.
     :param pdf_path: Path to the PDF file to insert.
     :param booking_id: The booking ID to use as the pdf_id in the Cosmos DB document.
+    :param blob_store: BlobStore to keep the PDF in (defaults to the configured store).
+    :return: True if the PDF and its document were stored, False otherwise.
     """
     try:
-        # Read the PDF file and encode it as a base64 string
-        with open(pdf_path, 'rb') as pdf_file:
-            pdf_data = pdf_file.read()
-            pdf_data_base64 = base64.b64encode(pdf_data).decode('utf-8')
+        # Store the PDF content; identical PDFs are kept once
+        blob = (blob_store or get_blob_store()).put_file(pdf_path, PDF_CONTENT_TYPE)
 
-        # Create a document structure for the PDF and upsert it into the container
+        # Create a document structure referencing the PDF and upsert it into the container
         pdf_document = {
             'id': str(booking_id),
             'pdf_id': str(booking_id),
-            'filename': pdf_path.split('/')[-1],
+            'filename': os.path.basename(pdf_path),
             'upload_date': str(datetime.utcnow()),
-            'pdf_data': pdf_data_base64
+            'blob': blob
         }
 
         container.upsert_item(body=pdf_document)
         logger.info(f"PDF {pdf_document['filename']} upserted into Cosmos DB successfully with pdf_id {pdf_document['pdf_id']}.")
+        return True
     except exceptions.CosmosHttpResponseError as e:
         # Log HTTP errors
         logger.error(f"HTTP error while upserting PDF for booking {booking_id}: {e.status_code} {e.message}")
     except Exception as e:
         # Log other exceptions
         logger.error(f"Error upserting PDF for booking {booking_id}: {e}")
+    return False
 
 # Function to upsert a summary PDF into Cosmos DB
-def upsert_summary_pdf_to_cosmos(container, pdf_path, summary_id):
+def upsert_summary_pdf_to_cosmos(container, pdf_path, summary_id, blob_store=None):
     """
-    Upserts a summary PDF file into the Cosmos DB container with the summary_id.
+    Stores a summary PDF file in the blob store and upserts a reference to it into the Cosmos DB
+    container with the summary_id.
 
     :param container: Cosmos DB container client.
     :param pdf_path: Path to the summary PDF file to insert.
     :param summary_id: The summary ID to use as the partition key in the Cosmos DB document.
+    :param blob_store: BlobStore to keep the PDF in (defaults to the configured store).
     """
     try:
-        # Read the summary PDF file and encode it as a base64 string
-        with open(pdf_path, 'rb') as pdf_file:
-            pdf_data = pdf_file.read()
-            pdf_data_base64 = base64.b64encode(pdf_data).decode('utf-8')
+        # Store the summary PDF content; identical PDFs are kept once
+        blob = (blob_store or get_blob_store()).put_file(pdf_path, PDF_CONTENT_TYPE)
 
-        # Create a document structure for the summary PDF and upsert it into the container
+        # Create a document structure referencing the summary PDF and upsert it into the container
         pdf_document = {
             'id': str(summary_id),
             'summary_id': str(summary_id),
-            'filename': pdf_path.split('/')[-1],
+            'filename': os.path.basename(pdf_path),
             'upload_date': str(datetime.utcnow()),
-            'pdf_data': pdf_data_base64
+            'blob': blob
         }
 
         container.upsert_item(body=pdf_document)
@@ -155,7 +410,27 @@ def upsert_summary_pdf_to_cosmos(container, pdf_path, summary_id):
         # Log other exceptions
         logger.error(f"Error upserting summary PDF: {e}")
 
-# Function to fetch a PDF file from Cosmos DB
+# Function to open a stored PDF
+def open_pdf_document(pdf_document, blob_store=None):
+    """
+    Opens the PDF a Cosmos DB PDF document refers to, for streaming.
+
+    Documents written before the blob store hold the PDF inline as base64, and are decoded instead.
+
+    :param pdf_document: Document from the PDFs or Summary_PDFs container.
+    :param blob_store: BlobStore the PDF is kept in (defaults to the configured store).
+    :return: Binary file object of the PDF.
+    :raises ValueError: If the document holds no PDF.
+    :raises FileNotFoundError: If the blob store does not hold the referenced PDF.
+    """
+    blob = pdf_document.get('blob')
+    if blob:
+        return (blob_store or get_blob_store()).open(blob['key'])
+    if pdf_document.get('pdf_data'):
+        return io.BytesIO(base64.b64decode(pdf_document['pdf_data']))
+    raise ValueError(f"PDF document {pdf_document.get('id')} holds no PDF.")
+
+# Function to update a booking in Cosmos DB
 def update_booking_in_cosmos(container, booking_id, update_data):
     """
     Updates a booking document in Cosmos DB with the given booking ID.
@@ -166,7 +441,7 @@ def update_booking_in_cosmos(container, booking_id, update_data):
     """
     try:
         # Read the existing booking document from the container
-        booking = container.read_item(item=booking_id, partition_key=booking_id)
+        booking = container.read_item(item=booking_document_id(booking_id), partition_key=booking_id)
         booking.update(update_data)  # Update the document with the new data
         container.replace_item(item=booking['id'], body=booking)  # Replace the existing document with the updated version
         logger.info(f"Booking with ID {booking_id} updated successfully in Cosmos DB.")
@@ -187,7 +462,7 @@ def delete_booking_from_cosmos(container, booking_id):
     """
     try:
         # Delete the booking document from the container
-        container.delete_item(item=booking_id, partition_key=booking_id)
+        container.delete_item(item=booking_document_id(booking_id), partition_key=booking_id)
         logger.info(f"Booking with ID {booking_id} deleted successfully from Cosmos DB.")
     except exceptions.CosmosResourceNotFoundError:
         # Log if the booking is not found
@@ -1,27 +1,75 @@
 from Utils.logging_config import logger
+from Models.booking import Booking
+from Utils.config_loader import load_config
+from Database.sql_backend import DATABASE_ERRORS, get_sql_backend
+from Utils.sql_registry import get_statement
 import pyodbc
 import json
-import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+
+# Rows requested from the driver per fetchmany call when streaming bookings
+DEFAULT_FETCH_ARRAYSIZE = 1000
+
+def _bookings_query(campground_id, after_booking_id=None):
+    """
+    Builds the bookings query and its parameters, limited to bookings after a high-water mark if one is given.
+
+    :param campground_id: The Head Office campground whose bookings are fetched.
+    :param after_booking_id: Only fetch bookings with a greater booking_id (optional).
+    :return: Tuple (query, parameters).
+    """
+    if after_booking_id is None:
+        statement = get_statement('fetch_bookings')
+    else:
+        statement = get_statement('fetch_bookings_after')
+    return statement.sql, statement.bind({'campground_id': campground_id, 'after_booking_id': after_booking_id})
+
+# Rows fetched per keyset page by parallel extraction
+DEFAULT_PAGE_SIZE = 5000
+
+def _page_query(campground_id, after_booking_id, last_booking_id, page_size, dialect='tsql'):
+    """
+    Builds the query and parameters for one keyset page: the next page_size bookings after after_booking_id.
+
+    :param campground_id: The Head Office campground whose bookings are fetched.
+    :param after_booking_id: The page starts after this booking_id.
+    :param last_booking_id: The page ends at or before this booking_id.
+    :param page_size: Maximum number of rows in the page.
+    :param dialect: SQL dialect of the connection, which decides how the row limit is written.
+    :return: Tuple (query, parameters).
+    """
+    statement = get_statement('fetch_booking_page', dialect)
+    return statement.sql, statement.bind({'campground_id': campground_id, 'after_booking_id': after_booking_id,
+                                          'last_booking_id': last_booking_id, 'page_size': page_size})
+
+# Marks the end of a prefetched booking stream
+_END_OF_STREAM = object()
 
 
 # Function to connect to the Head Office SQL database
 def connect_to_head_office():
+    """
+    Connects to the Head Office database of the configured backend (see Database.sql_backend).
+
+    :return: Connection object to the Head Office SQL database or None if connection fails.
+    """
+    return get_sql_backend().connect_head_office()
+
+# Function to connect to the Head Office Azure SQL database over ODBC
+def connect_head_office_odbc():
     """
     Connects to the Head Office SQL database using values from the connection_strings.json file in the Assets folder.
+    The file is only re-read when it changes (see Utils.config_loader.load_config).
 
     :return: Connection object to the Head Office SQL database or None if connection fails.
     """
-    # Define the path to the connection_strings.json file
-    json_file_path = os.path.join('Assets', 'connection_strings.json')
-    
     # Attempt to connect to the Head Office SQL database
     try:
-        # Load connection details from the JSON file
-        with open(json_file_path, 'r') as config_file:
-            config = json.load(config_file)
-        
-        # Extract the head_office connection details
-        head_office_config = config['head_office']
+        # Load connection details from the cached configuration
+        head_office_config = load_config()['head_office']
 
         # Define the connection string using parameters from the JSON configuration
         connection_string = (
@@ -58,43 +106,203 @@ def connect_to_head_office():
         return None
 
 # Function to fetch bookings from the Head Office SQL database
-def fetch_bookings(conn):
+def fetch_bookings(conn, campground_id=1, after_booking_id=None):
     """
     Fetches bookings from the head office camping.booking table and includes customer names.
 
     :param conn: The connection object to the SQL database.
-    :return: A list of booking records or an empty list if an error occurs.
+    :param campground_id: The Head Office campground whose bookings are fetched.
+    :param after_booking_id: Only fetch bookings with a greater booking_id, e.g. the last one processed (optional).
+    :return: A list of booking records in booking_id order or an empty list if an error occurs.
     """
     try:
         cursor = conn.cursor()
-        # SQL query to fetch booking details and join with customer information
-        query = """
-        SELECT 
-            b.booking_id, 
-            b.customer_id, 
-            b.booking_date, 
-            b.arrival_date, 
-            b.campground_id, 
-            b.campsite_size, 
-            b.num_campsites, 
-            CONCAT(c.first_name, ' ', c.last_name) AS customer_name
-        FROM 
-            camping.booking b
-        JOIN 
-            camping.customers c ON b.customer_id = c.customer_id
-        WHERE 
-            b.campground_id = 1;
-        """
-        cursor.execute(query)  # Execute the query
+        # Fetch booking details joined with customer information
+        query, params = _bookings_query(campground_id, after_booking_id)
+        cursor.execute(query, params)  # Execute the query for the requested campground
         rows = cursor.fetchall()  # Fetch all the rows from the executed query
         logger.info(f"Fetched {len(rows)} bookings from the Head Office database.")
         return rows  # Return the fetched booking records
 
-    except pyodbc.Error as e:
+    except DATABASE_ERRORS as e:
         # Log a warning if fetching the bookings fails
         logger.warning(f"Error fetching bookings from Head Office database: {e}")
         return []  # Return an empty list if an error occurs
 
+# Function to stream bookings from the Head Office SQL database in batches
+def stream_booking_batches(conn, campground_id=1, arraysize=DEFAULT_FETCH_ARRAYSIZE, prefetch=2, after_booking_id=None):
+    """
+    Yields the bookings of a campground in batches of Booking objects, fetched with fetchmany.
+
+    Only a few batches are held at a time, so memory stays flat however many bookings the campground
+    has. With prefetch, a background thread fetches the next batches while the caller processes the
+    current one, overlapping network transfer with allocation. The connection must not run other
+    statements until the stream is exhausted or closed.
+
+    :param conn: The connection object to the SQL database.
+    :param campground_id: The Head Office campground whose bookings are fetched.
+    :param arraysize: Number of rows fetched per batch.
+    :param prefetch: Number of batches fetched ahead in a background thread (0 fetches in the caller's thread).
+    :param after_booking_id: Only fetch bookings with a greater booking_id (optional).
+    :return: Generator of lists of Booking objects; stops early, with a warning logged, if fetching fails.
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.arraysize = arraysize
+        cursor.execute(*_bookings_query(campground_id, after_booking_id))
+    except DATABASE_ERRORS as e:
+        logger.warning(f"Error fetching bookings from Head Office database: {e}")
+        return
+
+    fetched = 0
+    row_batches = _prefetch_row_batches(cursor, arraysize, prefetch) if prefetch else _fetch_row_batches(cursor, arraysize)
+    try:
+        for rows in row_batches:
+            if isinstance(rows, Exception):
+                logger.warning(f"Error fetching bookings from Head Office database after {fetched} rows: {rows}")
+                break
+            fetched += len(rows)
+            yield Booking.from_db_records(rows)
+    finally:
+        row_batches.close()
+    logger.info(f"Streamed {fetched} bookings from the Head Office database.")
+
+def _fetch_row_batches(cursor, arraysize):
+    """
+    Fetches row batches in the caller's thread.
+
+    :param cursor: Cursor with an executed query.
+    :param arraysize: Number of rows fetched per batch.
+    :return: Generator of row lists; a fetch error is yielded as the exception object and ends the stream.
+    """
+    while True:
+        try:
+            rows = cursor.fetchmany(arraysize)
+        except DATABASE_ERRORS as e:
+            yield e
+            return
+        if not rows:
+            return
+        yield rows
+
+def _prefetch_row_batches(cursor, arraysize, prefetch):
+    """
+    Fetches row batches in a background thread, at most `prefetch` batches ahead of the consumer.
+
+    :param cursor: Cursor with an executed query.
+    :param arraysize: Number of rows fetched per batch.
+    :param prefetch: Maximum number of batches waiting to be consumed.
+    :return: Generator of row lists; a fetch error is yielded as the exception object and ends the stream.
+    """
+    batches = queue.Queue(maxsize=prefetch)
+    stopped = threading.Event()
+
+    def put(item):
+        # Give up when the consumer has stopped, instead of blocking on a full queue forever
+        while not stopped.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch():
+        try:
+            while True:
+                rows = cursor.fetchmany(arraysize)
+                if not rows or not put(rows):
+                    break
+        except Exception as e:
+            # Hand the error to the consumer rather than silently ending the stream early
+            put(e)
+        finally:
+            put(_END_OF_STREAM)
+
+    fetcher = threading.Thread(target=fetch, name="head-office-prefetch", daemon=True)
+    fetcher.start()
+    try:
+        while True:
+            item = batches.get()
+            if item is _END_OF_STREAM:
+                break
+            yield item
+            if isinstance(item, Exception):
+                break
+    finally:
+        stopped.set()
+        fetcher.join()
+
+# Function to fetch bookings with several connections at once, for backfills and full re-syncs
+def fetch_bookings_parallel(pool, campground_id=1, parallelism=4, after_booking_id=None, page_size=DEFAULT_PAGE_SIZE,
+                            dialect='tsql'):
+    """
+    Fetches the bookings of a campground in parallel, one booking_id range per pooled connection.
+
+    The campground's booking_id range is split into `parallelism` equal key ranges. Each range is read in a
+    thread on its own connection from the pool, page by page with keyset pagination (booking_id > last seen),
+    so no page re-scans the rows before it. The ranges are disjoint and ordered, so the merged result is in
+    booking_id order, as from fetch_bookings.
+
+    :param pool: ConnectionPool of Head Office connections; at most its max_size ranges are read at once.
+    :param campground_id: The Head Office campground whose bookings are fetched.
+    :param parallelism: Number of key ranges, and of threads reading them.
+    :param after_booking_id: Only fetch bookings with a greater booking_id (optional).
+    :param page_size: Number of rows per keyset page.
+    :param dialect: SQL dialect of the pool's connections, e.g. 'tsql' or 'sqlite'.
+    :return: A list of booking records in booking_id order, or an empty list if any range fails.
+    """
+    started = time.perf_counter()
+    low = 0 if after_booking_id is None else after_booking_id
+    try:
+        with pool.connection() as conn:
+            if conn is None:
+                logger.warning("Error fetching bookings from Head Office database: no connection available.")
+                return []
+            cursor = conn.cursor()
+            statement = get_statement('max_booking_id', dialect)
+            cursor.execute(statement.sql, statement.bind({'campground_id': campground_id, 'after_booking_id': low}))
+            high = cursor.fetchone()[0]
+    except DATABASE_ERRORS as e:
+        logger.warning(f"Error fetching bookings from Head Office database: {e}")
+        return []
+    if high is None:
+        logger.info("Fetched 0 bookings from the Head Office database.")
+        return []
+
+    # Split (low, high] into equal key ranges; each range is (after, last]
+    parallelism = max(1, min(parallelism, high - low))
+    bounds = [low + (high - low) * i // parallelism for i in range(parallelism + 1)]
+    ranges = list(zip(bounds, bounds[1:]))
+
+    def fetch_range(key_range):
+        after, last = key_range
+        rows = []
+        with pool.connection() as conn:
+            if conn is None:
+                raise pyodbc.Error("No Head Office connection available.")
+            cursor = conn.cursor()
+            while True:
+                cursor.execute(*_page_query(campground_id, after, last, page_size, dialect))
+                page = cursor.fetchall()
+                rows.extend(page)
+                if len(page) < page_size:
+                    return rows
+                after = page[-1][0]  # Continue after the last booking_id seen
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(parallelism, pool.max_size), thread_name_prefix="head-office-extract") as executor:
+            range_rows = list(executor.map(fetch_range, ranges))
+    except DATABASE_ERRORS as e:
+        # A partial result would leave gaps behind the ingestion checkpoint, so nothing is returned
+        logger.warning(f"Error fetching bookings from Head Office database in parallel: {e}")
+        return []
+
+    rows = [row for part in range_rows for row in part]
+    logger.info(f"Fetched {len(rows)} bookings from the Head Office database over {len(ranges)} key ranges "
+                f"in {time.perf_counter() - started:.3f}s.")
+    return rows
+
 # Function to update the campground_id of a specific booking in the camping.booking table
 def update_booking_campground(conn, booking_id, new_campground_id):
     """
@@ -107,11 +315,57 @@ def update_booking_campground(conn, booking_id, new_campground_id):
     try:
         cursor = conn.cursor()
         # SQL query to update the campground_id of a specific booking
-        query = "UPDATE camping.booking SET campground_id = ? WHERE booking_id = ?"
-        cursor.execute(query, (new_campground_id, booking_id))  # Execute the update query with parameters
+        statement = get_statement('update_booking_campground')
+        cursor.execute(statement.sql, statement.bind({'campground_id': new_campground_id, 'booking_id': booking_id}))
         conn.commit()  # Commit the changes to the database
         logger.info(f"Booking {booking_id} updated with new campground ID {new_campground_id} successfully.")
 
-    except pyodbc.Error as e:
+    except DATABASE_ERRORS as e:
         # Log a warning if updating the booking fails
         logger.warning(f"Error updating booking {booking_id} in Head Office database: {e}")
+
+# Function to write many campground updates back to the Head Office database in one transaction
+def update_booking_campgrounds(conn, updates, dialect='tsql'):
+    """
+    Updates the campground_id of many bookings with one set-based UPDATE in a single transaction.
+
+    The updates are bulk-loaded into a session temp table with fast_executemany and applied with one
+    joined UPDATE, so a run costs a handful of round trips and one commit instead of an UPDATE and a
+    commit per booking. Nothing is changed if any step fails.
+
+    :param conn: The connection object to the SQL database.
+    :param updates: Iterable of (booking_id, new_campground_id) pairs.
+    :param dialect: SQL dialect of the connection, which decides how the temp table is written.
+    :return: Dictionary with the number of updates requested, rows affected and seconds taken
+             (rows_affected is 0 if the write-back failed).
+    """
+    updates = list(dict(updates).items())  # One row per booking; the last update of a booking wins
+    result = {"requested": len(updates), "rows_affected": 0, "seconds": 0.0}
+    if not updates:
+        return result
+
+    create_table, insert_rows, apply_updates, drop_table = (
+        get_statement(name, dialect).sql for name in
+        ('create_campground_updates', 'insert_campground_updates', 'apply_campground_updates', 'drop_campground_updates'))
+    started = time.perf_counter()
+    try:
+        cursor = conn.cursor()
+        if dialect == 'tsql':
+            cursor.fast_executemany = True  # Send the parameter rows in bulk rather than one round trip each
+        cursor.execute(create_table)
+        cursor.executemany(insert_rows, updates)
+        cursor.execute(apply_updates)
+        rows_affected = cursor.rowcount
+        cursor.execute(drop_table)
+        conn.commit()  # One commit for the whole run
+        result["rows_affected"] = rows_affected
+        result["seconds"] = time.perf_counter() - started
+        logger.info(f"Wrote back {len(updates)} campground updates to Head Office: {rows_affected} rows affected "
+                    f"in {result['seconds']:.3f}s.")
+
+    except DATABASE_ERRORS as e:
+        # Roll back so a failed write-back leaves no partial updates or temp table behind
+        conn.rollback()
+        result["seconds"] = time.perf_counter() - started
+        logger.warning(f"Error writing back {len(updates)} campground updates to Head Office database: {e}")
+    return result
@@ -1,5 +1,6 @@
 import pyodbc
 from Utils.logging_config import logger
+from Utils.sql_registry import get_statement
 
 def connect_to_sql(): #TODO remove other sql tables that arent needed
     """
@@ -112,23 +113,21 @@ def create_tables(cursor):
         # Log any errors encountered during table creation
         logger.error(f"Error creating tables: {e}")
 
-def execute_sql_file(cursor, file_path):
+def execute_sql_file(cursor, statement_name):
     """
-    Executes an SQL script from a file.
+    Executes an SQL script from the Assets/sql statement registry.
 
     :param cursor: Cursor object for the SQL connection.
-    :param file_path: Path to the .sql file to be executed.
+    :param statement_name: Name of the .sql file to be executed, without extension.
     """
     try:
-        # Read and execute the SQL script from the specified file path
-        with open(file_path, 'r') as file:
-            sql_script = file.read()
-        cursor.execute(sql_script)
-        logger.info(f"SQL script {file_path} executed successfully.")
-
-    except FileNotFoundError:
-        # Log error if the specified file is not found
-        logger.error(f"SQL file not found: {file_path}")
+        # Execute the SQL script loaded by the registry
+        cursor.execute(get_statement(statement_name).sql)
+        logger.info(f"SQL script {statement_name} executed successfully.")
+
+    except KeyError:
+        # Log error if the script is not in Assets/sql
+        logger.error(f"SQL file not found: {statement_name}.sql")
     except pyodbc.Error as e:
         # Log any errors encountered during script execution
         logger.error(f"Error executing SQL script: {e}")
@@ -149,10 +148,8 @@ def setup_database():
             conn.commit()  # Commit the changes to the database
 
             #Execute initial setup SQL files (if needed)
-            create_schema_path = "Assets/create_head_office_schema.sql"  # Path to schema creation script
-            load_data_path = "Assets/load_head_office_data.sql"          # Path to data loading script
-            execute_sql_file(cursor, create_schema_path)
-            execute_sql_file(cursor, load_data_path)
+            execute_sql_file(cursor, 'create_head_office_schema')  # Schema creation script
+            execute_sql_file(cursor, 'load_head_office_data')      # Data loading script
             conn.commit()  # Commit the changes after executing scripts
 
         except Exception as e:
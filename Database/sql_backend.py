@@ -0,0 +1,227 @@
+import os
+import random
+import sqlite3
+import threading
+from datetime import date, timedelta
+import pyodbc
+from Utils.config_loader import load_config
+from Utils.logging_config import logger
+from Utils.sql_registry import get_statement
+
+# Driver errors of every backend, caught wherever database errors are handled
+DATABASE_ERRORS = (pyodbc.Error, sqlite3.Error)
+
+# Project root, against which relative SQLite directories are resolved so they do not depend on the working directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Directory of the SQLite databases when the configuration does not name one
+DEFAULT_SQLITE_DIR = os.path.join(PROJECT_ROOT, 'Logs', 'sqlite')
+
+class SqlBackend:
+    """
+    Base class for the databases behind the local SQL and Head Office connections.
+
+    Every backend holds the camping.customers, camping.booking and camping.summary tables and hands
+    out DB-API connections with qmark parameters, so the rest of the code runs unchanged on any of them.
+    """
+
+    name = None
+    dialect = None  # SQL dialect of the connections, which selects the statement versions in Assets/sql
+
+    def connect_local(self):
+        """
+        Connects to the local camping database.
+
+        :return: Connection object, or None if the connection fails.
+        """
+        raise NotImplementedError
+
+    def connect_head_office(self):
+        """
+        Connects to the Head Office database.
+
+        :return: Connection object, or None if the connection fails.
+        """
+        raise NotImplementedError
+
+class OdbcBackend(SqlBackend):
+    """
+    Azure SQL databases over ODBC, the production backend.
+    """
+
+    name = 'odbc'
+    dialect = 'tsql'
+
+    def connect_local(self):
+        # Imported here because the connection modules select their backend from this one
+        from Database.sql_db import connect_odbc
+        return connect_odbc()
+
+    def connect_head_office(self):
+        from Database.head_office_db import connect_head_office_odbc
+        return connect_head_office_odbc()
+
+class SqliteBackend(SqlBackend):
+    """
+    Local SQLite databases with the camping schema, for load testing and CI without a network.
+
+    The local and Head Office databases are separate files in one directory. Each file is attached
+    as 'camping' so queries keep their camping.* table names, and CONCAT is provided for SQLite
+    versions that lack it. The schema is created from Assets/sql on first connect.
+    """
+
+    name = 'sqlite'
+    dialect = 'sqlite'
+
+    def __init__(self, directory=DEFAULT_SQLITE_DIR):
+        """
+        Initializes a SqliteBackend.
+
+        :param directory: Directory holding the local.db and head_office.db files; created if missing.
+                          A relative directory is taken from the project root.
+        """
+        self.directory = os.path.join(PROJECT_ROOT, directory)
+        self.local_path = os.path.join(self.directory, 'local.db')
+        self.head_office_path = os.path.join(self.directory, 'head_office.db')
+        self._schema_created = set()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        """Provides a string representation of the SqliteBackend object."""
+        return f"<SqliteBackend {self.directory}>"
+
+    def connect_local(self):
+        return self.connect(self.local_path)
+
+    def connect_head_office(self):
+        return self.connect(self.head_office_path)
+
+    def connect(self, path):
+        """
+        Opens a connection with a database file attached as 'camping', creating the schema the first time.
+
+        Connections may be used from other threads than the one that opened them, as pools and
+        prefetching do.
+
+        :param path: Path of the database file.
+        :return: sqlite3 connection.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        conn = sqlite3.connect(':memory:', check_same_thread=False, timeout=30)
+        conn.create_function('CONCAT', -1, _concat)
+        conn.execute("ATTACH DATABASE ? AS camping", (path,))
+        with self._lock:
+            if path not in self._schema_created:
+                self.create_schema(conn)
+                self._schema_created.add(path)
+        return conn
+
+    def create_schema(self, conn):
+        """
+        Creates the camping tables from Assets/sql/sqlite/create_camping_schema.sql if they do not exist.
+
+        :param conn: Connection with the database attached as 'camping'.
+        """
+        conn.executescript(get_statement('create_camping_schema', self.dialect).sql)
+        logger.info(f"SQLite camping schema ready in {self.directory}.")
+
+    def load_synthetic_bookings(self, bookings, campground_id=1, customers=50_000, seed=42, chunk_size=100_000,
+                                season_start=date(2026, 1, 3)):
+        """
+        Appends synthetic bookings for a campground to the Head Office database.
+
+        Booking IDs continue after the highest one present, so repeated loads add new bookings, as
+        Head Office would between incremental runs. Rows are generated and inserted in chunks, so
+        millions of bookings load in constant memory.
+
+        :param bookings: Number of bookings to add.
+        :param campground_id: The Head Office campground the bookings belong to.
+        :param customers: Number of customers, created on the first load.
+        :param seed: Random seed, so loads are repeatable.
+        :param chunk_size: Rows inserted per executemany call.
+        :param season_start: First arrival date; arrivals fall within the following year.
+        :return: Tuple (first booking_id, last booking_id) of the added bookings.
+        """
+        rng = random.Random(seed)
+        conn = self.connect_head_office()
+        try:
+            conn.execute("PRAGMA camping.synchronous = OFF")  # A synthetic load can be regenerated if interrupted
+            if conn.execute("SELECT COUNT(*) FROM camping.customers").fetchone()[0] == 0:
+                conn.executemany("INSERT INTO camping.customers (customer_id, first_name, last_name) VALUES (?, ?, ?)",
+                                 ((customer_id, f"First{customer_id}", f"Last{customer_id}")
+                                  for customer_id in range(1, customers + 1)))
+            customer_count = conn.execute("SELECT MAX(customer_id) FROM camping.customers").fetchone()[0]
+            first_id = (conn.execute("SELECT MAX(booking_id) FROM camping.booking").fetchone()[0] or 0) + 1
+
+            arrival_dates = [(season_start + timedelta(days=day)).isoformat() for day in range(364)]
+            booking_dates = [(season_start - timedelta(days=90) + timedelta(days=day)).isoformat() for day in range(454)]
+            sizes = ('Small', 'Medium', 'Large')
+            for chunk_start in range(first_id, first_id + bookings, chunk_size):
+                chunk_end = min(chunk_start + chunk_size, first_id + bookings)
+                rows = []
+                for booking_id in range(chunk_start, chunk_end):
+                    day = rng.randrange(364)
+                    rows.append((booking_id, rng.randint(1, customer_count), booking_dates[day + rng.randrange(90)],
+                                 arrival_dates[day], campground_id, sizes[rng.randrange(3)], rng.choice((1, 1, 1, 2, 3))))
+                conn.executemany("INSERT INTO camping.booking VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info(f"Loaded {bookings} synthetic bookings for campground {campground_id} into {self.head_office_path}.")
+        return first_id, first_id + bookings - 1
+
+SQL_BACKENDS = {
+    OdbcBackend.name: OdbcBackend,
+    SqliteBackend.name: SqliteBackend,
+}
+
+# Backend chosen with set_sql_backend, and the backend built from the configuration with its settings
+_selected_backend = None
+_configured_backend = (None, None)
+_backend_lock = threading.Lock()
+
+def get_sql_backend():
+    """
+    Returns the SQL backend to connect with.
+
+    The backend is the one passed to set_sql_backend, or else the "sql_backend" section of
+    connection_strings.json, e.g. {"type": "sqlite", "directory": "Logs/sqlite"}. Without that
+    section, or without a readable configuration, the ODBC backend is used.
+
+    :return: SqlBackend instance.
+    :raises ValueError: If the configuration names an unknown backend type.
+    """
+    global _configured_backend
+    if _selected_backend is not None:
+        return _selected_backend
+    try:
+        settings = load_config().get('sql_backend') or {'type': OdbcBackend.name}
+    except (OSError, ValueError):
+        settings = {'type': OdbcBackend.name}
+
+    with _backend_lock:
+        cached_settings, backend = _configured_backend
+        if backend is None or cached_settings != settings:
+            options = dict(settings)
+            backend_type = options.pop('type', OdbcBackend.name)
+            if backend_type not in SQL_BACKENDS:
+                raise ValueError(f"Unknown SQL backend '{backend_type}'. Choose from: {', '.join(SQL_BACKENDS)}.")
+            backend = SQL_BACKENDS[backend_type](**options)
+            _configured_backend = (settings, backend)
+            logger.info(f"Using the {backend_type} SQL backend.")
+        return backend
+
+def set_sql_backend(backend):
+    """
+    Selects the SQL backend for the process, overriding the configuration, e.g. for benchmarks and tests.
+
+    :param backend: SqlBackend instance, or None to go back to the configured backend.
+    """
+    global _selected_backend
+    _selected_backend = backend
+
+def _concat(*parts):
+    """
+    CONCAT for SQLite versions before 3.44: joins the parts, treating NULL as an empty string.
+    """
+    return ''.join('' if part is None else str(part) for part in parts)
@@ -1,10 +1,21 @@
 import pyodbc
+from Database.sql_backend import get_sql_backend
 from Utils.logging_config import logger
 
 # Function to connect to the local SQL database
 def connect_to_sql():
     """
-    Connects to the local SQL database (camping).
+    Connects to the local SQL database (camping) of the configured backend (see Database.sql_backend).
+
+    :return: Connection object to the SQL database.
+    :raises Exception: If the connection fails.
+    """
+    return get_sql_backend().connect_local()
+
+# Function to connect to the local Azure SQL database over ODBC
+def connect_odbc():
+    """
+    Connects to the local SQL database (camping) on Azure SQL over ODBC.
 
     :return: Connection object to the SQL database.
     :raises Exception: If the connection fails.
@@ -1,14 +1,21 @@
 import sys
 import os
 import logging
-import io
+import threading
+import time
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file
+from datetime import datetime
+from flask import Flask, render_template, request, redirect, url_for, flash, send_file, jsonify
+from Models.allocation_strategy import ALLOCATION_STRATEGIES, GreedyStrategy
 from Models.booking import Booking
-from Utils.booking_processor import process_bookings
-from Database.sql_db import connect_to_sql
-from Database.cosmos_db import connect_to_cosmos, fetch_cosmos_bookings
-from Utils.campsite_manager import initialize_campsites
+from Models.booking_frame import as_booking_frame
+from Utils.booking_processor import filter_new_bookings, process_bookings
+from Database.connection_pool import get_pool, pool_stats
+from azure.cosmos import exceptions
+from Database.cosmos_db import (DEFAULT_BOOKINGS_PAGE_SIZE, MAX_BOOKINGS_PAGE_SIZE, connect_to_cosmos, fetch_cosmos_bookings,
+                                iter_cosmos_booking_pages, open_pdf_document, read_booking_from_cosmos)
+from Utils.availability_service import AvailabilityCalendar
+from Utils.campsite_manager import initialize_campsites, warm_start_campsites
 from Utils.summary_manager import create_and_insert_summary, generate_summary, display_summary
 from Database.head_office_db import connect_to_head_office, fetch_bookings
 from Utils.logging_config import logger
@@ -24,6 +31,59 @@ logging.basicConfig(level=logging.INFO, format='%(message)s')
 # Global variable to hold processed bookings
 processed_bookings = []
 
+# Campground whose bookings the web app processes and whose availability it serves by default
+APP_CAMPGROUND_ID = 1121132
+
+# Campgrounds /availability serves; each has one cached calendar, so other IDs are rejected
+AVAILABILITY_CAMPGROUND_IDS = frozenset({APP_CAMPGROUND_ID})
+
+# Free-campsite calendars served by /availability, by campground: (calendar, time built, build number).
+# A calendar is rebuilt from Cosmos DB once it is older than AVAILABILITY_REFRESH_SECONDS, so bookings
+# stored by other processes (e.g. main.py) show up, and replaced after each processing run.
+availability_calendars = {}
+availability_lock = threading.Lock()
+availability_builds = 0
+AVAILABILITY_REFRESH_SECONDS = 60  # Seconds a calendar is served before it is rebuilt from Cosmos DB
+AVAILABILITY_MAX_AGE = 30  # Seconds clients and proxies may reuse an availability response
+
+def store_availability_calendar(campground_id, calendar):
+    """
+    Serves a calendar as the campground's availability and returns its cache entry.
+
+    Must be called with availability_lock held.
+
+    :param campground_id: The campground ID.
+    :param calendar: AvailabilityCalendar object.
+    :return: Tuple (calendar, time built, build number).
+    """
+    global availability_builds
+    availability_builds += 1
+    entry = (calendar, time.monotonic(), availability_builds)
+    availability_calendars[campground_id] = entry
+    return entry
+
+def get_availability_calendar(campground_id=APP_CAMPGROUND_ID):
+    """
+    Returns the availability calendar of a campground, building it from the campground's allocations
+    stored in Cosmos DB on first use and again once it is older than AVAILABILITY_REFRESH_SECONDS.
+
+    :param campground_id: The campground ID, one of AVAILABILITY_CAMPGROUND_IDS.
+    :return: Tuple (AvailabilityCalendar object, build number).
+    :raises ValueError: If the campground is not in AVAILABILITY_CAMPGROUND_IDS.
+    """
+    if campground_id not in AVAILABILITY_CAMPGROUND_IDS:
+        raise ValueError(f"Unknown campground {campground_id}.")
+    entry = availability_calendars.get(campground_id)
+    if entry is None or time.monotonic() - entry[1] > AVAILABILITY_REFRESH_SECONDS:
+        with availability_lock:
+            # Another request may have rebuilt the calendar while this one waited for the lock
+            entry = availability_calendars.get(campground_id)
+            if entry is None or time.monotonic() - entry[1] > AVAILABILITY_REFRESH_SECONDS:
+                campsites, _ = warm_start_campsites(connect_to_cosmos("Bookings"), campground_id=campground_id)
+                entry = store_availability_calendar(campground_id, AvailabilityCalendar(campsites))
+    calendar, _, build = entry
+    return calendar, build
+
 # Define the main route for the Flask app
 @app.route('/')
 def index():
@@ -33,14 +93,13 @@ def index():
     :return: Rendered index page with bookings data.
     """
     try:
+        # The page only needs to know whether there are bookings, so read a single projected one
         cosmos_conn = connect_to_cosmos("Bookings")
-        bookings = fetch_cosmos_bookings(cosmos_conn)
-        for booking in bookings:
-            logger.info(f"Booking ID: {booking.booking_id}, Customer Name: {booking.customer_name}")
+        bookings, _ = next(iter_cosmos_booking_pages(cosmos_conn, page_size=1, fields=('booking_id',)), ([], None))
 
         if not bookings:
             flash('No bookings available.', 'info')
-        return render_template('index.html', bookings=bookings)
+        return render_template('index.html', bookings=bookings, strategies=list(ALLOCATION_STRATEGIES))
     except Exception as e:
         logger.error(f"Error loading index: {str(e)}")
         flash(f'Error loading index: {str(e)}', 'danger')
@@ -56,17 +115,22 @@ def process_bookings_route():
     """
     global processed_bookings
     try:
-        sql_conn = connect_to_sql()
-        head_office_conn = connect_to_head_office()
-        cosmos_conn = connect_to_cosmos("Bookings")
-
-        raw_bookings = fetch_bookings(head_office_conn)
-        bookings = [Booking.from_db_record(record) for record in raw_bookings]
-        campsites = initialize_campsites()
-        campground_id = 1121132
-
-        process_bookings(bookings, campsites, head_office_conn, cosmos_conn, campground_id)
+        # Check the Head Office connection out of the shared pool instead of connecting for every request
+        with get_pool('head_office', connect_to_head_office).connection() as head_office_conn:
+            cosmos_conn = connect_to_cosmos("Bookings")
+
+            raw_bookings = fetch_bookings(head_office_conn)
+            bookings = Booking.from_db_records(raw_bookings)
+            campground_id = APP_CAMPGROUND_ID
+            campsites, stored_allocations = warm_start_campsites(cosmos_conn, campground_id=campground_id)
+            strategy = request.form.get('strategy', GreedyStrategy.name)
+
+            # Only bookings not allocated by an earlier run need processing
+            new_bookings = filter_new_bookings(bookings, stored_allocations)
+            process_bookings(new_bookings, campsites, head_office_conn, cosmos_conn, campground_id, strategy=strategy)
         processed_bookings = bookings
+        with availability_lock:
+            store_availability_calendar(campground_id, AvailabilityCalendar(campsites))
         flash('Bookings processed successfully!', 'success')
         return redirect(url_for('summary'))
     except Exception as e:
@@ -78,22 +142,83 @@ def process_bookings_route():
 @app.route('/bookings')
 def view_bookings():
     """
-    Route to view all bookings currently stored in Cosmos DB.
+    Route to view the bookings stored in Cosmos DB, one page at a time.
+
+    Query parameters: page_size (optional, up to MAX_BOOKINGS_PAGE_SIZE) and continuation (optional,
+    the token of the next page from the previous page's link).
 
     :return: Rendered bookings list page.
     """
     try:
+        page_size = min(max(request.args.get('page_size', DEFAULT_BOOKINGS_PAGE_SIZE, type=int), 1), MAX_BOOKINGS_PAGE_SIZE)
+        continuation_token = request.args.get('continuation') or None
+
         cosmos_conn = connect_to_cosmos("Bookings")
-        bookings = fetch_cosmos_bookings(cosmos_conn)
-        for booking in bookings:
-            logger.info(f"Booking ID: {booking.booking_id}, Customer Name: {booking.customer_name}")
+        pages = iter_cosmos_booking_pages(cosmos_conn, page_size=page_size, continuation_token=continuation_token)
+        bookings, next_token = next(pages, ([], None))
+        logger.info(f"Fetched a page of {len(bookings)} bookings from Cosmos DB.")
 
-        return render_template('bookings_list.html', bookings=bookings)
+        return render_template('bookings_list.html', bookings=bookings, page_size=page_size, next_token=next_token)
     except Exception as e:
         logger.error(f"Error fetching bookings: {str(e)}")
         flash(f'Error fetching bookings: {str(e)}', 'danger')
         return redirect(url_for('index'))
 
+# Define the route to query free campsites for a week
+@app.route('/availability')
+def availability():
+    """
+    Route returning the number of free campsites, as JSON, for the week a booking arriving on a date would get.
+
+    Query parameters: date (YYYY-MM-DD from 1970-01-03, required), size (optional, all sizes when
+    omitted) and campground_id (optional, one of AVAILABILITY_CAMPGROUND_IDS, APP_CAMPGROUND_ID when omitted). Responses carry an ETag that changes
+    whenever any campsite is booked or released or the calendar is rebuilt, so clients can poll with
+    If-None-Match and receive 304 Not Modified while nothing has changed.
+
+    :return: JSON response with week_start and free counts.
+    """
+    date_param = request.args.get('date')
+    size = request.args.get('size')
+    campground_id = request.args.get('campground_id', APP_CAMPGROUND_ID, type=int)
+    try:
+        arrival_date = datetime.strptime(date_param or '', '%Y-%m-%d')
+    except ValueError:
+        return jsonify(error="Query parameter 'date' is required in YYYY-MM-DD format."), 400
+    try:
+        # Weeks before the campsite bitmaps' epoch, or past the last representable Saturday, have no counts
+        AvailabilityCalendar.week_of(arrival_date)
+    except (ValueError, OverflowError):
+        return jsonify(error=f"Date {date_param} is out of range."), 400
+    if campground_id not in AVAILABILITY_CAMPGROUND_IDS:
+        return jsonify(error=f"Unknown campground {campground_id}."), 400
+
+    try:
+        calendar, build = get_availability_calendar(campground_id)
+    except Exception as e:
+        logger.error(f"Error loading availability: {str(e)}")
+        return jsonify(error="Availability is currently unavailable."), 503
+
+    if size is not None and size not in calendar.site_counts:
+        return jsonify(error=f"Unknown campsite size '{size}'."), 400
+    free = calendar.free_counts(arrival_date) if size is None else {size: calendar.free_count(size, arrival_date)}
+    week_start = Booking.adjust_to_saturday(arrival_date)
+
+    response = jsonify(week_start=week_start.strftime('%Y-%m-%d'), free=free)
+    response.set_etag(f"{campground_id}-{build}-{calendar.version}")
+    response.cache_control.public = True
+    response.cache_control.max_age = AVAILABILITY_MAX_AGE
+    return response.make_conditional(request)
+
+# Define the route to monitor the database connection pools
+@app.route('/pool_stats')
+def connection_pool_stats():
+    """
+    Route returning, as JSON, the size and reuse counters of each database connection pool.
+
+    :return: JSON response mapping pool name to its statistics.
+    """
+    return jsonify(pool_stats())
+
 # Define the route to view a specific booking
 @app.route('/summary')
 def summary():
@@ -108,7 +233,8 @@ def summary():
 
         if not processed_bookings and bookings:
             campsites = initialize_campsites()
-            process_bookings(bookings, campsites, connect_to_head_office(), connect_to_cosmos("Bookings"), campground_id=1121132)
+            with get_pool('head_office', connect_to_head_office).connection() as head_office_conn:
+                process_bookings(bookings, campsites, head_office_conn, connect_to_cosmos("Bookings"), campground_id=APP_CAMPGROUND_ID)
             processed_bookings = bookings
             flash('Bookings were repopulated and processed!', 'info')
 
@@ -117,10 +243,11 @@ def summary():
             return redirect(url_for('process_bookings_route'))
 
         campsites = initialize_campsites()
-        summary_data = generate_summary(bookings, campsites)
+        frame = as_booking_frame(bookings)
+        summary_data = generate_summary(frame, campsites)
         logger.info(f"Generated Summary Data: {summary_data}")
         display_summary(summary_data)
-        create_and_insert_summary(bookings)
+        create_and_insert_summary(frame)
         flash('Summary generated and stored successfully!', 'success')
 
         return render_template('summary.html', summary=summary_data)
@@ -135,16 +262,18 @@ def show_pdf(booking_id):
     """
     Route to fetch and display a PDF confirmation for a specific booking.
 
+    The PDF is streamed from the blob store in chunks rather than loaded into memory.
+
     :param booking_id: ID of the booking whose PDF is to be shown.
     :return: PDF file response for download.
     """
     try:
         cosmos_conn_bookings = connect_to_cosmos("Bookings")
         cosmos_conn_pdfs = connect_to_cosmos("PDFs")
-        pdf_data = fetch_pdf_from_cosmos(cosmos_conn_bookings, cosmos_conn_pdfs, booking_id)
+        pdf_file = fetch_pdf_from_cosmos(cosmos_conn_bookings, cosmos_conn_pdfs, booking_id)
 
         return send_file(
-            io.BytesIO(pdf_data),
+            pdf_file,
             mimetype='application/pdf',
             download_name=f'confirmation_{booking_id}.pdf'
         )
@@ -153,53 +282,39 @@ def show_pdf(booking_id):
         flash(f'Error fetching PDF for Booking ID {booking_id}: {str(e)}', 'danger')
         return redirect(url_for('view_bookings'))
 
-# Define the route to handle 404 errors
+# Function to fetch the PDF of a booking
 def fetch_pdf_from_cosmos(cosmos_conn_bookings, cosmos_conn_pdfs, booking_id):
     """
-    Fetches PDF data associated with a booking from Cosmos DB.
+    Finds the PDF document of a booking in Cosmos DB and opens the PDF it refers to.
 
     :param cosmos_conn_bookings: Cosmos DB connection to the bookings container.
     :param cosmos_conn_pdfs: Cosmos DB connection to the PDFs container.
     :param booking_id: The ID of the booking to fetch the PDF for.
-    :return: The PDF data in bytes.
+    :return: Binary file object of the PDF.
     :raises: ValueError if the booking or PDF data is not found.
     """
     try:
-        query_booking = f"SELECT * FROM c WHERE c.booking_id = {booking_id}"
-        booking_items = cosmos_conn_bookings.query_items(query=query_booking, enable_cross_partition_query=True)
-        booking_list = list(booking_items)
-
-        if not booking_list:
-            logger.error(f"Booking not found for booking ID {booking_id}")
-            raise ValueError(f"Booking not found for booking ID {booking_id}")
-
-        booking = booking_list[0]
-        pdf_id = booking.get('pdf_id')
-
-        if not pdf_id:
-            logger.error(f"No pdf_id found for booking ID {booking_id}")
-            raise ValueError(f"No pdf_id found for booking ID {booking_id}")
-
-        query_pdf = f"SELECT * FROM c WHERE c.pdf_id = '{pdf_id}'"
-        pdf_items = cosmos_conn_pdfs.query_items(query=query_pdf, partition_key=pdf_id, enable_cross_partition_query=True)
-        pdf_list = list(pdf_items)
-
-        if not pdf_list:
+        booking = read_booking_from_cosmos(cosmos_conn_bookings, booking_id)
+        if booking is None:
+            # Bookings stored before migrate_booking_ids have random ids and need a query
+            query_booking = "SELECT * FROM c WHERE c.booking_id = @booking_id"
+            parameters = [{"name": "@booking_id", "value": booking_id}]
+            booking_list = list(cosmos_conn_bookings.query_items(query=query_booking, parameters=parameters,
+                                                                 enable_cross_partition_query=True))
+            if not booking_list:
+                logger.error(f"Booking not found for booking ID {booking_id}")
+                raise ValueError(f"Booking not found for booking ID {booking_id}")
+            booking = booking_list[0]
+
+        # PDF documents are stored under the booking ID
+        pdf_id = str(booking.get('pdf_id') or booking_id)
+        try:
+            pdf_document = cosmos_conn_pdfs.read_item(item=pdf_id, partition_key=pdf_id)
+        except exceptions.CosmosResourceNotFoundError:
             logger.error(f"PDF not found for pdf_id {pdf_id}")
             raise ValueError(f"PDF not found for pdf_id {pdf_id}")
 
-        pdf_document = pdf_list[0]
-        pdf_data = pdf_document.get('pdf_data')
-
-        if not pdf_data:
-            logger.error(f"PDF data not found for pdf_id {pdf_id}")
-            raise ValueError(f"PDF data not found for pdf_id {pdf_id}")
-
-        if isinstance(pdf_data, str):
-            import base64
-            pdf_data = base64.b64decode(pdf_data)
-
-        return pdf_data
+        return open_pdf_document(pdf_document)
     except Exception as e:
         logger.error(f"Failed to fetch PDF data from Cosmos DB: {e}")
         raise
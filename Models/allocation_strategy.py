@@ -0,0 +1,254 @@
+from datetime import timedelta
+from Models.booking import Booking
+from Models.campsite import CampsiteInventory, allocate_campsites
+from Utils.logging_config import logger
+
+def booking_week(booking):
+    """
+    Returns the Saturday-to-Saturday week a booking is allocated to.
+
+    :param booking: Booking object.
+    :return: Tuple (start_date, end_date) of the adjusted week.
+    """
+    start_date = Booking.adjust_to_saturday(booking.arrival_date)
+    return start_date, start_date + timedelta(days=7)
+
+def record_allocation(booking, allocated, rate_per_night=None):
+    """
+    Records allocated campsites on a booking.
+
+    :param booking: Booking object to update.
+    :param allocated: List of allocated Campsite objects.
+    :param rate_per_night: Nightly rate to bill (defaults to the rate of the first allocated campsite).
+    :return: List of allocated site numbers.
+    """
+    site_numbers = [campsite.site_number for campsite in allocated]
+    rate = allocated[0].rate_per_night if rate_per_night is None else rate_per_night
+    booking.update_campsite_info(site_numbers[0], rate, site_numbers)
+    return site_numbers
+
+def allocate_bookings_sequentially(bookings, campsites):
+    """
+    Allocates bookings one at a time, in order, with allocate_campsites (greedy first-fit).
+
+    :param bookings: List of Booking objects in processing order.
+    :param campsites: CampsiteInventory or list of Campsite objects.
+    :return: List aligned with bookings holding the allocated site numbers, or None where allocation failed.
+    """
+    results = []
+    for booking in bookings:
+        start_date, end_date = booking_week(booking)
+        allocated = allocate_campsites(campsites, start_date, end_date, booking)
+        results.append(record_allocation(booking, allocated) if allocated else None)
+    return results
+
+def _count_free_sites(campsites, size, start_date, end_date):
+    """
+    Counts the campsites of a size that are free for a date range.
+
+    :param campsites: CampsiteInventory or list of Campsite objects.
+    :param size: Campsite size category.
+    :param start_date: Start date of the range.
+    :param end_date: End date of the range.
+    :return: Number of free campsites.
+    """
+    if isinstance(campsites, CampsiteInventory):
+        sites = (campsites.sites_by_number[number] for number in campsites.sites_by_size.get(size, ()))
+    else:
+        sites = (campsite for campsite in campsites if campsite.size == size)
+    return sum(1 for campsite in sites if campsite.is_available(start_date, end_date))
+
+def select_max_fill(demands, capacity):
+    """
+    Chooses the subset of bookings that fills the most campsites without exceeding capacity.
+
+    Solves the subset-sum exactly with one integer bitset of reachable totals per booking. When
+    several subsets fill the same number of sites, earlier bookings are preferred.
+
+    :param demands: Campsites requested by each booking, in booking order.
+    :param capacity: Number of free campsites.
+    :return: List of booleans marking the selected bookings.
+    """
+    if sum(demands) <= capacity:
+        return [True] * len(demands)
+    mask = (1 << (capacity + 1)) - 1
+    reachable = [1]  # reachable[i] has bit t set when the first i bookings can fill exactly t sites
+    for demand in demands:
+        previous = reachable[-1]
+        reachable.append((previous | (previous << demand)) & mask)
+
+    # Walk back from the best total, leaving out later bookings whenever the total stays reachable
+    total = reachable[-1].bit_length() - 1
+    selected = [False] * len(demands)
+    for index in range(len(demands) - 1, -1, -1):
+        if not (reachable[index] >> total) & 1:
+            selected[index] = True
+            total -= demands[index]
+    return selected
+
+class AllocationStrategy:
+    """
+    Base class for campsite allocation strategies.
+
+    A strategy allocates a whole run of bookings at once, booking the campsites and recording the
+    allocation on each booking.
+    """
+
+    name = None
+
+    def allocate(self, bookings, campsites):
+        """
+        Allocates campsites to the bookings.
+
+        :param bookings: List of Booking objects in the order they were received.
+        :param campsites: CampsiteInventory or list of Campsite objects.
+        :return: List aligned with bookings holding the allocated site numbers, or None where allocation failed.
+        """
+        raise NotImplementedError
+
+class GreedyStrategy(AllocationStrategy):
+    """
+    First-come-first-served allocation of the lowest free campsites of the requested size.
+    """
+
+    name = 'greedy'
+
+    def __init__(self, vectorized=False):
+        """
+        Initializes the greedy strategy.
+
+        :param vectorized: If True, use the NumPy batch engine, which gives identical results.
+        """
+        self.vectorized = vectorized
+
+    def allocate(self, bookings, campsites):
+        if self.vectorized:
+            # Imported here so the models do not depend on NumPy unless the batch engine is used
+            from Utils.batch_allocator import allocate_bookings_vectorized
+            return allocate_bookings_vectorized(bookings, campsites)
+        return allocate_bookings_sequentially(bookings, campsites)
+
+class BestFitStrategy(AllocationStrategy):
+    """
+    First-come-first-served allocation that upgrades a booking to the next larger size when its
+    requested size is full. Upgraded bookings are billed at the requested size's rate.
+    """
+
+    name = 'best_fit'
+
+    def allocate(self, bookings, campsites):
+        # Rank sizes by their nightly rate so "larger" does not depend on the size names
+        size_rates = {}
+        for campsite in campsites:
+            size_rates[campsite.size] = min(campsite.rate_per_night, size_rates.get(campsite.size, campsite.rate_per_night))
+        ranked_sizes = sorted(size_rates, key=size_rates.get)
+
+        results = []
+        for booking in bookings:
+            start_date, end_date = booking_week(booking)
+            if booking.campsite_size not in size_rates:
+                # Unknown sizes (or no size) keep the plain first-fit behaviour
+                allocated = allocate_campsites(campsites, start_date, end_date, booking)
+                results.append(record_allocation(booking, allocated) if allocated else None)
+                continue
+
+            result = None
+            requested_rate = size_rates[booking.campsite_size]
+            for size in ranked_sizes[ranked_sizes.index(booking.campsite_size):]:
+                allocated = _book_sites(campsites, size, start_date, end_date, booking)
+                if allocated:
+                    result = record_allocation(booking, allocated, requested_rate)
+                    if size != booking.campsite_size:
+                        logger.info(f"Booking {booking.booking_id} upgraded from {booking.campsite_size} to {size}.")
+                    break
+            results.append(result)
+        return results
+
+class RevenueMaximizingStrategy(AllocationStrategy):
+    """
+    Batch allocation that, for each size and week, accepts the set of bookings filling the most
+    campsites. Every site of a size earns the same weekly rate, so this maximizes revenue; bookings
+    are not moved between sizes. Bookings without a size are offered the sites left afterwards,
+    so they never take sites the selection counted on.
+    """
+
+    name = 'revenue'
+
+    def allocate(self, bookings, campsites):
+        # Group bookings by requested size and adjusted week, keeping their order
+        groups = {}
+        for index, booking in enumerate(bookings):
+            start_date, end_date = booking_week(booking)
+            groups.setdefault((booking.campsite_size, start_date), []).append(index)
+
+        selected = [False] * len(bookings)
+        for (size, start_date), indices in groups.items():
+            if size is None:
+                # Bookings without a size are offered whatever is left, in order
+                for index in indices:
+                    selected[index] = True
+                continue
+            capacity = _count_free_sites(campsites, size, start_date, start_date + timedelta(days=7))
+            demands = [bookings[index].num_campsites or 1 for index in indices]
+            for index, chosen in zip(indices, select_max_fill(demands, capacity)):
+                selected[index] = chosen
+
+        # Book the accepted sized bookings first, then the unsized ones from what is left,
+        # each in their original order so site numbers stay first-fit
+        results = [None] * len(bookings)
+        order = sorted(range(len(bookings)), key=lambda index: bookings[index].campsite_size is None)
+        for index in order:
+            if selected[index]:
+                booking = bookings[index]
+                start_date, end_date = booking_week(booking)
+                allocated = allocate_campsites(campsites, start_date, end_date, booking)
+                results[index] = record_allocation(booking, allocated) if allocated else None
+        return results
+
+def _book_sites(campsites, size, start_date, end_date, booking):
+    """
+    Books booking.num_campsites campsites of a given size, all or nothing.
+
+    :param campsites: CampsiteInventory or list of Campsite objects.
+    :param size: Campsite size category to book.
+    :param start_date: Start date of the booking.
+    :param end_date: End date of the booking.
+    :param booking: Booking object requesting the campsites.
+    :return: List of booked Campsite objects, or an empty list.
+    """
+    count = booking.num_campsites or 1
+    if isinstance(campsites, CampsiteInventory):
+        return campsites.book_many(size, start_date, end_date, count)
+    booked = []
+    for campsite in campsites:
+        if campsite.size == size and campsite.is_available(start_date, end_date) and campsite.book_campsite(start_date, end_date):
+            booked.append(campsite)
+            if len(booked) == count:
+                return booked
+    for campsite in booked:
+        campsite.release_campsite(start_date, end_date)
+    return []
+
+# Strategies selectable by name from main() and process_bookings
+ALLOCATION_STRATEGIES = {
+    GreedyStrategy.name: GreedyStrategy,
+    BestFitStrategy.name: BestFitStrategy,
+    RevenueMaximizingStrategy.name: RevenueMaximizingStrategy,
+}
+
+def get_allocation_strategy(name, vectorized=False):
+    """
+    Creates an allocation strategy by name.
+
+    :param name: One of the keys of ALLOCATION_STRATEGIES.
+    :param vectorized: Use the NumPy batch engine (greedy strategy only).
+    :return: AllocationStrategy instance.
+    :raises ValueError: If the strategy name is unknown or vectorized is requested for another strategy.
+    """
+    if name not in ALLOCATION_STRATEGIES:
+        raise ValueError(f"Unknown allocation strategy '{name}'. Choose from: {', '.join(ALLOCATION_STRATEGIES)}.")
+    if name == GreedyStrategy.name:
+        return GreedyStrategy(vectorized=vectorized)
+    if vectorized:
+        raise ValueError(f"Batch (vectorized) allocation is only available for the '{GreedyStrategy.name}' strategy.")
+    return ALLOCATION_STRATEGIES[name]()
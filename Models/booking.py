@@ -1,8 +1,52 @@
+import sys
 from datetime import datetime, timedelta, date
-from Models.campsite import allocate_campsite
+from functools import lru_cache
+from Models.campsite import allocate_campsites
 from Utils.logging_config import logger
 
+# Function to parse ISO dates, caching results because a season repeats the same few hundred dates
+@lru_cache(maxsize=4096)
+def parse_iso_date(date_string):
+    """
+    Parses a 'YYYY-MM-DD' string into a datetime, much faster than strptime.
+
+    Returned datetimes are immutable, so sharing cached instances between bookings is safe.
+
+    :param date_string: The date string to parse.
+    :return: datetime object at midnight.
+    :raises ValueError: If the date format is incorrect.
+    """
+    try:
+        if len(date_string) == 10 and date_string[4] == '-' and date_string[7] == '-':
+            return datetime(int(date_string[:4]), int(date_string[5:7]), int(date_string[8:]))
+        # Unpadded forms such as '2024-9-7' are still accepted, as strptime accepts them
+        return datetime.strptime(date_string, '%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"Invalid date format for {date_string}. Expected 'YYYY-MM-DD'.")
+
+def to_datetime(date_input):
+    """
+    Validates and converts a date input to a datetime object.
+
+    :param date_input: Input date which can be a datetime, date, or string.
+    :return: datetime object.
+    :raises ValueError: If the date format is incorrect.
+    :raises TypeError: If the input type is unsupported.
+    """
+    if isinstance(date_input, datetime):
+        return date_input
+    elif isinstance(date_input, str):
+        return parse_iso_date(date_input)
+    elif isinstance(date_input, date):
+        return datetime.combine(date_input, datetime.min.time())
+    else:
+        raise TypeError(f"Unsupported date input type: {type(date_input)}")
+
 class Booking:
+    # Fixed attribute slots instead of a per-instance __dict__; seasons of bookings are held in memory
+    __slots__ = ('booking_id', 'customer_id', 'booking_date', 'arrival_date', 'campsite_size', 'num_campsites',
+                 'campground_id', 'campsite_id', 'campsite_allocations', 'total_cost', 'customer_name')
+
     def __init__(self, booking_id, customer_id, booking_date, arrival_date, campsite_size, num_campsites, campground_id=None, customer_name=None):
         """
         Initializes a Booking object with relevant details.
@@ -20,10 +64,11 @@ class Booking:
         self.customer_id = customer_id
         self.booking_date = self._validate_date(booking_date)
         self.arrival_date = self._validate_date(arrival_date)
-        self.campsite_size = campsite_size
+        self.campsite_size = sys.intern(campsite_size) if isinstance(campsite_size, str) else campsite_size  # Share one string per size
         self.num_campsites = num_campsites
         self.campground_id = campground_id
         self.campsite_id = None  # Initially set campsite_id to None until allocated
+        self.campsite_allocations = []  # Site numbers of every campsite allocated to the booking
         self.total_cost = 0  # Default total cost set to zero
         self.customer_name = customer_name
 
@@ -40,17 +85,7 @@ class Booking:
         :raises ValueError: If the date format is incorrect.
         :raises TypeError: If the input type is unsupported.
         """
-        if isinstance(date_input, datetime):
-            return date_input
-        elif isinstance(date_input, date):
-            return datetime.combine(date_input, datetime.min.time())
-        elif isinstance(date_input, str):
-            try:
-                return datetime.strptime(date_input, '%Y-%m-%d')
-            except ValueError:
-                raise ValueError(f"Invalid date format for {date_input}. Expected 'YYYY-MM-DD'.")
-        else:
-            raise TypeError(f"Unsupported date input type: {type(date_input)}")
+        return to_datetime(date_input)
 
     def is_arrival_today(self):
         """
@@ -60,14 +95,16 @@ class Booking:
         """
         return self.arrival_date.date() == datetime.now().date()
 
-    def update_campsite_info(self, campsite_id, rate_per_night):
+    def update_campsite_info(self, campsite_id, rate_per_night, campsite_allocations=None):
         """
         Updates campsite information and calculates the total cost.
 
-        :param campsite_id: The campsite ID allocated.
+        :param campsite_id: The campsite ID allocated (the first site for multi-site bookings).
         :param rate_per_night: The nightly rate for the campsite.
+        :param campsite_allocations: Site numbers of every allocated campsite (defaults to [campsite_id]).
         """
         self.campsite_id = campsite_id
+        self.campsite_allocations = list(campsite_allocations) if campsite_allocations else [campsite_id]
         self.total_cost = rate_per_night * 7 * self.num_campsites  # Calculate cost based on the 7-day booking duration
 
     def to_dict(self):
@@ -85,6 +122,7 @@ class Booking:
             "num_campsites": self.num_campsites,
             "campground_id": self.campground_id,
             "campsite_id": self.campsite_id,
+            "campsite_allocations": self.campsite_allocations,
             "total_cost": self.total_cost
         }
 
@@ -120,29 +158,31 @@ class Booking:
 
     def allocate_campsite(self, campsites, head_office_conn, update_booking_campground_func):
         """
-        Attempts to allocate a campsite for the booking.
+        Attempts to allocate num_campsites campsites for the booking.
 
-        :param campsites: List of available campsites.
+        :param campsites: List of available campsites or a CampsiteInventory.
         :param head_office_conn: Connection to the head office database.
         :param update_booking_campground_func: Function to update the campground in the database.
-        :return: Allocated campsite object or None.
+        :return: First allocated campsite object or None.
         """
         # Adjust booking dates to start and end on a Saturday
         adjusted_start_date = Booking.adjust_to_saturday(self.arrival_date)
         adjusted_end_date = adjusted_start_date + timedelta(days=7)
 
-        # Attempt to allocate a campsite
-        allocated_campsite = allocate_campsite(campsites, adjusted_start_date, adjusted_end_date, self)
-        if allocated_campsite:
+        # Attempt to reserve every requested campsite at once
+        allocated_campsites = allocate_campsites(campsites, adjusted_start_date, adjusted_end_date, self)
+        if allocated_campsites:
             # Update campsite info and log the successful allocation
-            self.update_campsite_info(allocated_campsite.site_number, allocated_campsite.rate_per_night)
+            first_campsite = allocated_campsites[0]
+            self.update_campsite_info(first_campsite.site_number, first_campsite.rate_per_night,
+                                      [campsite.site_number for campsite in allocated_campsites])
             update_booking_campground_func(head_office_conn, self.booking_id, self.campground_id)
-            logger.info(f"Booking {self.booking_id} successfully allocated to Campsite {allocated_campsite.site_number}.")
-            print(f"Booking {self.booking_id} successfully allocated to Campsite {allocated_campsite.site_number}.")
-        else:
-            # Log if no campsite is available
-            logger.warning(f"No available campsites for Booking {self.booking_id} from {adjusted_start_date} to {adjusted_end_date}.")
-        return allocated_campsite
+            logger.info(f"Booking {self.booking_id} successfully allocated to Campsite(s) {self.campsite_allocations}.")
+            print(f"Booking {self.booking_id} successfully allocated to Campsite(s) {self.campsite_allocations}.")
+            return first_campsite
+        # Log if no campsite is available
+        logger.warning(f"No available campsites for Booking {self.booking_id} from {adjusted_start_date} to {adjusted_end_date}.")
+        return None
 
     @staticmethod
     def from_dict(data):
@@ -152,7 +192,7 @@ class Booking:
         :param data: Dictionary containing booking data.
         :return: Booking object.
         """
-        return Booking(
+        booking = Booking(
             booking_id=data['booking_id'],
             customer_id=data['customer_id'],
             booking_date=data['booking_date'],
@@ -163,6 +203,80 @@ class Booking:
             customer_name=data.get('customer_name', None)
         ).set_total_cost(data.get('total_cost', 0))
 
+        # Restore the stored allocation; older documents only carry campsite_id
+        booking.campsite_id = data.get('campsite_id')
+        booking.campsite_allocations = list(data.get('campsite_allocations') or
+                                            ([booking.campsite_id] if booking.campsite_id is not None else []))
+        return booking
+
+    @staticmethod
+    def from_dicts(items):
+        """
+        Creates Booking objects from many dictionaries, e.g. a page of Cosmos DB documents.
+
+        Produces the same bookings as from_dict, but fills the attributes directly and parses dates
+        with the cached parser. Items that cannot be converted are logged and skipped.
+
+        :param items: Iterable of dictionaries containing booking data.
+        :return: List of Booking objects.
+        """
+        bookings = []
+        for data in items:
+            try:
+                booking = Booking._from_values(
+                    data['booking_id'], data['customer_id'], data['booking_date'], data['arrival_date'],
+                    data['campsite_size'], data['num_campsites'], data.get('campground_id'), data.get('customer_name')
+                )
+                booking.total_cost = data.get('total_cost', 0)
+                campsite_id = booking.campsite_id = data.get('campsite_id')
+                booking.campsite_allocations = list(data.get('campsite_allocations') or
+                                                    ([campsite_id] if campsite_id is not None else []))
+                bookings.append(booking)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Error converting booking data {data.get('booking_id', '<unknown>')}: {e}")
+        return bookings
+
+    @staticmethod
+    def from_db_records(records):
+        """
+        Creates Booking objects from many database records, e.g. the rows returned by fetch_bookings.
+
+        Produces the same bookings as from_db_record. Records that cannot be converted are logged and skipped.
+
+        :param records: Iterable of tuples representing database records.
+        :return: List of Booking objects.
+        """
+        bookings = []
+        for record in records:
+            try:
+                bookings.append(Booking._from_values(record[0], record[1], record[2], record[3],
+                                                     record[5], record[6], record[4], record[7]))
+            except (IndexError, TypeError, ValueError) as e:
+                logger.error(f"Error processing booking record: {e}")
+        return bookings
+
+    @staticmethod
+    def _from_values(booking_id, customer_id, booking_date, arrival_date, campsite_size, num_campsites,
+                     campground_id, customer_name):
+        """
+        Builds a Booking without going through __init__, converting dates only when they are not datetimes already.
+
+        :return: Booking object equal to Booking(...) with the same arguments.
+        """
+        booking = Booking.__new__(Booking)
+        booking.booking_id = booking_id
+        booking.customer_id = customer_id
+        booking.booking_date = booking_date if type(booking_date) is datetime else to_datetime(booking_date)
+        booking.arrival_date = arrival_date if type(arrival_date) is datetime else to_datetime(arrival_date)
+        booking.campsite_size = sys.intern(campsite_size) if type(campsite_size) is str else campsite_size
+        booking.num_campsites = num_campsites
+        booking.campground_id = campground_id
+        booking.campsite_id = None
+        booking.campsite_allocations = []
+        booking.total_cost = 0
+        booking.customer_name = customer_name
+        return booking
+
     def set_total_cost(self, total_cost):
         """
         Sets the total cost for the booking.
@@ -0,0 +1,412 @@
+import numpy as np
+from datetime import date, datetime
+from itertools import chain, repeat
+from operator import attrgetter, itemgetter
+from Models.booking import Booking, parse_iso_date
+from Models.campsite import UNIX_EPOCH_ORDINAL
+
+# Stored in place of None in the integer columns
+_MISSING = -1
+
+def _day_numbers(values, count):
+    """
+    Converts dates to days since 1970-01-01.
+
+    :param values: Iterable of dates, datetimes or 'YYYY-MM-DD' strings.
+    :param count: Number of values.
+    :return: datetime64[D] NumPy array.
+    """
+    ordinals = np.fromiter(
+        ((value if isinstance(value, date) else parse_iso_date(value)).toordinal() for value in values),
+        dtype=np.int64, count=count
+    )
+    return (ordinals - UNIX_EPOCH_ORDINAL).astype('datetime64[D]')
+
+def _optional_ids(values, count):
+    """
+    Converts optional integer IDs to an int64 array with None stored as the missing marker.
+
+    :param values: Iterable of integers or None.
+    :param count: Number of values.
+    :return: int64 NumPy array.
+    """
+    return np.fromiter((_MISSING if value is None else value for value in values), dtype=np.int64, count=count)
+
+def _allocation_arrays(allocations, campsite_ids, count):
+    """
+    Flattens per-booking site lists into one site array with per-booking offsets.
+
+    :param allocations: Iterable of site number lists; an empty list with a campsite ID counts as [campsite_id].
+    :param campsite_ids: int64 NumPy array of first allocated site numbers (-1 if not allocated).
+    :param count: Number of bookings.
+    :return: Tuple (allocation_sites, allocation_offsets) of int64 NumPy arrays.
+    """
+    # Unallocated bookings share one empty tuple; new containers per booking would keep the garbage collector busy
+    allocations = [sites or () for sites in allocations]
+    lengths = np.fromiter(map(len, allocations), dtype=np.int64, count=count)
+
+    # Documents written before campsite_allocations existed only carry campsite_id
+    for index in np.flatnonzero((lengths == 0) & (campsite_ids != _MISSING)).tolist():
+        allocations[index] = (int(campsite_ids[index]),)
+        lengths[index] = 1
+
+    allocation_offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(lengths, out=allocation_offsets[1:])
+    allocation_sites = np.fromiter(chain.from_iterable(allocations), dtype=np.int64, count=int(allocation_offsets[-1]))
+    return allocation_sites, allocation_offsets
+
+def _size_codes(sizes, count):
+    """
+    Encodes campsite sizes as small integer codes in order of first appearance.
+
+    :param sizes: Iterable of campsite size names.
+    :param count: Number of sizes.
+    :return: Tuple (int8 NumPy array of codes, list of size names).
+    """
+    codes = {}
+    size_codes = np.fromiter((codes.setdefault(size, len(codes)) for size in sizes), dtype=np.int8, count=count)
+    return size_codes, list(codes)
+
+class BookingFrame:
+    """
+    Column store of bookings held in NumPy arrays, for large numbers of bookings and summaries over whole booking runs.
+
+    A booking costs a few dozen bytes plus its customer name instead of a full Booking object with
+    two datetimes, and indexing or iterating returns Booking objects with the usual attributes.
+    Totals, allocation counts, revenue and per-site utilization are computed with single vectorized
+    reductions instead of Python loops over Booking objects. Missing IDs are stored as -1, and each
+    booking's allocated sites are a slice of one flat array given by per-booking offsets.
+    """
+
+    def __init__(self, booking_ids, customer_ids, booking_dates, arrival_dates, size_codes, size_names,
+                 num_campsites, campground_ids, campsite_ids, total_costs, allocation_sites, allocation_offsets,
+                 customer_names=None):
+        """
+        Initializes the frame from its columns. Use the from_* constructors to build one from bookings.
+
+        :param booking_ids: int64 array of booking IDs.
+        :param customer_ids: int64 array of customer IDs.
+        :param booking_dates: datetime64[D] array of booking dates.
+        :param arrival_dates: datetime64[D] array of arrival dates.
+        :param size_codes: int8 array of codes into size_names.
+        :param size_names: List of campsite size names.
+        :param num_campsites: int32 array of the number of campsites booked.
+        :param campground_ids: int64 array of campground IDs (-1 if missing).
+        :param campsite_ids: int64 array of first allocated site numbers (-1 if not allocated).
+        :param total_costs: float64 array of booking costs.
+        :param allocation_sites: int64 array of every allocated site number, booking by booking.
+        :param allocation_offsets: int64 array; booking i's sites are allocation_sites[offsets[i]:offsets[i + 1]].
+        :param customer_names: List of customer names (optional).
+
+        Columns that a summary_view does not load are None.
+        """
+        self.booking_ids = booking_ids
+        self.customer_ids = customer_ids
+        self.booking_dates = booking_dates
+        self.arrival_dates = arrival_dates
+        self.size_codes = size_codes
+        self.size_names = list(size_names)
+        self.num_campsites = num_campsites
+        self.campground_ids = campground_ids
+        self.campsite_ids = campsite_ids
+        self.total_costs = total_costs
+        self.allocation_sites = allocation_sites
+        self.allocation_offsets = allocation_offsets
+        self.customer_names = customer_names
+
+    def __len__(self):
+        return len(self.campsite_ids)
+
+    def __repr__(self):
+        """Provides a string representation of the BookingFrame object."""
+        return f"<BookingFrame {len(self)} bookings>"
+
+    @classmethod
+    def _from_columns(cls, count, booking_ids, customer_ids, booking_dates, arrival_dates, sizes, num_campsites,
+                      campground_ids, campsite_ids, total_costs, allocations, customer_names):
+        """
+        Builds a frame from one iterable per attribute, each yielding count values.
+
+        :param count: Number of bookings.
+        :param num_campsites: Iterable of the number of campsites booked; a missing number counts as 1, as in allocation.
+        :param campsite_ids: Iterable of first allocated site numbers (None if not allocated).
+        :param allocations: Iterable of site number lists; an empty list with a campsite ID counts as [campsite_id].
+        :return: BookingFrame object.
+        """
+        size_codes, size_names = _size_codes(sizes, count)
+        campsite_ids = _optional_ids(campsite_ids, count)
+        allocation_sites, allocation_offsets = _allocation_arrays(allocations, campsite_ids, count)
+        return cls(
+            booking_ids=np.fromiter(booking_ids, dtype=np.int64, count=count),
+            customer_ids=np.fromiter(customer_ids, dtype=np.int64, count=count),
+            booking_dates=_day_numbers(booking_dates, count),
+            arrival_dates=_day_numbers(arrival_dates, count),
+            size_codes=size_codes,
+            size_names=size_names,
+            num_campsites=np.fromiter((value or 1 for value in num_campsites), dtype=np.int32, count=count),
+            campground_ids=_optional_ids(campground_ids, count),
+            campsite_ids=campsite_ids,
+            total_costs=np.fromiter(total_costs, dtype=np.float64, count=count),
+            allocation_sites=allocation_sites,
+            allocation_offsets=allocation_offsets,
+            customer_names=list(customer_names)
+        )
+
+    @classmethod
+    def from_db_records(cls, records):
+        """
+        Creates a frame directly from Head Office rows, as returned by fetch_bookings.
+
+        :param records: Sequence of tuples (booking_id, customer_id, booking_date, arrival_date,
+                        campground_id, campsite_size, num_campsites, customer_name).
+        :return: BookingFrame object of unallocated bookings.
+        """
+        records = list(records)
+        count = len(records)
+        column = lambda index: map(itemgetter(index), records)
+        return cls._from_columns(count, column(0), column(1), column(2), column(3), column(5), column(6), column(4),
+                                 repeat(None, count), repeat(0, count), repeat((), count), column(7))
+
+    @classmethod
+    def from_dicts(cls, items):
+        """
+        Creates a frame directly from booking dictionaries, e.g. Cosmos DB documents.
+
+        :param items: Sequence of dictionaries in the Booking.to_dict format.
+        :return: BookingFrame object.
+        """
+        items = list(items)
+        column = lambda key: map(itemgetter(key), items)
+        optional = lambda key, default=None: (item.get(key, default) for item in items)
+        return cls._from_columns(len(items), column('booking_id'), column('customer_id'), column('booking_date'),
+                                 column('arrival_date'), column('campsite_size'), column('num_campsites'),
+                                 optional('campground_id'), optional('campsite_id'), optional('total_cost', 0),
+                                 optional('campsite_allocations'), optional('customer_name'))
+
+    @classmethod
+    def from_bookings(cls, bookings):
+        """
+        Creates a frame from Booking objects, the adapter for callers that hold a list of bookings.
+
+        :param bookings: Sequence of Booking objects.
+        :return: BookingFrame object.
+        """
+        bookings = list(bookings)
+        column = lambda name: map(attrgetter(name), bookings)
+        return cls._from_columns(len(bookings), column('booking_id'), column('customer_id'), column('booking_date'),
+                                 column('arrival_date'), column('campsite_size'), column('num_campsites'),
+                                 column('campground_id'), column('campsite_id'), column('total_cost'),
+                                 (getattr(booking, 'campsite_allocations', None) for booking in bookings),
+                                 column('customer_name'))
+
+    @classmethod
+    def summary_view(cls, bookings):
+        """
+        Creates a frame holding only the columns summaries need, from Booking objects.
+
+        Reading every attribute of a large list of bookings costs more than the summary itself, so
+        this reads only sizes, site IDs, costs and allocations. The other columns are None, so the
+        view supports the reductions but cannot be turned back into bookings.
+
+        :param bookings: Sequence of Booking objects.
+        :return: BookingFrame object.
+        """
+        bookings = list(bookings)
+        count = len(bookings)
+        campsite_ids = _optional_ids(map(attrgetter('campsite_id'), bookings), count)
+        size_codes, size_names = _size_codes(map(attrgetter('campsite_size'), bookings), count)
+        allocation_sites, allocation_offsets = _allocation_arrays(
+            (getattr(booking, 'campsite_allocations', None) for booking in bookings), campsite_ids, count)
+        return cls(
+            booking_ids=None, customer_ids=None, booking_dates=None, arrival_dates=None,
+            size_codes=size_codes, size_names=size_names, num_campsites=None, campground_ids=None,
+            campsite_ids=campsite_ids,
+            total_costs=np.fromiter(map(attrgetter('total_cost'), bookings), dtype=np.float64, count=count),
+            allocation_sites=allocation_sites, allocation_offsets=allocation_offsets
+        )
+
+    @classmethod
+    def concat(cls, frames):
+        """
+        Joins frames end to end, e.g. the summary views of the batches of a booking stream.
+
+        A column is kept only if every frame has it.
+
+        :param frames: Iterable of BookingFrame objects.
+        :return: BookingFrame object.
+        """
+        frames = list(frames)
+        if not frames:
+            return cls.empty()
+
+        # Re-map each frame's size codes onto the sizes of the joined frame
+        size_names = []
+        size_codes = []
+        for frame in frames:
+            mapping = np.empty(max(len(frame.size_names), 1), dtype=np.int8)
+            for code, size in enumerate(frame.size_names):
+                if size not in size_names:
+                    size_names.append(size)
+                mapping[code] = size_names.index(size)
+            size_codes.append(mapping[frame.size_codes])
+
+        # Shift each frame's allocation offsets past the sites of the frames before it
+        site_counts = np.cumsum([0] + [len(frame.allocation_sites) for frame in frames])
+        allocation_offsets = np.concatenate(
+            [frames[0].allocation_offsets[:1]] +
+            [frame.allocation_offsets[1:] + shift for frame, shift in zip(frames, site_counts)]
+        )
+
+        def column(name, combine=np.concatenate):
+            values = [getattr(frame, name) for frame in frames]
+            return None if any(value is None for value in values) else combine(values)
+
+        return cls(
+            booking_ids=column('booking_ids'), customer_ids=column('customer_ids'),
+            booking_dates=column('booking_dates'), arrival_dates=column('arrival_dates'),
+            size_codes=np.concatenate(size_codes), size_names=size_names,
+            num_campsites=column('num_campsites'), campground_ids=column('campground_ids'),
+            campsite_ids=column('campsite_ids'), total_costs=column('total_costs'),
+            allocation_sites=column('allocation_sites'), allocation_offsets=allocation_offsets,
+            customer_names=column('customer_names', lambda names: list(chain.from_iterable(names)))
+        )
+
+    @classmethod
+    def empty(cls):
+        """
+        Creates a frame without bookings.
+
+        :return: BookingFrame object.
+        """
+        return cls._from_columns(0, (), (), (), (), (), (), (), (), (), (), ())
+
+    def __getitem__(self, index):
+        """
+        Builds the Booking object stored at an index.
+
+        :param index: Position of the booking in the frame.
+        :return: Booking object.
+        """
+        if index < 0:
+            index += len(self)
+        booking = Booking(
+            booking_id=int(self.booking_ids[index]),
+            customer_id=int(self.customer_ids[index]),
+            booking_date=datetime.fromordinal(int(self.booking_dates[index].astype(np.int64)) + UNIX_EPOCH_ORDINAL),
+            arrival_date=datetime.fromordinal(int(self.arrival_dates[index].astype(np.int64)) + UNIX_EPOCH_ORDINAL),
+            campsite_size=self.size_names[self.size_codes[index]],
+            num_campsites=int(self.num_campsites[index]),
+            campground_id=_optional(self.campground_ids[index]),
+            customer_name=self.customer_names[index] if self.customer_names is not None else None
+        )
+        booking.campsite_id = _optional(self.campsite_ids[index])
+        booking.campsite_allocations = self.allocation_sites[
+            self.allocation_offsets[index]:self.allocation_offsets[index + 1]].tolist()
+        booking.total_cost = _number(self.total_costs[index])
+        return booking
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_bookings(self):
+        """
+        Converts the frame back to Booking objects.
+
+        :return: List of Booking objects.
+        """
+        return list(self)
+
+    def to_dicts(self):
+        """
+        Converts every booking in the frame to its dictionary format.
+
+        :return: List of dictionaries as produced by Booking.to_dict.
+        """
+        return [booking.to_dict() for booking in self]
+
+    def allocated_mask(self):
+        """
+        Returns which bookings have been allocated a campsite.
+
+        :return: Boolean NumPy array.
+        """
+        return self.campsite_ids != _MISSING
+
+    def successful_allocations(self):
+        """
+        Counts the bookings that have been allocated a campsite.
+
+        :return: Number of allocated bookings.
+        """
+        return int(np.count_nonzero(self.allocated_mask()))
+
+    def total_sales(self):
+        """
+        Sums the cost of every allocated booking.
+
+        :return: Total sales, as an int when it is a whole number.
+        """
+        return _number(self.total_costs[self.allocated_mask()].sum())
+
+    def revenue_by_size(self):
+        """
+        Sums the cost of the allocated bookings by requested campsite size.
+
+        :return: Dictionary mapping size to revenue.
+        """
+        revenue = np.bincount(self.size_codes, weights=np.where(self.allocated_mask(), self.total_costs, 0.0),
+                              minlength=len(self.size_names))
+        return {size: _number(revenue[code]) for code, size in enumerate(self.size_names)}
+
+    def site_booking_counts(self):
+        """
+        Counts the allocated bookings on every campsite.
+
+        :return: int64 NumPy array indexed by site number (0 for sites without bookings).
+        """
+        site_counts = np.diff(self.allocation_offsets)
+        sites = self.allocation_sites[np.repeat(self.allocated_mask(), site_counts)]
+        return np.bincount(sites, minlength=1) if len(sites) else np.zeros(1, dtype=np.int64)
+
+    def site_utilization(self, campsites):
+        """
+        Builds the per-campsite utilization used in summaries.
+
+        :param campsites: List of Campsite objects (or a CampsiteInventory).
+        :return: Dictionary mapping site number to its size, rate and number of allocated bookings.
+        """
+        counts = self.site_booking_counts()
+        return {
+            c.site_number: {'size': c.size, 'rate_per_night': c.rate_per_night,
+                            'bookings_count': int(counts[c.site_number]) if c.site_number < len(counts) else 0}
+            for c in campsites
+        }
+
+def as_booking_frame(bookings):
+    """
+    Returns bookings as a BookingFrame for summaries, loading only the summary columns of a list of Booking objects.
+
+    :param bookings: BookingFrame or iterable of Booking objects.
+    :return: BookingFrame object.
+    """
+    return bookings if isinstance(bookings, BookingFrame) else BookingFrame.summary_view(bookings)
+
+def _optional(value):
+    """
+    Converts the missing-value marker of an integer column back to None.
+
+    :param value: Stored column value.
+    :return: The value as an int, or None if it is the missing marker.
+    """
+    return None if value == _MISSING else int(value)
+
+def _number(value):
+    """
+    Converts a float column value to a Python number, keeping whole amounts as ints.
+
+    :param value: NumPy float value.
+    :return: int or float.
+    """
+    value = float(value)
+    return int(value) if value.is_integer() else value
@@ -1,6 +1,42 @@
-from datetime import datetime, timedelta
+import heapq
+from datetime import datetime, date, timedelta
 from Utils.logging_config import logger
 
+# Saturday used as week zero for the occupancy bitmaps (bookings run Saturday to Saturday)
+WEEK_EPOCH = date(1970, 1, 3)
+
+# Proleptic ordinal of 1970-01-01, the datetime64 epoch of the NumPy booking columns
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def week_ordinal(value):
+    """
+    Converts a date or datetime into the ordinal of the Saturday-to-Saturday week containing it.
+
+    :param value: The date or datetime to convert.
+    :return: Number of whole weeks between WEEK_EPOCH and the week containing the date.
+    :raises ValueError: If the date falls before WEEK_EPOCH.
+    """
+    if isinstance(value, datetime):
+        value = value.date()
+    week = (value.toordinal() - WEEK_EPOCH.toordinal()) // 7
+    if week < 0:
+        raise ValueError(f"Dates before {WEEK_EPOCH} are not supported: {value}")
+    return week
+
+def week_span(start_date, end_date):
+    """
+    Returns the range of week ordinals touched by the period [start_date, end_date).
+
+    :param start_date: Start date of the period.
+    :param end_date: End date of the period (exclusive).
+    :return: Tuple (first_week, week_count); week_count is 0 for an empty period.
+    """
+    if end_date <= start_date:
+        return week_ordinal(start_date), 0
+    first_week = week_ordinal(start_date)
+    last_week = week_ordinal(end_date - timedelta(days=1))
+    return first_week, last_week - first_week + 1
+
 class Campsite:
     def __init__(self, site_number, size, rate_per_night):
         """
@@ -14,6 +50,19 @@ class Campsite:
         self.size = size
         self.rate_per_night = rate_per_night
         self.bookings = []  # A list to keep track of booked periods as tuples (start_date, end_date)
+        self.occupied_weeks = 0  # Bitmap of booked weeks, bit n set when week_ordinal n is taken
+        self.observers = []  # Callables notified as observer(campsite, weeks_mask, booked) when weeks are booked or released
+
+    def _week_mask(self, start_date, end_date):
+        """
+        Builds the occupancy bitmask covering every week of the given date range.
+
+        :param start_date: Start date of the booking.
+        :param end_date: End date of the booking.
+        :return: Integer bitmask with one bit per week in the range.
+        """
+        first_week, week_count = week_span(start_date, end_date)
+        return ((1 << week_count) - 1) << first_week
 
     def is_available(self, start_date, end_date):
         """
@@ -23,16 +72,8 @@ class Campsite:
         :param end_date: End date of the booking.
         :return: True if the campsite is available, False otherwise.
         """
-        # Check each week within the requested booking period
-        current_date = start_date
-        while current_date < end_date:
-            next_week = current_date + timedelta(days=7)
-            for existing_start, existing_end in self.bookings:
-                # Check for overlapping bookings
-                if current_date < existing_end and next_week > existing_start:
-                    return False  # Return False if any overlap is found
-            current_date = next_week
-        return True  # Return True if no overlaps are detected
+        # A single mask test covers every requested week, independent of booking history
+        return not (self.occupied_weeks & self._week_mask(start_date, end_date))
 
     def book_campsite(self, start_date, end_date):
         """
@@ -43,33 +84,269 @@ class Campsite:
         :return: True if booking is successful, False otherwise.
         """
         if self.is_available(start_date, end_date):
-            # Book the campsite week-by-week within the specified period
+            # Mark the weeks as occupied, then record each week in the bookings history
+            mask = self._week_mask(start_date, end_date)
+            self.occupied_weeks |= mask
             current_date = start_date
             while current_date < end_date:
                 next_week = current_date + timedelta(days=7)
                 self.bookings.append((current_date, next_week))  # Add each week to the bookings list
                 current_date = next_week
+            self._notify(mask, True)
             return True
         return False  # Return False if the campsite is not available
 
+    def _notify(self, mask, booked):
+        """
+        Tells the observers that weeks were booked or released.
+
+        :param mask: Bitmask of the weeks that changed.
+        :param booked: True if the weeks were booked, False if they were released.
+        """
+        for observer in self.observers:
+            observer(self, mask, booked)
+
+    def book_week(self, week, start_date):
+        """
+        Books a single week already known to be free, skipping the availability check.
+
+        Used by batch allocation, which checks availability for a whole run up front.
+
+        :param week: Week ordinal to book.
+        :param start_date: Saturday the week starts on, recorded in the bookings history.
+        """
+        self.occupied_weeks |= 1 << week
+        self.bookings.append((start_date, start_date + timedelta(days=7)))
+        if self.observers:
+            self._notify(1 << week, True)
+
+    def release_campsite(self, start_date, end_date):
+        """
+        Releases a booking previously made for the given date range.
+
+        :param start_date: Start date of the booking.
+        :param end_date: End date of the booking.
+        :return: True if the weeks were booked and are now free, False otherwise.
+        """
+        mask = self._week_mask(start_date, end_date)
+        if (self.occupied_weeks & mask) != mask:
+            return False  # Only release ranges that were booked in full
+        self.occupied_weeks &= ~mask
+        # Remove the matching weeks from the bookings history
+        released = set()
+        current_date = start_date
+        while current_date < end_date:
+            next_week = current_date + timedelta(days=7)
+            released.add((current_date, next_week))
+            current_date = next_week
+        self.bookings = [period for period in self.bookings if period not in released]
+        self._notify(mask, False)
+        return True
+
+class CampsiteInventory:
+    """
+    Holds the campsites of a campground and indexes the free sites for each (size, week) pair.
+
+    Free sites are kept in a min-heap of site numbers per (size, week), built the first time that
+    week is requested, so the lowest free site of a size is found in O(log n). Heap entries are
+    re-checked against the campsite bitmap when popped, which drops sites booked outside the inventory.
+
+    Only single-week requests with a size use the heaps. Requests without a size or spanning several
+    weeks scan the candidate sites in order, O(n) per request; bookings are always one Saturday-to-Saturday
+    week and nearly always have a size, so the scan is rarely taken.
+    """
+
+    def __init__(self, campsites):
+        """
+        Initializes the inventory from a list of Campsite objects.
+
+        :param campsites: Iterable of Campsite objects.
+        """
+        self.campsites = sorted(campsites, key=lambda campsite: campsite.site_number)
+        self.sites_by_number = {campsite.site_number: campsite for campsite in self.campsites}
+        self.sites_by_size = {}  # Size -> site numbers in ascending order
+        for campsite in self.campsites:
+            self.sites_by_size.setdefault(campsite.size, []).append(campsite.site_number)
+        self._free_pools = {}  # (size, week_ordinal) -> heap of possibly free site numbers
+
+    def __len__(self):
+        return len(self.campsites)
+
+    def __iter__(self):
+        return iter(self.campsites)
+
+    def __getitem__(self, index):
+        return self.campsites[index]
+
+    def _free_pool(self, size, week):
+        """
+        Returns the free-site heap for a size and week, creating it on first use.
+
+        :param size: Campsite size category.
+        :param week: Week ordinal of the requested week.
+        :return: Heap (list) of site numbers that may be free that week.
+        """
+        pool = self._free_pools.get((size, week))
+        if pool is None:
+            # An ascending list is already a valid heap
+            pool = list(self.sites_by_size.get(size, ()))
+            self._free_pools[(size, week)] = pool
+        return pool
+
+    def _free_sites(self, size, start_date, end_date):
+        """
+        Yields free sites of a size in ascending site number order.
+
+        Single-week requests pop sites from the (size, week) pool as they are yielded, so a yielded
+        site that is not booked is treated as taken for that week. Requests without a size or spanning
+        several weeks have no pool and check every candidate site's bitmap in site number order.
+
+        :param size: Campsite size category, or None to accept any size.
+        :param start_date: Start date of the booking.
+        :param end_date: End date of the booking.
+        :return: Generator of free Campsite objects.
+        """
+        first_week, week_count = week_span(start_date, end_date)
+        if size is None or week_count != 1:
+            # Requests without a size or spanning several weeks check the sites in order
+            site_numbers = self.sites_by_number if size is None else self.sites_by_size.get(size, ())
+            for site_number in site_numbers:
+                campsite = self.sites_by_number[site_number]
+                if campsite.is_available(start_date, end_date):
+                    yield campsite
+            return
+
+        pool = self._free_pool(size, first_week)
+        while pool:
+            campsite = self.sites_by_number[heapq.heappop(pool)]
+            # Sites booked since the pool was built are dropped here
+            if campsite.is_available(start_date, end_date):
+                yield campsite
+
+    def book(self, size, start_date, end_date):
+        """
+        Books the lowest-numbered free site of the requested size.
+
+        :param size: Campsite size category, or None to accept any size.
+        :param start_date: Start date of the booking.
+        :param end_date: End date of the booking.
+        :return: The booked Campsite object or None if no site is free.
+        """
+        booked = self.book_many(size, start_date, end_date, 1)
+        return booked[0] if booked else None
+
+    def book_many(self, size, start_date, end_date, count):
+        """
+        Books the lowest-numbered free sites of the requested size, all or nothing.
+
+        :param size: Campsite size category, or None to accept any size.
+        :param start_date: Start date of the booking.
+        :param end_date: End date of the booking.
+        :param count: Number of campsites to book.
+        :return: List of booked Campsite objects, or an empty list if fewer than count were free.
+        :raises ValueError: If count is less than 1.
+        """
+        if count < 1:
+            raise ValueError(f"Number of campsites must be at least 1, got {count}.")
+        booked = []
+        for campsite in self._free_sites(size, start_date, end_date):
+            if campsite.book_campsite(start_date, end_date):
+                booked.append(campsite)
+                if len(booked) == count:
+                    return booked
+
+        # Not enough free sites, so roll back the partial reservation
+        for campsite in booked:
+            self.release(campsite, start_date, end_date)
+        return []
+
+    def release(self, campsite, start_date, end_date):
+        """
+        Releases a campsite booking and returns the site to the free pools.
+
+        :param campsite: The Campsite object to release.
+        :param start_date: Start date of the booking.
+        :param end_date: End date of the booking.
+        :return: True if the booking was released, False otherwise.
+        """
+        if not campsite.release_campsite(start_date, end_date):
+            return False
+        first_week, week_count = week_span(start_date, end_date)
+        for week in range(first_week, first_week + week_count):
+            pool = self._free_pools.get((campsite.size, week))
+            if pool is not None:
+                heapq.heappush(pool, campsite.site_number)
+        return True
+
 def allocate_campsite(campsites, start_date, end_date, booking):
     """
-    Allocates a campsite based on the availability between the start and end dates.
+    Allocates a campsite of the booking's size based on the availability between the start and end dates.
 
-    :param campsites: List of Campsite objects.
+    :param campsites: CampsiteInventory, or a list of Campsite objects to scan in order.
     :param start_date: Start date of the booking.
     :param end_date: End date of the booking.
     :param booking: Booking object containing booking details.
     :return: The allocated campsite object or None if no campsite is available.
     """
     logger.info(f"Attempting to allocate Booking {booking.booking_id} from {start_date.date()} to {end_date.date()}...")
-    for campsite in campsites:
-        # Check each campsite for availability
-        if campsite.is_available(start_date, end_date):
-            # Book the first available campsite found
-            if campsite.book_campsite(start_date, end_date):
-                logger.info(f"Booking {booking.booking_id} successfully allocated to Campsite {campsite.site_number}.")
-                return campsite  # Return the successfully allocated campsite
+    size = getattr(booking, 'campsite_size', None)
+    if isinstance(campsites, CampsiteInventory):
+        # Use the free-site pools to find the lowest free site of the requested size
+        campsite = campsites.book(size, start_date, end_date)
+        if campsite:
+            logger.info(f"Booking {booking.booking_id} successfully allocated to Campsite {campsite.site_number}.")
+            return campsite
+    else:
+        for campsite in campsites:
+            # Skip campsites of a different size than the one requested
+            if size is not None and campsite.size != size:
+                continue
+            # Check each campsite for availability
+            if campsite.is_available(start_date, end_date):
+                # Book the first available campsite found
+                if campsite.book_campsite(start_date, end_date):
+                    logger.info(f"Booking {booking.booking_id} successfully allocated to Campsite {campsite.site_number}.")
+                    return campsite  # Return the successfully allocated campsite
     logger.warning(f"No available campsites for Booking {booking.booking_id} from {start_date.date()} to {end_date.date()}.")
     return None  # Return None if no campsites are available
 
+def allocate_campsites(campsites, start_date, end_date, booking):
+    """
+    Allocates booking.num_campsites campsites of the booking's size in one all-or-nothing reservation.
+
+    :param campsites: CampsiteInventory, or a list of Campsite objects to scan in order.
+    :param start_date: Start date of the booking.
+    :param end_date: End date of the booking.
+    :param booking: Booking object containing booking details.
+    :return: List of allocated campsite objects, or an empty list if not enough campsites are available.
+    """
+    count = booking.num_campsites or 1
+    size = getattr(booking, 'campsite_size', None)
+    logger.info(f"Attempting to allocate {count} campsite(s) for Booking {booking.booking_id} "
+                f"from {start_date.date()} to {end_date.date()}...")
+    if isinstance(campsites, CampsiteInventory):
+        # Reserve every site from the free-site pools, rolling back on shortage
+        allocated = campsites.book_many(size, start_date, end_date, count)
+    else:
+        allocated = []
+        for campsite in campsites:
+            # Skip campsites of a different size than the one requested
+            if size is not None and campsite.size != size:
+                continue
+            if campsite.is_available(start_date, end_date) and campsite.book_campsite(start_date, end_date):
+                allocated.append(campsite)
+                if len(allocated) == count:
+                    break
+        if len(allocated) < count:
+            # Roll back the partial reservation
+            for campsite in allocated:
+                campsite.release_campsite(start_date, end_date)
+            allocated = []
+
+    if allocated:
+        site_numbers = ", ".join(str(campsite.site_number) for campsite in allocated)
+        logger.info(f"Booking {booking.booking_id} successfully allocated to Campsite(s) {site_numbers}.")
+    else:
+        logger.warning(f"Not enough available campsites for Booking {booking.booking_id} "
+                       f"({count} requested) from {start_date.date()} to {end_date.date()}.")
+    return allocated
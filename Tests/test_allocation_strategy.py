@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime
+from Models.allocation_strategy import get_allocation_strategy, select_max_fill
+from Models.booking import Booking
+from Utils.campsite_manager import initialize_campsites
+
+# Define a test class for the campsite allocation strategies
+class TestAllocationStrategy(unittest.TestCase):
+    """
+    Test class for testing the selectable campsite allocation strategies.
+
+    This class verifies that each strategy allocates campsites as documented and that the
+    revenue-maximizing strategy fills more campsites than greedy allocation when it can.
+    """
+
+    def setUp(self):
+        """
+        Set up a small campground with two Small and three Medium campsites.
+        """
+        self.campsites = initialize_campsites((('Small', 2, 50), ('Medium', 3, 60)))
+        self.arrival_date = datetime(2024, 9, 7)
+
+    def make_booking(self, booking_id, size, num_campsites):
+        """
+        Creates a booking for the test week.
+
+        :param booking_id: ID of the booking.
+        :param size: Requested campsite size.
+        :param num_campsites: Number of campsites requested.
+        :return: Booking object.
+        """
+        return Booking(booking_id, booking_id, "2024-08-01", self.arrival_date, size, num_campsites)
+
+    # Test the exact subset selection
+    def test_select_max_fill(self):
+        """
+        Test that the subset selection fills the most sites and prefers earlier bookings on ties.
+        """
+        self.assertEqual(select_max_fill([2, 3], 3), [False, True])
+        self.assertEqual(select_max_fill([1, 2, 1, 2], 3), [True, True, False, False])
+        self.assertEqual(select_max_fill([1, 1], 5), [True, True])
+
+    # Test that the revenue strategy beats greedy on an oversubscribed week
+    def test_revenue_strategy_fills_more_sites(self):
+        """
+        Test that the revenue strategy accepts the group that fills the week while greedy does not.
+        """
+        greedy_bookings = [self.make_booking(1, 'Medium', 2), self.make_booking(2, 'Medium', 3)]
+        greedy = get_allocation_strategy('greedy').allocate(greedy_bookings, initialize_campsites((('Medium', 3, 60),)))
+        self.assertEqual(greedy, [[1, 2], None])
+
+        revenue_bookings = [self.make_booking(1, 'Medium', 2), self.make_booking(2, 'Medium', 3)]
+        revenue = get_allocation_strategy('revenue').allocate(revenue_bookings, self.campsites)
+        self.assertEqual(revenue, [None, [3, 4, 5]])
+        self.assertEqual(revenue_bookings[1].total_cost, 3 * 60 * 7)
+
+    # Test that bookings without a size do not take the sites planned for sized bookings
+    def test_revenue_strategy_books_sized_first(self):
+        """
+        Test that a booking without a size, received first, is given a site left over by the selection.
+        """
+        bookings = [self.make_booking(1, None, 1), self.make_booking(2, 'Small', 2), self.make_booking(3, 'Medium', 3)]
+        revenue = get_allocation_strategy('revenue').allocate(bookings, self.campsites)
+        self.assertEqual(revenue, [None, [1, 2], [3, 4, 5]], "Every site is planned for the sized bookings.")
+
+        bookings = [self.make_booking(1, None, 1), self.make_booking(2, 'Medium', 2)]
+        revenue = get_allocation_strategy('revenue').allocate(bookings, initialize_campsites((('Small', 2, 50), ('Medium', 3, 60))))
+        self.assertEqual(revenue, [[1], [3, 4]])
+
+    # Test that best-fit upgrades a booking when its size is full
+    def test_best_fit_upgrades_at_requested_rate(self):
+        """
+        Test that best-fit allocation moves a booking to a larger size and bills the requested size's rate.
+        """
+        bookings = [self.make_booking(1, 'Small', 2), self.make_booking(2, 'Small', 1)]
+        results = get_allocation_strategy('best_fit').allocate(bookings, self.campsites)
+        self.assertEqual(results, [[1, 2], [3]])
+        self.assertEqual(bookings[1].total_cost, 50 * 7, "Upgraded booking should be billed at the Small rate.")
+
+    # Test strategy selection errors
+    def test_unknown_strategy(self):
+        """
+        Test that unknown strategies and batch mode for non-greedy strategies are rejected.
+        """
+        with self.assertRaises(ValueError):
+            get_allocation_strategy('cheapest')
+        with self.assertRaises(ValueError):
+            get_allocation_strategy('revenue', vectorized=True)
+
+if __name__ == "__main__":
+    unittest.main()
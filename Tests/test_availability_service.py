@@ -0,0 +1,99 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+from Utils.availability_service import AvailabilityCalendar
+from Utils.campsite_manager import initialize_campsites
+from Front_End import app as app_module
+
+# Define a test class for the availability calendar and route
+class TestAvailabilityService(unittest.TestCase):
+    """
+    Test class for testing the free-campsite calendar and the /availability route.
+
+    This class verifies that the calendar starts from the existing occupancy, follows bookings and
+    releases as they happen, and that the route serves cacheable JSON.
+    """
+
+    def setUp(self):
+        """
+        Set up the default campground with one Medium site already booked for the test week.
+        """
+        self.campsites = initialize_campsites()
+        self.week_start = datetime(2026, 12, 5)
+        self.week_end = self.week_start + timedelta(days=7)
+        self.campsites[10].book_campsite(self.week_start, self.week_end)
+        self.calendar = AvailabilityCalendar(self.campsites)
+
+    # Test the incremental free counts
+    def test_free_counts_follow_bookings(self):
+        """
+        Test that free counts reflect the starting occupancy and every later booking and release.
+        """
+        self.assertEqual(self.calendar.free_count('Medium', '2026-12-05'), 9)
+        self.assertEqual(self.calendar.free_count('Medium', '2026-12-03'), 9, "Arrivals adjust to the Saturday.")
+        self.assertEqual(self.calendar.free_counts(self.week_start), {'Small': 10, 'Medium': 9, 'Large': 10})
+
+        version = self.calendar.version
+        self.campsites[11].book_campsite(self.week_start, self.week_end)
+        self.assertEqual(self.calendar.free_count('Medium', self.week_start), 8)
+        self.campsites[10].release_campsite(self.week_start, self.week_end)
+        self.assertEqual(self.calendar.free_count('Medium', self.week_start), 9)
+        self.assertEqual(self.calendar.version, version + 2)
+        self.assertEqual(self.calendar.free_count('Huge', self.week_start), 0)
+
+    # Test the JSON route and its caching headers
+    def test_availability_route(self):
+        """
+        Test that /availability returns free counts with an ETag and answers 304 while nothing changes.
+        """
+        with app_module.availability_lock:
+            app_module.store_availability_calendar(app_module.APP_CAMPGROUND_ID, self.calendar)
+        client = app_module.app.test_client()
+        try:
+            response = client.get('/availability?date=2026-12-05&size=Medium')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json(), {'week_start': '2026-12-05', 'free': {'Medium': 9}})
+            self.assertIn('max-age', response.headers['Cache-Control'])
+            etag = response.headers['ETag']
+
+            self.assertEqual(client.get('/availability?date=2026-12-05', headers={'If-None-Match': etag}).status_code, 304)
+            self.campsites[12].book_campsite(self.week_start, self.week_end)
+            self.assertEqual(client.get('/availability?date=2026-12-05', headers={'If-None-Match': etag}).status_code, 200)
+
+            self.assertEqual(client.get('/availability?date=05-12-2026').status_code, 400)
+            self.assertEqual(client.get('/availability?date=2026-12-05&size=Huge').status_code, 400)
+            self.assertEqual(client.get('/availability?date=1969-12-01').status_code, 400)
+            self.assertEqual(client.get('/availability?date=9999-12-31').status_code, 400)
+            self.assertEqual(client.get('/availability?date=2026-12-05&campground_id=99').status_code, 400)
+            self.assertEqual(len(app_module.availability_calendars), 1, "Unknown campgrounds should not be cached.")
+        finally:
+            app_module.availability_calendars.clear()
+
+    # Test that calendars are built per campground and refreshed from Cosmos DB
+    @patch('Front_End.app.AVAILABILITY_CAMPGROUND_IDS', frozenset({app_module.APP_CAMPGROUND_ID, 7}))
+    @patch('Front_End.app.connect_to_cosmos', return_value=MagicMock())
+    @patch('Front_End.app.warm_start_campsites')
+    def test_calendar_refresh(self, mock_warm_start_campsites, mock_connect_to_cosmos):
+        """
+        Test that each campground gets a calendar of its own allocations, that it is reused while fresh,
+        and that an expired calendar is rebuilt with a new ETag.
+        """
+        mock_warm_start_campsites.side_effect = lambda *args, **kwargs: (initialize_campsites(), {})
+        client = app_module.app.test_client()
+        try:
+            calendar, build = app_module.get_availability_calendar(7)
+            self.assertEqual(mock_warm_start_campsites.call_args.kwargs['campground_id'], 7)
+            self.assertEqual(app_module.get_availability_calendar(7), (calendar, build))
+            self.assertEqual(mock_warm_start_campsites.call_count, 1, "A fresh calendar should be reused.")
+
+            etag = client.get('/availability?date=2026-12-05&campground_id=7').headers['ETag']
+            with patch.object(app_module, 'AVAILABILITY_REFRESH_SECONDS', -1):
+                response = client.get('/availability?date=2026-12-05&campground_id=7', headers={'If-None-Match': etag})
+            self.assertEqual(response.status_code, 200, "A rebuilt calendar should not match the old ETag.")
+            self.assertEqual(mock_warm_start_campsites.call_count, 2)
+            self.assertIsNot(app_module.get_availability_calendar(7)[0], calendar)
+        finally:
+            app_module.availability_calendars.clear()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import random
+from datetime import datetime, timedelta
+from Models.booking import Booking
+from Models.campsite import week_ordinal
+from Utils.batch_allocator import allocate_bookings_vectorized, allocate_bookings_sequentially, saturday_week_indices
+from Utils.campsite_manager import initialize_campsites
+
+# Define a test class for the vectorized batch allocation engine
+class TestBatchAllocator(unittest.TestCase):
+    """
+    Test class for testing the vectorized batch allocation engine.
+
+    This class verifies that whole-run allocation produces exactly the same campsite assignments
+    as allocating the bookings one at a time in order.
+    """
+
+    def make_bookings(self, seed, count):
+        """
+        Creates a reproducible list of bookings with mixed sizes, group sizes and arrival days.
+
+        :param seed: Random seed for the booking attributes.
+        :param count: Number of bookings to create.
+        :return: List of Booking objects.
+        """
+        rng = random.Random(seed)
+        return [
+            Booking(booking_id, booking_id, "2024-08-01",
+                    datetime(2024, 9, 1) + timedelta(days=rng.randrange(28)),
+                    rng.choice(['Small', 'Medium', 'Large']), rng.randint(1, 3))
+            for booking_id in range(count)
+        ]
+
+    # Test the vectorized Saturday adjustment
+    def test_saturday_week_indices(self):
+        """
+        Test the vectorized Saturday-adjusted week computation.
+
+        Verifies that every day of a year maps to the same week as Booking.adjust_to_saturday.
+        """
+        dates = [datetime(2024, 1, 1) + timedelta(days=offset) for offset in range(366)]
+        expected = [week_ordinal(Booking.adjust_to_saturday(value)) for value in dates]
+        self.assertEqual(saturday_week_indices(dates).tolist(), expected)
+
+    # Test arrivals before the week epoch
+    def test_dates_before_epoch(self):
+        """
+        Test that an arrival before WEEK_EPOCH fails with the same error in both engines.
+        """
+        messages = []
+        for allocate in (allocate_bookings_vectorized, allocate_bookings_sequentially):
+            bookings = [Booking(1, 101, "1969-12-01", "2024-09-07", 'Small', 1),
+                        Booking(2, 102, "1969-12-01", "1969-12-17", 'Small', 1)]
+            with self.assertRaises(ValueError) as context:
+                allocate(bookings, initialize_campsites())
+            messages.append(str(context.exception))
+        self.assertEqual(messages[0], messages[1])
+        self.assertIn("1969-12-20", messages[0])
+
+    # Test that batch allocation matches per-booking greedy allocation
+    def test_matches_sequential_allocation(self):
+        """
+        Test that vectorized allocation matches greedy first-fit allocation.
+
+        Runs both engines on the same oversubscribed workload, with some weeks already booked,
+        and verifies that the allocated sites, booking costs and campsite occupancy are identical.
+        """
+        for seed in range(5):
+            vectorized_bookings = self.make_bookings(seed, 120)
+            sequential_bookings = self.make_bookings(seed, 120)
+            vectorized_sites = initialize_campsites()
+            sequential_sites = initialize_campsites()
+
+            # Pre-book a few site-weeks on both inventories
+            for site_index in (0, 4, 12, 25):
+                start_date = datetime(2024, 9, 7)
+                vectorized_sites[site_index].book_campsite(start_date, start_date + timedelta(days=7))
+                sequential_sites[site_index].book_campsite(start_date, start_date + timedelta(days=7))
+
+            vectorized = allocate_bookings_vectorized(vectorized_bookings, vectorized_sites)
+            sequential = allocate_bookings_sequentially(sequential_bookings, sequential_sites)
+
+            self.assertEqual(vectorized, sequential, "Allocated sites should match the per-booking path.")
+            self.assertIn(None, vectorized, "The workload should leave some bookings unallocated.")
+            self.assertEqual([booking.total_cost for booking in vectorized_bookings],
+                             [booking.total_cost for booking in sequential_bookings])
+            self.assertEqual([site.occupied_weeks for site in vectorized_sites],
+                             [site.occupied_weeks for site in sequential_sites])
+
+if __name__ == "__main__":
+    unittest.main()
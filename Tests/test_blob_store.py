@@ -0,0 +1,92 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from Database.blob_store import FileSystemBlobStore, get_blob_store
+
+# Define a test class for the filesystem blob store
+class TestFileSystemBlobStore(unittest.TestCase):
+    """
+    Test class for testing the content-addressed filesystem blob store used for PDFs.
+
+    This class verifies that contents are stored under their SHA-256 in shard directories, that
+    identical contents are kept once, and that compressed contents read back unchanged.
+    """
+
+    def setUp(self):
+        """
+        Create a blob store in a temporary directory.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.store = FileSystemBlobStore(self.directory)
+
+    def tearDown(self):
+        """
+        Remove the blob store.
+        """
+        shutil.rmtree(self.directory)
+
+    def stored_files(self):
+        return [os.path.join(path, name) for path, _, names in os.walk(self.directory) for name in names]
+
+    # Test content addressing and deduplication
+    def test_put_and_dedup(self):
+        """
+        Test that content is stored under its hash in shard directories, and that storing it again writes nothing.
+        """
+        data = b"%PDF-1.3 confirmation"
+        key = hashlib.sha256(data).hexdigest()
+        reference = self.store.put(data, 'application/pdf')
+        self.assertEqual(reference, {'store': 'filesystem', 'key': key, 'size': len(data), 'content_type': 'application/pdf'})
+        self.assertEqual(self.stored_files(), [os.path.join(self.directory, key[:2], key[2:4], key)])
+
+        self.assertEqual(self.store.put(data, 'application/pdf'), reference)
+        self.assertEqual(len(self.stored_files()), 1, "Identical content should be stored once.")
+        self.assertTrue(self.store.exists(key))
+        self.assertEqual(self.store.get(key), data)
+
+        with self.assertRaises(FileNotFoundError):
+            self.store.open(hashlib.sha256(b"missing").hexdigest())
+        with self.assertRaises(ValueError):
+            self.store.open("../../etc/passwd")
+
+    # Test compression
+    def test_compression(self):
+        """
+        Test that compressible content is stored compressed and streams back unchanged, and that
+        content compression would not shrink is stored as it is.
+        """
+        store = FileSystemBlobStore(self.directory, compress=True)
+        text = b"Booking Confirmation " * 1000
+        key = store.put(text)['key']
+        path, = self.stored_files()
+        self.assertTrue(path.endswith('.gz'))
+        self.assertLess(os.path.getsize(path), len(text))
+        with store.open(key) as file:
+            self.assertEqual(file.read(100), text[:100])
+            self.assertEqual(file.read(), text[100:])
+        self.assertTrue(self.store.exists(key), "A store without compression should still find compressed content.")
+
+        random_bytes = os.urandom(4096)
+        key = store.put(random_bytes)['key']
+        self.assertTrue(os.path.exists(store.path_for(key)))
+        self.assertEqual(store.get(key), random_bytes)
+
+    # Test selecting the store
+    def test_store_selection(self):
+        """
+        Test that the configuration sets up the blob store, and that unknown store types are rejected.
+        """
+        settings = {'blob_store': {'type': 'filesystem', 'root': self.directory, 'compress': True}}
+        with patch('Database.blob_store.load_config', return_value=settings):
+            store = get_blob_store()
+            self.assertEqual((store.root, store.compress), (self.directory, True))
+            self.assertIs(get_blob_store(), store, "The store should be reused while the settings are unchanged.")
+        with patch('Database.blob_store.load_config', return_value={'blob_store': {'type': 's3'}}):
+            with self.assertRaises(ValueError):
+                get_blob_store()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
 import unittest
+from unittest.mock import MagicMock
 from datetime import datetime, timedelta
-from Models.booking import Booking
-from Models.campsite import Campsite, allocate_campsite
+from Models.booking import Booking, create_booking_data, parse_iso_date
+from Models.campsite import Campsite, allocate_campsite, allocate_campsites
+from Utils.campsite_manager import initialize_campsites
 
 
 # Define a test class for the Booking model
@@ -83,5 +85,77 @@ class TestBooking(unittest.TestCase):
         # Verify that the allocated campsite is the expected one (site number 1)
         self.assertEqual(allocated_campsite.site_number, 1, "The allocated campsite should be site number 1.")
 
+    # Test reserving several campsites for a group booking
+    def test_allocate_group_booking(self):
+        """
+        Test the allocation of every campsite requested by a group booking.
+
+        Verifies that a booking for three Medium sites reserves three Medium campsites in one operation
+        and that every allocated site is recorded on the booking data stored in Cosmos DB.
+        """
+        campsites = initialize_campsites()
+        self.booking.num_campsites = 3
+        update_func = MagicMock()
+
+        allocated_campsite = self.booking.allocate_campsite(campsites, MagicMock(), update_func)
+
+        # The first Medium site is returned and all three sites are recorded
+        self.assertEqual(allocated_campsite.site_number, 11, "The first allocated campsite should be site 11.")
+        self.assertEqual(self.booking.campsite_allocations, [11, 12, 13], "All three Medium sites should be recorded.")
+        self.assertEqual(create_booking_data(self.booking)["campsite_allocations"], [11, 12, 13])
+        self.assertEqual(self.booking.total_cost, 60 * 7 * 3, "Cost should cover all three campsites.")
+        update_func.assert_called_once()
+
+    # Test that a group booking is rolled back when the week cannot fit it
+    def test_allocate_group_booking_rolls_back(self):
+        """
+        Test the rollback of a group booking that cannot be fully allocated.
+
+        Verifies that no campsites stay reserved when fewer free campsites remain than were requested.
+        """
+        campsites = initialize_campsites()
+        start_date = datetime(2024, 9, 7)
+        end_date = start_date + timedelta(days=7)
+
+        # Leave only two Medium sites free for the week
+        for campsite in campsites[10:18]:
+            campsite.book_campsite(start_date, end_date)
+
+        self.booking.num_campsites = 3
+        self.assertEqual(allocate_campsites(campsites, start_date, end_date, self.booking), [],
+                         "A booking for three sites should fail when only two are free.")
+
+        # The two free sites were released again and can still be reserved together
+        self.booking.num_campsites = 2
+        allocated = allocate_campsites(campsites, start_date, end_date, self.booking)
+        self.assertEqual([campsite.site_number for campsite in allocated], [19, 20])
+
+    # Test the bulk constructors against the per-record constructors
+    def test_bulk_construction(self):
+        """
+        Test the bulk construction of Booking objects from documents and database records.
+
+        Verifies that from_dicts and from_db_records build the same bookings as from_dict and from_db_record,
+        and that records which cannot be converted are skipped instead of failing the whole batch.
+        """
+        self.booking.update_campsite_info(11, 60, [11, 12])
+        documents = [self.booking.to_dict(), {"booking_id": 2, "arrival_date": "2024-09-07"}]
+
+        bookings = Booking.from_dicts(documents)
+        self.assertEqual(len(bookings), 1, "The document without a customer should be skipped.")
+        self.assertEqual(bookings[0].to_dict(), Booking.from_dict(documents[0]).to_dict())
+
+        records = [(1, 101, datetime(2024, 9, 1), "2024-09-07", 1, 'Medium', 2, 'Ann'), (2, 102, "2024-13-01")]
+        bookings = Booking.from_db_records(records)
+        self.assertEqual(len(bookings), 1, "The truncated record should be skipped.")
+        expected = Booking.from_db_record(records[0])
+        self.assertEqual(bookings[0].to_dict(), expected.to_dict())
+        self.assertEqual(bookings[0].customer_name, 'Ann')
+
+        # The cached parser rejects bad dates with the usual message and accepts unpadded dates
+        with self.assertRaisesRegex(ValueError, "Expected 'YYYY-MM-DD'"):
+            parse_iso_date("2024-02-30")
+        self.assertEqual(parse_iso_date("2024-9-7"), datetime(2024, 9, 7))
+
 if __name__ == "__main__":
     unittest.main()
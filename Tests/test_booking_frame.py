@@ -0,0 +1,82 @@
+import unittest
+from datetime import datetime
+from Models.booking import Booking
+from Models.booking_frame import BookingFrame, as_booking_frame
+from Utils.campsite_manager import initialize_campsites
+from Utils.summary_manager import generate_summary
+
+# Define a test class for the NumPy booking frame
+class TestBookingFrame(unittest.TestCase):
+    """
+    Test class for testing the BookingFrame column store and the summaries computed from it.
+
+    This class verifies that frames built from bookings, database rows or documents hold the same
+    bookings, and that the vectorized reductions match the totals of the original summary loops.
+    """
+
+    def setUp(self):
+        """
+        Set up a group booking on two sites, a single-site booking and an unallocated booking.
+        """
+        self.group = Booking(1, 101, "2024-08-01", datetime(2024, 9, 10), 'Large', 2, 1121132, "Jane Doe")
+        self.group.update_campsite_info(21, 70, [21, 22])
+        self.single = Booking(2, 102, "2024-08-02", "2024-09-14", 'Small', 1, 1121132)
+        self.single.update_campsite_info(1, 50)
+        self.unallocated = Booking(3, 103, "2024-08-03", "2024-09-14", 'Small', 1)
+        self.bookings = [self.group, self.single, self.unallocated]
+
+    # Test the round trip through the frame
+    def test_round_trip(self):
+        """
+        Test that bookings read back from the frame match the originals, whichever way it was built.
+        """
+        frame = BookingFrame.from_bookings(self.bookings)
+        self.assertEqual([booking.to_dict() for booking in frame], [booking.to_dict() for booking in self.bookings])
+        self.assertEqual(frame[0].customer_name, "Jane Doe")
+        self.assertIsNone(frame[-1].campground_id)
+
+        from_dicts = BookingFrame.from_dicts(booking.to_dict() for booking in self.bookings)
+        self.assertEqual(from_dicts.to_dicts(), [booking.to_dict() for booking in self.bookings])
+        self.assertEqual(from_dicts.size_names, ['Large', 'Small'])
+        self.assertEqual(from_dicts[0].arrival_date, datetime(2024, 9, 10))
+        self.assertIsNone(from_dicts[-1].campsite_id)
+
+        # Head Office rows are unallocated bookings
+        record = (4, 104, datetime(2024, 8, 4), "2024-09-21", 1, 'Medium', 3, "Sam Lee")
+        from_rows = BookingFrame.from_db_records([record])
+        self.assertEqual(from_rows[0].to_dict(), Booking.from_db_record(record).to_dict())
+        self.assertEqual(len(BookingFrame.from_db_records([])), 0)
+
+        # camping.booking allows a NULL number of campsites, which allocation treats as one
+        record = (5, 105, datetime(2024, 8, 5), "2024-09-21", 1, 'Small', None, "Ana Ruiz")
+        self.assertEqual(BookingFrame.from_db_records([record])[0].num_campsites, 1)
+        unsized = Booking.from_db_record(record)
+        self.assertEqual(BookingFrame.from_bookings([unsized]).num_campsites.tolist(), [1])
+
+    # Test the vectorized reductions against the summary totals
+    def test_reductions(self):
+        """
+        Test the sales, allocation counts, revenue by size and per-site counts of a frame.
+
+        Lists of bookings are summarized through a view that only loads the summary columns.
+        """
+        frame = as_booking_frame(self.bookings)
+        self.assertIsNone(frame.booking_ids, "A list of bookings should only load the summary columns.")
+        self.assertEqual(len(frame), 3)
+        self.assertIs(as_booking_frame(frame), frame, "A frame should be used as it is.")
+        self.assertEqual(frame.successful_allocations(), 2)
+        self.assertEqual(frame.total_sales(), 70 * 7 * 2 + 50 * 7)
+        self.assertEqual(frame.revenue_by_size(), {'Large': 980, 'Small': 350})
+
+        summary = generate_summary(frame, initialize_campsites())
+        self.assertEqual(summary['total_bookings'], 3)
+        self.assertEqual(summary['failed_allocations'], 1)
+        self.assertEqual(summary['campsite_utilization'][21]['bookings_count'], 1)
+        self.assertEqual(summary['campsite_utilization'][22]['bookings_count'], 1)
+        self.assertEqual(summary['campsite_utilization'][1]['bookings_count'], 1)
+        self.assertEqual(summary['campsite_utilization'][2]['bookings_count'], 0)
+        full_frame = BookingFrame.from_bookings(self.bookings)
+        self.assertEqual(generate_summary(full_frame, initialize_campsites()), summary)
+
+if __name__ == "__main__":
+    unittest.main()
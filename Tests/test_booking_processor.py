@@ -3,7 +3,8 @@ from unittest.mock import MagicMock, patch
 from datetime import datetime, timedelta
 from Models.booking import Booking
 from Models.campsite import Campsite
-from Utils.booking_processor import process_bookings
+from Utils.booking_processor import process_booking_stream, process_bookings
+from Utils.campsite_manager import initialize_campsites
 
 # Define a test class for the BookingProcessor
 class TestBookingProcessor(unittest.TestCase):
@@ -43,8 +44,9 @@ class TestBookingProcessor(unittest.TestCase):
 
 
     # Test the successful processing of bookings
-    @patch('Utils.booking_processor.insert_booking_to_cosmos_db')
-    def test_process_bookings_success(self, mock_insert_booking_to_cosmos_db):
+    @patch('Utils.booking_processor.generate_confirmation', return_value=True)
+    @patch('Utils.booking_processor.insert_booking_to_cosmos_db', return_value=True)
+    def test_process_bookings_success(self, mock_insert_booking_to_cosmos_db, mock_generate_confirmation):
         """
         Test successful processing of bookings.
 
@@ -52,11 +54,53 @@ class TestBookingProcessor(unittest.TestCase):
         Also checks that the Cosmos DB insertion happens.
         """
         # Process the bookings with the initialized campsite
-        process_bookings(self.bookings, self.campsites, self.head_office_conn, self.cosmos_conn, campground_id=1121132)
+        stored, failed = process_bookings(self.bookings, self.campsites, self.head_office_conn, self.cosmos_conn,
+                                          campground_id=1121132)
         # Assert that the booking's campsite ID is set to 1, indicating successful allocation
         self.assertEqual(self.bookings[0].campsite_id, 1, "Campsite should be allocated.")
         # Ensure that the Cosmos DB insert function was called
         mock_insert_booking_to_cosmos_db.assert_called()
+        self.assertEqual((stored, failed), ([1], []), "The stored booking should be reported.")
+
+    # Test that bookings which could not be stored are not reported as stored
+    @patch('Utils.booking_processor.generate_confirmation')
+    @patch('Utils.booking_processor.insert_booking_to_cosmos_db')
+    def test_process_bookings_not_stored(self, mock_insert_booking_to_cosmos_db, mock_generate_confirmation):
+        """
+        Test that a booking whose confirmation or Cosmos DB insert fails is reported as failed rather than stored,
+        and that a booking without a confirmation is not inserted.
+        """
+        mock_generate_confirmation.return_value = False
+        result = process_bookings(self.bookings, self.campsites, self.head_office_conn, self.cosmos_conn, campground_id=1121132)
+        self.assertEqual(result, ([], [1]))
+        mock_insert_booking_to_cosmos_db.assert_not_called()
+
+        mock_generate_confirmation.return_value = True
+        mock_insert_booking_to_cosmos_db.return_value = False
+        result = process_bookings(self.bookings, self.campsites, self.head_office_conn, self.cosmos_conn, campground_id=1121132)
+        self.assertEqual(result, ([], [1]))
+        mock_insert_booking_to_cosmos_db.assert_called_once()
+
+    # Test writing the processed bookings to Cosmos DB in bulk
+    @patch('Utils.booking_processor.generate_confirmation')
+    @patch('Utils.booking_processor.insert_booking_to_cosmos_db')
+    @patch('Database.cosmos_bulk.bulk_write_bookings')
+    def test_process_bookings_bulk(self, mock_bulk_write_bookings, mock_insert_booking_to_cosmos_db, mock_generate_confirmation):
+        """
+        Test that with cosmos_bulk the allocated bookings are written together by the bulk writer.
+        """
+        mock_bulk_write_bookings.return_value = [{'booking_id': 1, 'status': 'created', 'error': None}]
+        result = process_bookings(self.bookings, self.campsites, self.head_office_conn, self.cosmos_conn,
+                                  campground_id=1121132, cosmos_bulk=True)
+        self.assertEqual(result, ([1], []))
+        (documents,), _ = mock_bulk_write_bookings.call_args
+        self.assertEqual([document['booking_id'] for document in documents], [1])
+        mock_insert_booking_to_cosmos_db.assert_not_called()
+
+        mock_bulk_write_bookings.return_value = [{'booking_id': 1, 'status': 'failed', 'error': "503 Busy"}]
+        result = process_bookings(self.bookings, self.campsites, self.head_office_conn, self.cosmos_conn,
+                                  campground_id=1121132, cosmos_bulk=True)
+        self.assertEqual(result, ([], [1]), "A failed bulk write should be reported as failed, not stored.")
 
     def test_process_bookings_no_campsites(self):
         """
@@ -70,11 +114,45 @@ class TestBookingProcessor(unittest.TestCase):
         # Pre-book the campsite to make it unavailable for new bookings
         self.campsites[0].book_campsite = MagicMock(return_value=False)
         # Process the bookings with no available campsites
-        process_bookings(self.bookings, self.campsites, self.head_office_conn, self.cosmos_conn, campground_id=1121132)
+        result = process_bookings(self.bookings, self.campsites, self.head_office_conn, self.cosmos_conn, campground_id=1121132)
         # Assert that the booking's campsite ID remains None, indicating no allocation
         self.assertIsNone(self.bookings[0].campsite_id, "Campsite should not be allocated if unavailable.")
+        self.assertEqual(result, ([], []), "A booking rejected for lack of campsites is neither stored nor failed.")
         # Ensure that the SQL update was never called since no campsite was allocated
         self.head_office_conn.cursor().execute.assert_not_called()
 
+    # Test processing bookings that arrive in batches
+    @patch('Utils.booking_processor.complete_booking', return_value=True)
+    def test_process_booking_stream(self, mock_complete_booking):
+        """
+        Test processing of a stream of booking batches.
+
+        Verifies that bookings allocated by an earlier run are not allocated again, that campsites
+        stay booked across batches, and that the returned frame summarizes the whole stream.
+        """
+        arrival_date = datetime(2024, 9, 7)
+        batches = [
+            [Booking(booking_id, 100 + booking_id, "2024-08-01", arrival_date, 'Large', 1) for booking_id in (1, 2, 3)],
+            [Booking(booking_id, 100 + booking_id, "2024-08-01", arrival_date, 'Large', sites)
+             for booking_id, sites in ((4, 2), (5, 6))]
+        ]
+        stored = {1: {'booking_id': 1, 'arrival_date': '2024-09-07', 'campsite_id': 21,
+                      'campsite_allocations': [21], 'total_cost': 490}}
+        campsites = initialize_campsites()
+        campsites[20].book_campsite(arrival_date, arrival_date + timedelta(days=7))  # Site 21, restored from the stored run
+        seen = []
+
+        frame = process_booking_stream(iter(batches), campsites, self.head_office_conn, self.cosmos_conn, 1121132,
+                                       stored_allocations=stored, on_batch=lambda bookings, stored_ids, failed_ids: seen.append((stored_ids, failed_ids)))
+
+        # Bookings 2 and 3 take sites 22 and 23, booking 4 takes 24 and 25, and the six sites booking 5 needs are not left
+        self.assertEqual([booking.campsite_allocations for booking in batches[1]], [[24, 25], []])
+        self.assertEqual(mock_complete_booking.call_count, 3, "Only the new, allocated bookings should be stored.")
+        self.assertEqual(seen, [({1, 2, 3}, []), ({4}, [])],
+                         "Each batch should report its stored bookings, restored ones included, and no failures.")
+        self.assertEqual(len(frame), 5)
+        self.assertEqual(frame.successful_allocations(), 4)
+        self.assertEqual(frame.total_sales(), 490 + 70 * 7 * 2 + 70 * 7 * 2)
+
 if __name__ == "__main__":
     unittest.main()
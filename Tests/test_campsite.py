@@ -1,6 +1,6 @@
 import unittest
 from datetime import datetime, timedelta
-from Models.campsite import Campsite
+from Models.campsite import Campsite, week_ordinal
 
 
 # Define a test class for the Campsite model
@@ -51,6 +51,56 @@ class TestCampsite(unittest.TestCase):
         # Assert that the campsite is no longer available after booking
         self.assertFalse(self.campsite.is_available(start_date, end_date), "Campsite should not be available after booking.")
 
-    # Test the rate calculation for the campsite
+    # Test releasing a campsite booking
+    def test_release_campsite(self):
+        """
+        Test releasing a campsite booking.
+
+        Verifies that a released week becomes available again and is removed from the bookings history.
+        """
+        start_date = datetime(2024, 9, 7)
+        end_date = start_date + timedelta(days=7)
+        self.campsite.book_campsite(start_date, end_date)
+        # Assert that the release succeeds and frees the week
+        self.assertTrue(self.campsite.release_campsite(start_date, end_date), "Releasing a booked week should succeed.")
+        self.assertTrue(self.campsite.is_available(start_date, end_date), "Campsite should be available after release.")
+        self.assertEqual(self.campsite.bookings, [], "Released weeks should be removed from the history.")
+        # Releasing a week that is not booked does nothing
+        self.assertFalse(self.campsite.release_campsite(start_date, end_date), "Releasing a free week should fail.")
+
+    # Test that availability only depends on the requested weeks
+    def test_availability_with_booking_history(self):
+        """
+        Test availability checks against a long booking history.
+
+        Verifies that weeks booked in earlier seasons do not block a free week, and that a booked
+        week is still reported as unavailable when other weeks are booked around it.
+        """
+        # Book every other week for two seasons
+        first_week = datetime(2024, 1, 6)
+        for week in range(0, 104, 2):
+            start_date = first_week + timedelta(weeks=week)
+            self.campsite.book_campsite(start_date, start_date + timedelta(days=7))
+
+        # Odd weeks stay free and even weeks are taken
+        free_week = first_week + timedelta(weeks=51)
+        booked_week = first_week + timedelta(weeks=50)
+        self.assertTrue(self.campsite.is_available(free_week, free_week + timedelta(days=7)), "Odd weeks should be free.")
+        self.assertFalse(self.campsite.is_available(booked_week, booked_week + timedelta(days=7)), "Even weeks should be booked.")
+        # A two-week range overlapping a booked week is unavailable
+        self.assertFalse(self.campsite.is_available(free_week, free_week + timedelta(days=14)), "Range overlapping a booking should be unavailable.")
+
+    # Test the week ordinal used by the occupancy bitmap
+    def test_week_ordinal(self):
+        """
+        Test the conversion of dates into Saturday-to-Saturday week ordinals.
+
+        Verifies that every day from a Saturday to the following Friday maps to the same week.
+        """
+        saturday = datetime(2024, 9, 7)
+        week = week_ordinal(saturday)
+        self.assertEqual(week_ordinal(saturday + timedelta(days=6)), week, "Friday should share the Saturday's week.")
+        self.assertEqual(week_ordinal(saturday + timedelta(days=7)), week + 1, "The next Saturday should start a new week.")
+
 if __name__ == "__main__":
     unittest.main()
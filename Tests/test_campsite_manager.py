@@ -1,5 +1,13 @@
+import os
+import tempfile
 import unittest
-from Utils.campsite_manager import initialize_campsites
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+from azure.cosmos import exceptions
+from Models.booking import Booking
+from Models.campsite import allocate_campsite
+from Utils.booking_processor import filter_new_bookings
+from Utils.campsite_manager import initialize_campsites, save_allocation_snapshot, warm_start_campsites
 
 # Define a test class for the CampsiteManager
 class TestCampsiteManager(unittest.TestCase):
@@ -33,6 +41,109 @@ class TestCampsiteManager(unittest.TestCase):
         # Assert that the last 10 campsites (starting from index 20) are of size 'Large'
         self.assertEqual(campsites[20].size, 'Large', "The 21st campsite should be of size 'Large'.")
 
+    # Test size-aware allocation from the campsite inventory
+    def test_allocate_lowest_free_site_of_size(self):
+        """
+        Test allocation from the inventory returned by `initialize_campsites`.
+
+        Verifies that bookings receive the lowest-numbered free campsite of the requested size,
+        and that allocation fails once every site of that size is booked for the week.
+        """
+        campsites = initialize_campsites()
+        start_date = datetime(2026, 12, 5)
+        end_date = start_date + timedelta(days=7)
+
+        # Book the first Large site outside the allocator so the pool has to skip it
+        campsites[20].book_campsite(start_date, end_date)
+
+        allocated = []
+        for booking_id in range(1, 11):
+            booking = Booking(booking_id, booking_id, start_date, start_date, 'Large', 1)
+            allocated.append(allocate_campsite(campsites, start_date, end_date, booking))
+
+        # Sites 22-30 are handed out in order and the tenth booking finds no free Large site
+        self.assertEqual([campsite.site_number for campsite in allocated[:9]], list(range(22, 31)))
+        self.assertIsNone(allocated[9], "No Large site should remain free for the week.")
+
+        # Other sizes and other weeks are unaffected
+        small_booking = Booking(11, 11, start_date, start_date, 'Small', 1)
+        self.assertEqual(allocate_campsite(campsites, start_date, end_date, small_booking).site_number, 1)
+        next_week = end_date + timedelta(days=7)
+        next_week_booking = Booking(12, 12, end_date, end_date, 'Large', 1)
+        self.assertEqual(allocate_campsite(campsites, end_date, next_week, next_week_booking).site_number, 21)
+
+    # Test warm-starting campsites from a snapshot of an earlier run
+    def test_warm_start_from_snapshot(self):
+        """
+        Test that allocations saved by one run occupy the same campsites in the next run.
+
+        Verifies that the snapshot is preferred over Cosmos DB, that restored bookings are not
+        processed again, and that only the new booking is returned for allocation.
+        """
+        arrival_date = datetime(2026, 12, 5)
+        first_run = Booking(1, 1, arrival_date, arrival_date, 'Large', 2)
+        first_run.update_campsite_info(21, 70, [21, 22])
+
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, 'allocations.json')
+            save_allocation_snapshot(snapshot_path, [first_run])
+
+            # Cosmos DB holds the same single allocation, so only its count and highest booking_id are read
+            cosmos_conn = MagicMock()
+            cosmos_conn.query_items.return_value = [1]
+            campsites, stored_allocations = warm_start_campsites(cosmos_conn, snapshot_path)
+            self.assertTrue(all("SELECT VALUE" in call.kwargs['query'] for call in cosmos_conn.query_items.call_args_list))
+
+        end_date = arrival_date + timedelta(days=7)
+        self.assertFalse(campsites[20].is_available(arrival_date, end_date), "Site 21 should be restored as booked.")
+        self.assertFalse(campsites[21].is_available(arrival_date, end_date), "Site 22 should be restored as booked.")
+        self.assertTrue(campsites[22].is_available(arrival_date, end_date))
+
+        # The earlier booking gets its allocation back and only the new booking needs processing
+        fetched_again = Booking(1, 1, arrival_date, arrival_date, 'Large', 2)
+        new_booking = Booking(2, 2, arrival_date, arrival_date, 'Large', 1)
+        self.assertEqual(filter_new_bookings([fetched_again, new_booking], stored_allocations), [new_booking])
+        self.assertEqual(fetched_again.campsite_allocations, [21, 22])
+        self.assertEqual(fetched_again.total_cost, 70 * 7 * 2)
+        self.assertEqual(allocate_campsite(campsites, arrival_date, end_date, new_booking).site_number, 23)
+
+    # Test that a stale snapshot is not used
+    def test_warm_start_stale_snapshot(self):
+        """
+        Test that a snapshot missing bookings stored in Cosmos DB, e.g. after a crashed run, is replaced by the Cosmos DB allocations.
+        """
+        arrival_date = datetime(2026, 12, 5)
+        first_run = Booking(1, 1, arrival_date, arrival_date, 'Large', 1)
+        first_run.update_campsite_info(21, 70)
+        stored = [{'booking_id': booking_id, 'arrival_date': '2026-12-05', 'campsite_id': site,
+                   'campsite_allocations': [site], 'total_cost': 490} for booking_id, site in ((1, 21), (2, 22))]
+
+        def query_items(query, **kwargs):
+            if "COUNT(1)" in query:
+                return [2]
+            return [2] if "MAX(" in query else stored
+        cosmos_conn = MagicMock()
+        cosmos_conn.query_items.side_effect = query_items
+
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, 'allocations.json')
+            save_allocation_snapshot(snapshot_path, [first_run])
+            campsites, stored_allocations = warm_start_campsites(cosmos_conn, snapshot_path)
+
+        self.assertEqual(sorted(stored_allocations), [1, 2])
+        self.assertFalse(campsites[21].is_available(arrival_date, arrival_date + timedelta(days=7)),
+                         "Site 22, stored after the snapshot was saved, should be booked.")
+
+    # Test that a failed Cosmos DB read is not taken for an empty campground
+    def test_warm_start_cosmos_error(self):
+        """
+        Test that an error reading the stored allocations is raised instead of starting from empty campsites.
+        """
+        cosmos_conn = MagicMock()
+        cosmos_conn.query_items.side_effect = exceptions.CosmosHttpResponseError(status_code=503, message="Busy")
+        with self.assertRaises(exceptions.CosmosHttpResponseError):
+            warm_start_campsites(cosmos_conn, campground_id=1121132)
+
 # Run the test cases
 if __name__ == "__main__":
     unittest.main()
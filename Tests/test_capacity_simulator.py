@@ -0,0 +1,56 @@
+import unittest
+from Utils.capacity_simulator import Scenario, apply_demand, run_scenarios, synthetic_booking_records
+
+# Define a test class for the capacity what-if simulator
+class TestCapacitySimulator(unittest.TestCase):
+    """
+    Test class for testing the capacity what-if simulator.
+
+    This class verifies that scenarios change the replayed campground or demand as described and that
+    parallel runs report the same results as running the scenarios in this process.
+    """
+
+    def setUp(self):
+        """
+        Set up an oversubscribed synthetic booking set.
+        """
+        self.records = synthetic_booking_records(600, seed=7, weeks=8)
+        self.base = Scenario('base')
+
+    # Test that extra campsites raise allocation and revenue
+    def test_extra_sites(self):
+        """
+        Test that adding Large campsites allocates more bookings without changing the booking set.
+        """
+        bigger = self.base.with_extra_sites('Large', 10)
+        self.assertIn(('Large', 20, 70), bigger.layout)
+
+        base_result, bigger_result = run_scenarios([self.base, bigger], self.records, max_workers=1)
+        self.assertEqual(bigger_result['sites'], 40)
+        self.assertEqual(base_result['bookings'], bigger_result['bookings'])
+        self.assertGreater(bigger_result['allocated'], base_result['allocated'])
+        self.assertGreater(bigger_result['revenue'], base_result['revenue'])
+        self.assertLessEqual(bigger_result['utilization']['overall'], 1.0)
+
+    # Test scaling demand for one month
+    def test_apply_demand(self):
+        """
+        Test that doubling a month's demand copies exactly that month's bookings with new IDs.
+        """
+        month = self.records[0][3].month
+        in_month = sum(1 for record in self.records if record[3].month == month)
+        scaled = apply_demand(self.records, {month: 2.0})
+        self.assertEqual(len(scaled), len(self.records) + in_month)
+        self.assertEqual(len({record[0] for record in scaled}), len(scaled), "Copies should get new booking IDs.")
+
+    # Test that parallel and in-process runs agree
+    def test_parallel_matches_serial(self):
+        """
+        Test that running scenarios in worker processes gives the same results as running them in order here.
+        """
+        scenarios = [self.base, self.base.with_demand(1, 1.5), Scenario('revenue', strategy='revenue')]
+        self.assertEqual(run_scenarios(scenarios, self.records, max_workers=2),
+                         run_scenarios(scenarios, self.records, max_workers=1))
+
+if __name__ == "__main__":
+    unittest.main()
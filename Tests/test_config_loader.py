@@ -1,3 +1,7 @@
+import json
+import os
+import shutil
+import tempfile
 import unittest
 from Utils.config_loader import load_config, get_connection_string
 
@@ -47,5 +51,25 @@ class TestConfigLoader(unittest.TestCase):
         # Normalize keys to lowercase to ensure case-insensitivity in the test
         self.assertIn('server=', conn_str.lower(), "Connection string should include server details.")
 
+    # Test that configuration files are cached until they change
+    def test_cached_until_modified(self):
+        """
+        Test that a configuration file is parsed once and reloaded only after its modification time changes.
+        """
+        config_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, config_dir)
+        file_path = os.path.join(config_dir, 'settings.json')
+        with open(file_path, 'w') as file:
+            json.dump({'cosmos_db': {'database_name': 'first'}}, file)
+
+        first = load_config(file_path)
+        self.assertIs(load_config(file_path), first, "An unchanged file should not be parsed again.")
+
+        with open(file_path, 'w') as file:
+            json.dump({'cosmos_db': {'database_name': 'second'}}, file)
+        stat = os.stat(file_path)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(load_config(file_path)['cosmos_db']['database_name'], 'second')
+
 if __name__ == "__main__":
     unittest.main()
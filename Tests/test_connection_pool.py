@@ -0,0 +1,114 @@
+import pyodbc
+import threading
+import unittest
+from unittest.mock import MagicMock
+from Database.connection_pool import ConnectionPool, close_all_pools, get_pool, pool_stats
+
+# Define a test class for the database connection pool
+class TestConnectionPool(unittest.TestCase):
+    """
+    Test class for testing the thread-safe pool of SQL and Head Office connections.
+
+    This class verifies that connections are reused, that the pool never opens more than max_size
+    connections, and that stale, broken and idle connections are replaced rather than handed out.
+    """
+
+    def setUp(self):
+        """
+        Set up a pool whose connect function returns a new mock connection on every call.
+        """
+        self.connect = MagicMock(side_effect=lambda: MagicMock())
+        self.pool = ConnectionPool(self.connect, "test", max_size=2)
+
+    def tearDown(self):
+        """
+        Forget the process-wide pools created by the tests.
+        """
+        close_all_pools()
+
+    # Test that returned connections are reused
+    def test_reuse(self):
+        """
+        Test that a connection returned to the pool is checked out again instead of connecting.
+        """
+        with self.pool.connection() as first:
+            pass
+        with self.pool.connection() as second:
+            self.assertIs(second, first)
+        self.assertEqual(self.connect.call_count, 1)
+        first.rollback.assert_called()  # Uncommitted work is reset before reuse
+
+        stats = self.pool.stats()
+        self.assertEqual((stats['created'], stats['reused'], stats['in_use'], stats['idle']), (1, 1, 0, 1))
+
+    # Test the maximum pool size
+    def test_max_size(self):
+        """
+        Test that a checkout waits when max_size connections are in use, and times out if none is returned.
+        """
+        first = self.pool.acquire()
+        second = self.pool.acquire()
+        with self.assertRaises(TimeoutError):
+            self.pool.acquire(timeout=0.01)
+
+        # A connection returned by another thread is handed to the waiting checkout
+        threading.Timer(0.05, self.pool.release, args=(first,)).start()
+        self.assertIs(self.pool.acquire(timeout=5), first)
+        self.pool.release(first)
+        self.pool.release(second)
+        self.assertEqual(self.connect.call_count, 2)
+        self.assertEqual(self.pool.stats()['timeouts'], 1)
+
+    # Test health checks and discarding broken connections
+    def test_health_check_and_discard(self):
+        """
+        Test that a stale connection failing its health check is replaced, and that a connection is
+        discarded after a database error.
+        """
+        self.pool.health_check_after = 0  # Check every connection before reuse
+        with self.pool.connection() as stale:
+            pass
+        stale.cursor.return_value.execute.side_effect = Exception("Connection reset")
+        with self.pool.connection() as replacement:
+            self.assertIsNot(replacement, stale)
+        stale.close.assert_called_once()
+        self.assertEqual(self.pool.stats()['failed_health_checks'], 1)
+
+        with self.assertRaises(pyodbc.Error):
+            with self.pool.connection() as broken:
+                raise pyodbc.Error("Communication link failure")
+        broken.close.assert_called_once()
+        self.assertEqual(self.pool.stats()['idle'], 0)
+
+    # Test idle eviction
+    def test_idle_eviction(self):
+        """
+        Test that connections idle for longer than max_idle_seconds are closed.
+        """
+        self.pool.max_idle_seconds = 0
+        with self.pool.connection() as conn:
+            pass
+        conn.close.assert_called_once()
+        self.assertEqual(self.pool.stats()['evicted_idle'], 1)
+
+    # Test a connect function that fails
+    def test_failed_connect(self):
+        """
+        Test that a connect function returning None yields None without using up a slot.
+        """
+        pool = ConnectionPool(lambda: None, "failing", max_size=1)
+        with pool.connection() as conn:
+            self.assertIsNone(conn)
+        self.assertEqual(pool.stats()['in_use'], 0)
+
+    # Test the process-wide pool registry
+    def test_registry(self):
+        """
+        Test that pools are shared by name and reported by pool_stats.
+        """
+        pool = get_pool('sql', self.connect)
+        self.assertIs(get_pool('sql', MagicMock()), pool)
+        self.assertEqual(pool_stats()['sql']['max_size'], pool.max_size)
+
+if __name__ == "__main__":
+    unittest.main()
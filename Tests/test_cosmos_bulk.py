@@ -0,0 +1,142 @@
+import asyncio
+import time
+import unittest
+from azure.cosmos import exceptions
+from Database.cosmos_bulk import bulk_write_bookings, write_documents_async
+
+class InMemoryAsyncContainer:
+    """
+    azure.cosmos.aio container stand-in holding documents in a dictionary, with a fixed latency per request.
+    """
+
+    def __init__(self, latency=0.0, partition_key='booking_id', fail_ids=()):
+        self.latency = latency
+        self.partition_key = partition_key
+        self.fail_ids = set(fail_ids)
+        self.items = {}
+        self.requests = 0
+        self.batches = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _request(self):
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+
+    def _check(self, body, overwrite):
+        if body['id'] in self.fail_ids:
+            raise exceptions.CosmosHttpResponseError(status_code=503, message="Service unavailable")
+        key = (body[self.partition_key], body['id'])
+        if not overwrite and key in self.items:
+            raise exceptions.CosmosResourceExistsError(status_code=409, message="Conflict")
+        return key
+
+    def query_items(self, query, parameters, partition_key):
+        async def results():
+            await self._request()
+            for key, body in list(self.items.items()):
+                if key[0] == partition_key:
+                    yield body['id']
+        return results()
+
+    async def create_item(self, body):
+        await self._request()
+        self.items[self._check(body, False)] = dict(body)
+
+    async def upsert_item(self, body):
+        await self._request()
+        self.items[self._check(body, True)] = dict(body)
+
+    async def execute_item_batch(self, batch_operations, partition_key):
+        await self._request()
+        self.batches += 1
+        # All or nothing: check every operation before applying any
+        keys = [self._check(args[0], operation == 'upsert') for operation, args in batch_operations]
+        for key, (_, args) in zip(keys, batch_operations):
+            self.items[key] = dict(args[0])
+
+# Define a test class for the bulk Cosmos DB writer
+class TestCosmosBulkWriter(unittest.TestCase):
+    """
+    Test class for testing the concurrent bulk writer for Cosmos DB.
+
+    This class verifies the per-document report, grouping by partition key into transactional
+    batches, the bound on requests in flight, and the gain over writing one document at a time.
+    """
+
+    # Test the per-booking report
+    def test_report(self):
+        """
+        Test that every booking gets an outcome in input order: created, already stored, or failed.
+        """
+        container = InMemoryAsyncContainer(fail_ids={'3'})
+        bulk_write_bookings([{'booking_id': 1}], container=container)
+        reports = bulk_write_bookings([{'booking_id': 1}, {'booking_id': 2}, {'booking_id': 3}], container=container)
+        self.assertEqual([(report['booking_id'], report['status']) for report in reports],
+                         [(1, 'exists'), (2, 'created'), (3, 'failed')])
+        self.assertIn('503', reports[2]['error'])
+        self.assertEqual(sorted(container.items), [(1, '1'), (2, '2')])
+
+        reports = bulk_write_bookings([{'booking_id': 1, 'campsite_id': 9}], container=container, mode='upsert')
+        self.assertEqual(reports[0]['status'], 'upserted')
+        self.assertEqual(container.items[(1, '1')]['campsite_id'], 9)
+
+    # Test the query mode for containers holding documents with random ids
+    def test_query_mode(self):
+        """
+        Test that by default a booking stored under a random id is found by its query and not written again,
+        while the create mode would store it a second time.
+        """
+        container = InMemoryAsyncContainer()
+        container.items[(1, '0b6f8c4e-legacy')] = {'id': '0b6f8c4e-legacy', 'booking_id': 1}
+        reports = bulk_write_bookings([{'booking_id': 1}, {'booking_id': 2}, {'booking_id': 2}], container=container)
+        self.assertEqual([report['status'] for report in reports], ['exists', 'created', 'exists'])
+        self.assertEqual(container.batches, 0, "The query mode writes documents singly.")
+        self.assertEqual(sorted(container.items), [(1, '0b6f8c4e-legacy'), (2, '2')])
+
+        bulk_write_bookings([{'booking_id': 1}], container=container, mode='create')
+        self.assertIn((1, '1'), container.items, "The create mode cannot see documents with random ids.")
+
+    # Test transactional batches for documents sharing a partition key
+    def test_partition_batches(self):
+        """
+        Test that documents sharing a partition key are written in batches, and that a failed batch falls back to single writes.
+        """
+        container = InMemoryAsyncContainer(partition_key='campground_id')
+        documents = [{'id': str(index), 'campground_id': index % 2} for index in range(250)]
+        reports = asyncio.run(write_documents_async(container, documents, partition_key='campground_id', mode='create'))
+        self.assertTrue(all(report['status'] == 'created' for report in reports))
+        self.assertEqual(container.batches, 4, "125 documents per partition key should take two batches each.")
+        self.assertEqual(len(container.items), 250)
+
+        # One existing document rolls its batch back; the others are then written singly
+        documents = [{'id': '0', 'campground_id': 0}, {'id': 'new', 'campground_id': 0}]
+        reports = asyncio.run(write_documents_async(container, documents, partition_key='campground_id', mode='create'))
+        self.assertEqual([report['status'] for report in reports], ['exists', 'created'])
+
+    # Test the concurrency bound and the throughput gain
+    def test_concurrency(self):
+        """
+        Test that no more than max_concurrency requests are in flight, and that concurrent writes beat sequential ones.
+        """
+        latency, count = 0.02, 50
+        container = InMemoryAsyncContainer(latency=latency)
+        started = time.perf_counter()
+        bulk_write_bookings([{'booking_id': booking_id} for booking_id in range(1, count + 1)], container=container,
+                            max_concurrency=10, mode='create')
+        elapsed = time.perf_counter() - started
+        self.assertEqual(container.max_in_flight, 10)
+        self.assertEqual(container.requests, count)
+        self.assertEqual(container.batches, 0, "Bookings are partitioned by booking_id, so none share a batch.")
+        self.assertLess(elapsed, latency * count / 2, "Concurrent writes should take a fraction of sequential time.")
+
+        with self.assertRaises(ValueError):
+            bulk_write_bookings([{'booking_id': 1}], container=container, mode='merge')
+
+if __name__ == "__main__":
+    unittest.main()
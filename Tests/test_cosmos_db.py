@@ -1,6 +1,14 @@
+import base64
+import os
+import shutil
+import tempfile
 import unittest
-from unittest.mock import MagicMock
-from Database.cosmos_db import connect_to_cosmos, insert_booking_to_cosmos
+from unittest.mock import MagicMock, patch
+from azure.cosmos import exceptions
+from Database.blob_store import FileSystemBlobStore
+from Database.cosmos_db import (connect_to_cosmos, get_booking_write_mode, get_cosmos_client, insert_booking_to_cosmos,
+                                iter_cosmos_booking_pages, migrate_booking_ids, open_pdf_document, read_booking_from_cosmos,
+                                reset_cosmos_client, upsert_booking_pdf_to_cosmos)
 
 # Define a test class for the Cosmos DB interactions
 class TestCosmosDB(unittest.TestCase):
@@ -39,5 +47,186 @@ class TestCosmosDB(unittest.TestCase):
         # Assert that the create_item method was called with the correct booking data
         self.container.create_item.assert_called_with(booking_data)
 
+    # Test that bookings are written with a deterministic id and no query
+    def test_insert_booking_idempotent(self):
+        """
+        Test that a booking is created under an id derived from its booking_id without querying first,
+        and that a conflict from an earlier run is treated as the booking already being stored.
+        """
+        booking_data = {'booking_id': 42}
+        insert_booking_to_cosmos(self.container, booking_data, mode='create')
+        self.assertEqual(booking_data['id'], '42')
+        self.container.query_items.assert_not_called()
+
+        self.container.create_item.side_effect = exceptions.CosmosResourceExistsError(status_code=409, message="Conflict")
+        self.assertTrue(insert_booking_to_cosmos(self.container, {'booking_id': 42}, mode='create'))
+        self.assertEqual(self.container.create_item.call_count, 2)
+
+        insert_booking_to_cosmos(self.container, {'booking_id': 42}, mode='upsert')
+        self.container.upsert_item.assert_called_once_with({'booking_id': 42, 'id': '42'})
+        with self.assertRaises(ValueError):
+            insert_booking_to_cosmos(self.container, {'booking_id': 42}, mode='merge')
+
+    # Test the query-then-create mode, the default until the container is migrated
+    def test_insert_booking_query_mode(self):
+        """
+        Test that the default query mode skips bookings found by the query, and that the configuration
+        can switch to the create mode.
+        """
+        self.container.query_items.return_value = [{'booking_id': 1}]
+        self.assertTrue(insert_booking_to_cosmos(self.container, {'booking_id': 1}))
+        self.container.create_item.assert_not_called()
+
+        # Bookings the query does not find are created under their deterministic id, ready for the create mode
+        self.container.query_items.return_value = []
+        self.assertTrue(insert_booking_to_cosmos(self.container, {'booking_id': 2}))
+        self.container.create_item.assert_called_once_with({'booking_id': 2, 'id': '2'})
+
+        with patch('Database.cosmos_db.load_config', return_value={'cosmos_db': {'booking_write_mode': 'create'}}):
+            self.assertEqual(get_booking_write_mode(), 'create')
+            insert_booking_to_cosmos(self.container, {'booking_id': 3})
+        self.assertEqual(self.container.query_items.call_count, 2, "The create mode should not query.")
+
+    # Test point reads of bookings
+    def test_read_booking(self):
+        """
+        Test that a booking is read by id and partition key, and that a missing booking reads as None.
+        """
+        self.container.read_item.return_value = {'id': '7', 'booking_id': 7}
+        self.assertEqual(read_booking_from_cosmos(self.container, 7), {'id': '7', 'booking_id': 7})
+        self.container.read_item.assert_called_with(item='7', partition_key=7)
+        self.container.read_item.side_effect = exceptions.CosmosResourceNotFoundError(status_code=404, message="Not found")
+        self.assertIsNone(read_booking_from_cosmos(self.container, 8))
+
+    # Test re-keying documents with random ids
+    def test_migrate_booking_ids(self):
+        """
+        Test that documents are upserted under their booking_id, without system properties, before the old one is deleted.
+        """
+        self.container.query_items.return_value = [
+            {'id': 'a1b2', 'booking_id': 5, 'campsite_id': 3, '_rid': 'x', '_etag': 'y', '_ts': 1},
+            {'id': 'c3d4', 'booking_id': 6},
+        ]
+        self.container.delete_item.side_effect = [None, exceptions.CosmosHttpResponseError(status_code=503, message="Busy")]
+        self.assertEqual(migrate_booking_ids(self.container), {'migrated': 1, 'failed': 1})
+        self.container.upsert_item.assert_any_call({'id': '5', 'booking_id': 5, 'campsite_id': 3})
+        self.container.delete_item.assert_any_call(item='a1b2', partition_key=5)
+
+    # Test reading bookings page by page
+    def test_booking_pages(self):
+        """
+        Test that bookings are read as projected pages with continuation tokens, skipping empty pages that have more to follow.
+        """
+        pager = FakePager([([{'booking_id': 1}, {'booking_id': 2}], 'token-1'), ([], 'token-2'),
+                           ([{'booking_id': 3}], None)])
+        self.container.query_items.return_value.by_page.return_value = pager
+
+        pages = iter_cosmos_booking_pages(self.container, page_size=2, continuation_token='token-0', fields=('booking_id', 'total_cost'))
+        self.assertEqual(next(pages), ([{'booking_id': 1}, {'booking_id': 2}], 'token-1'))
+        self.assertEqual(pager.pages_read, 1, "Pages should be read only as they are consumed.")
+        self.assertEqual(list(pages), [([{'booking_id': 3}], None)])
+
+        _, kwargs = self.container.query_items.call_args
+        self.assertEqual(kwargs['query'], "SELECT c.booking_id, c.total_cost FROM c")
+        self.assertEqual(kwargs['max_item_count'], 2)
+        self.container.query_items.return_value.by_page.assert_called_with('token-0')
+
+        # An expired token ends the pages instead of raising
+        self.container.query_items.return_value.by_page.side_effect = exceptions.CosmosHttpResponseError(status_code=400, message="Bad token")
+        self.assertEqual(list(iter_cosmos_booking_pages(self.container, continuation_token='expired')), [])
+
+    # Test that PDFs are kept in the blob store with a reference in Cosmos DB
+    def test_pdf_reference(self):
+        """
+        Test that a confirmation PDF is stored in the blob store, that the Cosmos DB document only holds
+        its reference, and that both referenced and older inline PDFs open.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        store = FileSystemBlobStore(os.path.join(directory, 'blobs'))
+        pdf_path = os.path.join(directory, 'confirmation_7.pdf')
+        with open(pdf_path, 'wb') as pdf_file:
+            pdf_file.write(b"%PDF-1.3 booking 7")
+
+        upsert_booking_pdf_to_cosmos(self.container, pdf_path, 7, blob_store=store)
+        document = self.container.upsert_item.call_args.kwargs['body']
+        self.assertEqual((document['id'], document['pdf_id'], document['filename']), ('7', '7', 'confirmation_7.pdf'))
+        self.assertNotIn('pdf_data', document)
+        self.assertEqual(document['blob']['size'], 18)
+        with open_pdf_document(document, blob_store=store) as pdf_file:
+            self.assertEqual(pdf_file.read(), b"%PDF-1.3 booking 7")
+
+        inline = {'id': '8', 'pdf_data': base64.b64encode(b"%PDF-1.3 booking 8").decode('utf-8')}
+        self.assertEqual(open_pdf_document(inline, blob_store=store).read(), b"%PDF-1.3 booking 8")
+        with self.assertRaises(ValueError):
+            open_pdf_document({'id': '9'}, blob_store=store)
+
+class FakePager:
+    """
+    Stand-in for the page iterator of a Cosmos DB query, with the continuation token of the last page read.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.pages_read = 0
+        self.continuation_token = None
+
+    def __iter__(self):
+        for items, token in self.pages:
+            self.pages_read += 1
+            self.continuation_token = token
+            yield iter(items)
+
+# Define a test class for the shared Cosmos DB client
+class TestCosmosClientCache(unittest.TestCase):
+    """
+    Test class for testing the process-wide Cosmos DB client and its container cache.
+
+    This class verifies that one client is built per process and settings, and that container
+    clients are looked up by name instead of being rebuilt on every call.
+    """
+
+    def setUp(self):
+        """
+        Patch the client class and the configuration, and start without a shared client.
+        """
+        self.settings = {'cosmos_db': {'endpoint': 'https://example', 'key': 'key', 'database_name': 'CampgroundDB'}}
+        patcher = patch('Database.cosmos_db.CosmosClient')
+        self.client_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = patch('Database.cosmos_db.load_config', side_effect=lambda: self.settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        reset_cosmos_client()
+        self.addCleanup(reset_cosmos_client)
+
+    # Test that the client and containers are reused
+    def test_client_shared(self):
+        """
+        Test that repeated connections reuse one client and one container client per name.
+        """
+        bookings = connect_to_cosmos("Bookings")
+        self.assertIs(connect_to_cosmos("Bookings"), bookings)
+        connect_to_cosmos("PDFs")
+        self.client_class.assert_called_once_with('https://example', 'key')
+        database = self.client_class.return_value.get_database_client
+        self.assertEqual(database.return_value.get_container_client.call_count, 2)
+        database.assert_called_with('CampgroundDB')
+        self.assertIs(get_cosmos_client(), self.client_class.return_value)
+
+    # Test that the client is rebuilt when needed
+    def test_client_rebuilt(self):
+        """
+        Test that a new client is built when the settings change and in a forked process.
+        """
+        connect_to_cosmos("Bookings")
+        self.settings = {'cosmos_db': {'endpoint': 'https://other', 'key': 'key', 'database_name': 'CampgroundDB'}}
+        connect_to_cosmos("Bookings")
+        self.assertEqual(self.client_class.call_count, 2)
+        with patch('Database.cosmos_db.os.getpid', return_value=-1):
+            connect_to_cosmos("Bookings")
+            connect_to_cosmos("Bookings")
+        self.assertEqual(self.client_class.call_count, 3, "A forked process should build its own client once.")
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,5 +1,14 @@
+import os
+import shutil
+import sqlite3
+import tempfile
 import unittest
-from Database.head_office_db import connect_to_head_office
+from datetime import datetime
+from unittest.mock import MagicMock
+import pyodbc
+from Database.connection_pool import ConnectionPool
+from Database.head_office_db import (connect_to_head_office, fetch_bookings, fetch_bookings_parallel,
+                                     stream_booking_batches, update_booking_campgrounds)
 
 # Define a test class for the Head Office SQL database connection
 class TestHeadOfficeDatabase(unittest.TestCase):
@@ -26,5 +35,176 @@ class TestHeadOfficeDatabase(unittest.TestCase):
         if conn:
             conn.close()
 
+# Define a test class for incremental booking fetches
+class TestIncrementalFetch(unittest.TestCase):
+    """
+    Test class for testing that fetches after a checkpoint only ask for newer bookings.
+    """
+
+    # Test the query sent with and without a high-water mark
+    def test_fetch_after_booking_id(self):
+        """
+        Test that fetch_bookings filters on booking_id only when a high-water mark is given.
+        """
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.fetchall.return_value = []
+
+        fetch_bookings(conn, campground_id=1)
+        query, params = cursor.execute.call_args.args
+        self.assertNotIn("b.booking_id >", query)
+        self.assertEqual(params, (1,))
+
+        fetch_bookings(conn, campground_id=1, after_booking_id=250)
+        query, params = cursor.execute.call_args.args
+        self.assertIn("b.booking_id > ?", query)
+        self.assertEqual(params, (1, 250))
+
+# Define a test class for streaming bookings from the Head Office database
+class TestStreamBookingBatches(unittest.TestCase):
+    """
+    Test class for testing the batched booking stream with a mocked cursor.
+
+    This class verifies that rows are fetched with fetchmany in batches of the requested size, with and
+    without the prefetch thread, and that a failed fetch ends the stream after the batches already read.
+    """
+
+    def setUp(self):
+        """
+        Set up a mocked connection whose cursor returns five rows in batches of two.
+        """
+        rows = [(booking_id, 100 + booking_id, datetime(2024, 8, 1), datetime(2024, 9, 7), 1, 'Small', 1, "Customer")
+                for booking_id in range(1, 6)]
+        self.cursor = MagicMock()
+        self.cursor.fetchmany.side_effect = [rows[0:2], rows[2:4], rows[4:], []]
+        self.conn = MagicMock()
+        self.conn.cursor.return_value = self.cursor
+
+    # Test the stream with and without the prefetch thread
+    def test_stream_batches(self):
+        """
+        Test that the stream yields Booking objects in fetchmany batches.
+        """
+        for prefetch in (0, 2):
+            self.setUp()
+            batches = list(stream_booking_batches(self.conn, campground_id=1, arraysize=2, prefetch=prefetch))
+            self.assertEqual([[booking.booking_id for booking in batch] for batch in batches], [[1, 2], [3, 4], [5]])
+            self.assertEqual(self.cursor.arraysize, 2, "The cursor arraysize should be set to the batch size.")
+            self.cursor.fetchmany.assert_called_with(2)
+
+    # Test a fetch error part way through the stream
+    def test_stream_fetch_error(self):
+        """
+        Test that a fetch error ends the stream after the batches already fetched.
+        """
+        self.cursor.fetchmany.side_effect = [self.cursor.fetchmany.side_effect.__next__(), pyodbc.Error("lost")]
+        batches = list(stream_booking_batches(self.conn, arraysize=2))
+        self.assertEqual([[booking.booking_id for booking in batch] for batch in batches], [[1, 2]])
+
+# Define a test class for the bulk write-back of campground updates
+class TestBulkWriteBack(unittest.TestCase):
+    """
+    Test class for testing that campground updates are written back in one bulk transaction.
+    """
+
+    # Test a successful write-back
+    def test_write_back(self):
+        """
+        Test that the updates are loaded with one fast executemany, applied with one UPDATE and committed once.
+        """
+        conn = MagicMock()
+        cursor = conn.cursor.return_value
+        cursor.rowcount = 2
+
+        result = update_booking_campgrounds(conn, [(7, 1121132), (9, 1121132), (7, 1121132)])
+
+        self.assertTrue(cursor.fast_executemany, "Parameter rows should be sent in bulk.")
+        cursor.executemany.assert_called_once()
+        self.assertEqual(cursor.executemany.call_args.args[1], [(7, 1121132), (9, 1121132)],
+                         "Each booking should be updated once.")
+        conn.commit.assert_called_once()
+        self.assertEqual((result['requested'], result['rows_affected']), (2, 2))
+
+    # Test a failed write-back
+    def test_write_back_failure(self):
+        """
+        Test that a failed write-back is rolled back and reports no rows affected.
+        """
+        conn = MagicMock()
+        conn.cursor.return_value.executemany.side_effect = pyodbc.Error("deadlock")
+
+        result = update_booking_campgrounds(conn, [(7, 1121132)])
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+        self.assertEqual(result['rows_affected'], 0)
+        self.assertEqual(update_booking_campgrounds(conn, [])['requested'], 0)
+
+# Define a test class for parallel keyset-partitioned extraction
+class TestParallelExtraction(unittest.TestCase):
+    """
+    Test class for testing parallel extraction against a local SQLite copy of the camping tables.
+
+    This class verifies that the key ranges, read page by page on separate pooled connections, merge
+    into every booking of the campground exactly once and in booking_id order.
+    """
+
+    def setUp(self):
+        """
+        Create a SQLite database with 103 bookings over two campgrounds, with gaps in the booking_ids.
+        """
+        self.temp_dir = tempfile.mkdtemp()
+        path = os.path.join(self.temp_dir, 'camping.db')
+
+        def connect():
+            conn = sqlite3.connect(':memory:', check_same_thread=False)
+            conn.execute("ATTACH DATABASE ? AS camping", (path,))
+            conn.create_function('CONCAT', -1, lambda *parts: ''.join(parts))
+            return conn
+
+        conn = connect()
+        conn.execute("CREATE TABLE camping.customers (customer_id INTEGER PRIMARY KEY, first_name TEXT, last_name TEXT)")
+        conn.execute("CREATE TABLE camping.booking (booking_id INTEGER PRIMARY KEY, customer_id INT, booking_date TEXT, "
+                     "arrival_date TEXT, campground_id INT, campsite_size TEXT, num_campsites INT)")
+        conn.execute("INSERT INTO camping.customers VALUES (1, 'Jane', 'Doe')")
+        conn.executemany("INSERT INTO camping.booking VALUES (?, 1, '2024-08-01', '2024-09-07', ?, 'Small', 1)",
+                         [(booking_id, 2 if booking_id % 10 == 0 else 1) for booking_id in range(1, 115) if booking_id % 7])
+        conn.commit()
+        conn.close()
+        self.pool = ConnectionPool(connect, "extract", max_size=4)
+
+    def tearDown(self):
+        """
+        Close the pooled connections and remove the database.
+        """
+        self.pool.close_all()
+        shutil.rmtree(self.temp_dir)
+
+    # Test that the merged ranges hold every booking once, in order
+    def test_parallel_fetch(self):
+        """
+        Test parallel extraction with pages smaller than a range, and after a checkpoint.
+        """
+        expected = [booking_id for booking_id in range(1, 115) if booking_id % 7 and booking_id % 10]
+        rows = fetch_bookings_parallel(self.pool, 1, parallelism=4, page_size=6, dialect='sqlite')
+        self.assertEqual([row[0] for row in rows], expected)
+        self.assertEqual(rows[0][7], "Jane Doe")
+        self.assertEqual(self.pool.stats()['in_use'], 0, "Every range connection should be returned to the pool.")
+
+        rows = fetch_bookings_parallel(self.pool, 1, parallelism=3, after_booking_id=50, page_size=6, dialect='sqlite')
+        self.assertEqual([row[0] for row in rows], [booking_id for booking_id in expected if booking_id > 50])
+        self.assertEqual(fetch_bookings_parallel(self.pool, 3, dialect='sqlite'), [])
+
+    # Test that a failed extraction discards its connections
+    def test_parallel_fetch_error(self):
+        """
+        Test that a database error returns no rows and closes the connection instead of pooling it.
+        """
+        with self.pool.connection() as conn:
+            conn.execute("DROP TABLE camping.booking")
+        self.assertEqual(fetch_bookings_parallel(self.pool, 1, dialect='sqlite'), [])
+        stats = self.pool.stats()
+        self.assertEqual((stats['in_use'], stats['idle'], stats['discarded']), (0, 0, 1))
+
 if __name__ == "__main__":
     unittest.main()
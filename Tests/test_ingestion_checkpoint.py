@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+from Utils.ingestion_checkpoint import (DEFAULT_CHECKPOINT_DIR, advance_checkpoint, checkpoint_path, load_checkpoint,
+                                       save_checkpoint)
+
+# Define a test class for the Head Office ingestion checkpoints
+class TestIngestionCheckpoint(unittest.TestCase):
+    """
+    Test class for testing the per-campground high-water marks used for incremental ingestion.
+
+    This class verifies that checkpoints are saved and read back per campground, and that a missing
+    or unreadable checkpoint falls back to a full sync.
+    """
+
+    def setUp(self):
+        """
+        Create a temporary checkpoint directory.
+        """
+        self.checkpoint_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Remove the temporary checkpoint directory.
+        """
+        shutil.rmtree(self.checkpoint_dir)
+
+    # Test saving and loading checkpoints
+    def test_round_trip(self):
+        """
+        Test that each campground keeps its own last booking_id.
+        """
+        self.assertIsNone(load_checkpoint(1, self.checkpoint_dir), "A campground without a checkpoint needs a full sync.")
+        save_checkpoint(1, 250, self.checkpoint_dir)
+        save_checkpoint(2, 40, self.checkpoint_dir)
+        save_checkpoint(1, 310, self.checkpoint_dir)
+        self.assertEqual(load_checkpoint(1, self.checkpoint_dir), 310)
+        self.assertEqual(load_checkpoint(2, self.checkpoint_dir), 40)
+        self.assertFalse(os.path.exists(checkpoint_path(1, self.checkpoint_dir) + ".tmp"))
+
+    # Test an unreadable checkpoint
+    def test_corrupt_checkpoint(self):
+        """
+        Test that an unreadable checkpoint is treated as missing.
+        """
+        with open(checkpoint_path(3, self.checkpoint_dir), 'w') as file:
+            file.write("{not json")
+        self.assertIsNone(load_checkpoint(3, self.checkpoint_dir))
+
+    # Test that the checkpoint never passes a booking that failed to store
+    def test_advance_checkpoint(self):
+        """
+        Test that the checkpoint stops before the first booking that failed to store, and passes the rest.
+        """
+        self.assertEqual(advance_checkpoint(None, [3, 1, 2], []), (3, False))
+        self.assertEqual(advance_checkpoint(3, [4, 5, 6, 7], [6]), (5, True), "Booking 6 must be fetched again.")
+        self.assertEqual(advance_checkpoint(None, [1, 2], [1]), (None, True))
+        self.assertEqual(advance_checkpoint(8, [], []), (8, False))
+
+        save_checkpoint(4, None, self.checkpoint_dir)
+        self.assertIsNone(load_checkpoint(4, self.checkpoint_dir), "A reset checkpoint should fetch every booking.")
+
+    # Test the default checkpoint directory
+    def test_default_directory(self):
+        """
+        Test that the default checkpoint directory does not depend on the working directory.
+        """
+        self.assertTrue(os.path.isabs(DEFAULT_CHECKPOINT_DIR))
+        self.assertEqual(os.path.basename(os.path.dirname(DEFAULT_CHECKPOINT_DIR)), 'Logs')
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,15 @@
+import os
+import shutil
+import sqlite3
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from unittest.mock import patch, MagicMock
 import main  
+from Database.connection_pool import close_all_pools
+from Utils.campsite_manager import initialize_campsites
+from Utils.ingestion_checkpoint import load_checkpoint
 
 # Define a test class for the main application flow
 class TestMainFlow(unittest.TestCase):
@@ -37,5 +46,117 @@ class TestMainFlow(unittest.TestCase):
         mock_connect_to_cosmos.assert_called_once()
         mock_fetch_bookings.assert_called_once()
 
+    def tearDown(self):
+        """
+        Remove the summary PDF written by the main flow and forget the pooled mock connections.
+        """
+        close_all_pools()
+        summary_filename = os.path.join("pdfs", f"summary_1121132_{datetime.now().date()}.pdf")
+        if os.path.exists(summary_filename):
+            os.remove(summary_filename)
+
+    @patch('main.ProcessPoolExecutor', ThreadPoolExecutor)
+    @patch('main.process_campground')
+    def test_run_campgrounds(self, mock_process_campground):
+        """
+        Test the multi-campground runner by replacing the worker with a mock.
+
+        This test ensures that every campground is processed once with its own ID and that the
+        per-campground summaries, including a failed campground, are merged into one report.
+        """
+        def fake_campground(campground_id, *args):
+            if campground_id == 3:
+                return None  # Simulate a campground whose processing failed
+            return {'total_sales': 100 * campground_id, 'total_bookings': 4,
+                    'successful_allocations': 3, 'failed_allocations': 1}
+        mock_process_campground.side_effect = fake_campground
+
+        report = main.run_campgrounds([1, 2, 3], max_workers=2)
+
+        self.assertEqual(sorted(call.args[0] for call in mock_process_campground.call_args_list), [1, 2, 3])
+        self.assertEqual(sorted(report['campgrounds']), [1, 2])
+        self.assertEqual(report['failed_campgrounds'], [3])
+        self.assertEqual(report['total_sales'], 300)
+        self.assertEqual(report['successful_allocations'], 6)
+
+    @patch('main.create_and_insert_summary')
+    @patch('main.warm_start_campsites')
+    @patch('main.process_bookings')
+    @patch('main.connect_to_sql')
+    @patch('main.connect_to_head_office')
+    @patch('main.connect_to_cosmos')
+    @patch('main.fetch_bookings')
+    def test_incremental_ingestion(self, mock_fetch_bookings, mock_connect_to_cosmos, mock_connect_to_head_office,
+                                   mock_connect_to_sql, mock_process_bookings, mock_warm_start_campsites,
+                                   mock_create_and_insert_summary):
+        """
+        Test that an incremental run only fetches bookings after the checkpoint, that the checkpoint stops
+        before a booking that failed to store but passes one rejected for lack of campsites, and that runs
+        without stored allocations fetch every booking.
+        """
+        checkpoint_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, checkpoint_dir)
+        records = lambda booking_ids: [
+            (booking_id, 100 + booking_id, datetime(2024, 8, 1), datetime(2024, 9, 7), 1, 'Small', 1, "Customer")
+            for booking_id in booking_ids
+        ]
+        stored_allocations = {}
+        mock_warm_start_campsites.side_effect = lambda *args, **kwargs: (initialize_campsites(), dict(stored_allocations))
+        run = lambda **options: main.process_campground(display=False, checkpoint_dir=checkpoint_dir, **options)
+
+        # Booking 8 fails to store, so the checkpoint stays before it
+        mock_fetch_bookings.return_value = records((7, 8, 9))
+        mock_process_bookings.return_value = ([7, 9], [8])
+        run(incremental=True)
+        self.assertIsNone(mock_fetch_bookings.call_args.args[2], "The first run should fetch every booking.")
+        self.assertEqual(load_checkpoint(1121132, checkpoint_dir), 7)
+
+        # The next run fetches booking 8 again; booking 9 is restored from its stored allocation
+        stored_allocations.update((booking_id, {'booking_id': booking_id, 'campsite_id': 1, 'campsite_allocations': [1],
+                                                'total_cost': 350}) for booking_id in (7, 9))
+        mock_fetch_bookings.return_value = records((8, 9))
+        mock_process_bookings.return_value = ([8], [])
+        run(incremental=True)
+        self.assertEqual(mock_fetch_bookings.call_args.args[2], 7, "The second run should start after booking 7.")
+        self.assertEqual([booking.booking_id for booking in mock_process_bookings.call_args.args[0]], [8])
+        self.assertEqual(load_checkpoint(1121132, checkpoint_dir), 9)
+
+        # Booking 10 finds no free campsite; the checkpoint still moves past it to the stored bookings after it
+        mock_fetch_bookings.return_value = records((10, 11, 12))
+        mock_process_bookings.return_value = ([11, 12], [])
+        run(incremental=True)
+        self.assertEqual(mock_fetch_bookings.call_args.args[2], 9)
+        self.assertEqual(load_checkpoint(1121132, checkpoint_dir), 12, "A capacity rejection should not hold the checkpoint.")
+
+        # Full re-syncs are the default, and runs without warm-started allocations cannot be incremental
+        mock_fetch_bookings.return_value = []
+        run()
+        self.assertIsNone(mock_fetch_bookings.call_args.args[2], "A full re-sync should fetch every booking.")
+        run(incremental=True, warm_start=False)
+        self.assertIsNone(mock_fetch_bookings.call_args.args[2], "A cold start should fetch every booking.")
+        stored_allocations.clear()
+        run(incremental=True)
+        self.assertIsNone(mock_fetch_bookings.call_args.args[2], "A run without stored allocations should fetch every booking.")
+        self.assertEqual(load_checkpoint(1121132, checkpoint_dir), 12, "Runs that fetch nothing should keep the checkpoint.")
+
+    @patch('main.connect_to_sql')
+    @patch('main.connect_to_head_office')
+    @patch('main.connect_to_cosmos')
+    @patch('main.fetch_bookings_parallel', return_value=[])
+    def test_parallel_extraction_pools(self, mock_fetch_bookings_parallel, mock_connect_to_cosmos,
+                                       mock_connect_to_head_office, mock_connect_to_sql):
+        """
+        Test that each parallelism gets an extraction pool of its own size, and that the run's connections
+        are closed rather than pooled after a database error.
+        """
+        for parallel in (2, 4):
+            main.process_campground(warm_start=False, display=False, parallel=parallel)
+            self.assertEqual(mock_fetch_bookings_parallel.call_args.args[0].max_size, parallel)
+
+        mock_fetch_bookings_parallel.side_effect = sqlite3.OperationalError("database is locked")
+        self.assertIsNone(main.process_campground(warm_start=False, display=False, parallel=2))
+        stats = main.get_pool('head_office', mock_connect_to_head_office).stats()
+        self.assertEqual((stats['idle'], stats['discarded']), (0, 1))
+
 if __name__ == "__main__":
     unittest.main()
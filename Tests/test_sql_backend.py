@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import date
+from unittest.mock import patch
+from Database.connection_pool import close_all_pools
+from Database.head_office_db import fetch_bookings, stream_booking_batches, update_booking_campgrounds
+from Database.sql_backend import (DEFAULT_SQLITE_DIR, PROJECT_ROOT, OdbcBackend, SqliteBackend, get_sql_backend,
+                                  set_sql_backend)
+from Database.sql_db import connect_to_sql
+from Models.summary import Summary
+from Utils.summary_manager import insert_summary_into_databases
+
+# Define a test class for the local SQLite backend
+class TestSqliteBackend(unittest.TestCase):
+    """
+    Test class for testing the SQLite backend used for offline load testing.
+
+    This class verifies that the camping schema is created from Assets/sql, that synthetic bookings
+    load and read back through the Head Office functions, and that the backend is chosen by config.
+    """
+
+    def setUp(self):
+        """
+        Create a SQLite backend in a temporary directory.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.backend = SqliteBackend(self.directory)
+
+    def tearDown(self):
+        """
+        Go back to the configured backend, close pooled connections and remove the databases.
+        """
+        set_sql_backend(None)
+        close_all_pools()
+        shutil.rmtree(self.directory)
+
+    # Test loading and reading synthetic bookings
+    def test_synthetic_bookings(self):
+        """
+        Test that synthetic bookings are appended after the existing ones and read back in booking_id order.
+        """
+        self.assertEqual(self.backend.load_synthetic_bookings(250, chunk_size=100), (1, 250))
+        self.assertEqual(self.backend.load_synthetic_bookings(50, campground_id=2), (251, 300))
+
+        conn = self.backend.connect_head_office()
+        rows = fetch_bookings(conn, 1)
+        self.assertEqual([row[0] for row in rows], list(range(1, 251)))
+        self.assertTrue(rows[0][7].startswith("First"), "Customer names should be concatenated.")
+        streamed = [booking.booking_id for batch in stream_booking_batches(conn, 2, arraysize=20) for booking in batch]
+        self.assertEqual(streamed, list(range(251, 301)))
+
+        result = update_booking_campgrounds(conn, [(1, 1121132), (2, 1121132)], self.backend.dialect)
+        self.assertEqual(result['rows_affected'], 2)
+        self.assertEqual(len(fetch_bookings(conn, 1121132)), 2)
+        conn.close()
+
+    # Test selecting the backend
+    def test_backend_selection(self):
+        """
+        Test that the configuration selects the backend, and that connections and summaries go through it.
+        """
+        with patch('Database.sql_backend.load_config', return_value={}):
+            self.assertIsInstance(get_sql_backend(), OdbcBackend)
+        settings = {'sql_backend': {'type': 'sqlite', 'directory': self.directory}}
+        with patch('Database.sql_backend.load_config', return_value=settings):
+            backend = get_sql_backend()
+            self.assertIsInstance(backend, SqliteBackend)
+            self.assertIs(get_sql_backend(), backend, "The backend should be reused while the settings are unchanged.")
+        with patch('Database.sql_backend.load_config', return_value={'sql_backend': {'type': 'oracle'}}):
+            with self.assertRaises(ValueError):
+                get_sql_backend()
+
+        set_sql_backend(self.backend)
+        summary = Summary(campground_id=1121132, summary_date=date(2026, 1, 3), total_sales=980, total_bookings=2)
+        insert_summary_into_databases(summary, connect_to_sql())
+        conn = self.backend.connect_local()
+        self.assertEqual(conn.execute("SELECT campground_id, total_sales FROM camping.summary").fetchall(), [(1121132, 980)])
+        conn.close()
+
+    # Test the default and relative SQLite directories
+    def test_directory_resolution(self):
+        """
+        Test that the default and relative SQLite directories do not depend on the working directory.
+        """
+        self.assertTrue(os.path.isabs(DEFAULT_SQLITE_DIR))
+        self.assertEqual(SqliteBackend().directory, DEFAULT_SQLITE_DIR)
+        self.assertEqual(SqliteBackend(os.path.join('Logs', 'sqlite')).directory, DEFAULT_SQLITE_DIR)
+        self.assertEqual(SqliteBackend(self.directory).directory, self.directory)
+        self.assertTrue(DEFAULT_SQLITE_DIR.startswith(PROJECT_ROOT))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+from Utils.config_loader import get_sql_query
+from Utils.sql_registry import StatementRegistry, get_statement
+
+# Define a test class for the SQL statement registry
+class TestStatementRegistry(unittest.TestCase):
+    """
+    Test class for testing the SQL statement registry.
+
+    This class verifies that statements are read once with their named placeholders replaced,
+    that parameters bind by name, and that dialect versions fall back to the base statement.
+    """
+
+    def setUp(self):
+        """
+        Create a directory of SQL files with a SQLite version of one statement.
+        """
+        self.directory = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.directory, 'sqlite'))
+        self.write('page.sql', "SELECT TOP (/*page_size*/10) name FROM t WHERE id > /*after_id*/0 AND tag = /*tag*/'a b';")
+        self.write(os.path.join('sqlite', 'page.sql'), "SELECT name FROM t WHERE id > /*after_id*/0 AND tag = /*tag*/'x' LIMIT /*page_size*/10;")
+        self.write('insert.sql', "-- Positional placeholders\nINSERT INTO t VALUES (?, ?);")
+        self.write('notes.txt', "Not a statement")
+
+    def tearDown(self):
+        """
+        Remove the SQL files.
+        """
+        shutil.rmtree(self.directory)
+
+    def write(self, name, text):
+        with open(os.path.join(self.directory, name), 'w') as file:
+            file.write(text)
+
+    # Test placeholder replacement and binding by name
+    def test_named_placeholders(self):
+        """
+        Test that named placeholders become '?' and parameters bind in each dialect's placeholder order.
+        """
+        registry = StatementRegistry(self.directory)
+        self.assertEqual(registry.names(), ['insert', 'page'])
+
+        tsql = registry.get('page')
+        self.assertEqual(tsql.sql, "SELECT TOP (?) name FROM t WHERE id > ? AND tag = ?;")
+        sqlite = registry.get('page', 'sqlite')
+        self.assertEqual(sqlite.sql, "SELECT name FROM t WHERE id > ? AND tag = ? LIMIT ?;")
+
+        values = {'page_size': 50, 'after_id': 7, 'tag': 'b', 'unused': 1}
+        self.assertEqual(tsql.bind(values), (50, 7, 'b'))
+        self.assertEqual(sqlite.bind(values), (7, 'b', 50))
+        with self.assertRaises(KeyError):
+            tsql.bind({'page_size': 50})
+
+    # Test dialect fallback and unknown statements
+    def test_dialect_fallback(self):
+        """
+        Test that a dialect without its own version gets the base statement, and unknown names raise KeyError.
+        """
+        registry = StatementRegistry(self.directory)
+        self.assertIs(registry.get('insert', 'sqlite'), registry.get('insert'))
+        self.assertEqual(registry.get('insert').bind((1, 2)), (1, 2))
+        with self.assertRaises(KeyError):
+            registry.get('missing')
+
+    # Test that statements are read once and shared
+    def test_statements_cached(self):
+        """
+        Test that the Assets/sql statements are handed out as the same objects on every call.
+        """
+        statement = get_statement('fetch_bookings')
+        self.assertIs(get_statement('fetch_bookings'), statement)
+        self.assertIs(get_sql_query('fetch_bookings.sql'), statement.sql, "Every caller should share one statement text.")
+        self.assertEqual(statement.param_names, ('campground_id',))
+        with self.assertRaises(FileNotFoundError):
+            get_sql_query('missing.sql')
+
+if __name__ == "__main__":
+    unittest.main()
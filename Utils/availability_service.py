@@ -0,0 +1,90 @@
+import threading
+from datetime import datetime
+from Models.booking import Booking
+from Models.campsite import week_ordinal
+
+def _weeks_in_mask(mask):
+    """
+    Lists the week ordinals set in a week bitmask.
+
+    :param mask: Integer bitmask with bit n set for week_ordinal n.
+    :return: Generator of week ordinals.
+    """
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+class AvailabilityCalendar:
+    """
+    Precomputed count of free campsites for every size and week.
+
+    The calendar observes its campsites and is updated incrementally whenever a week is booked or
+    released, so lookups are constant-time dictionary reads. `version` changes with every update
+    and can be used to validate cached responses.
+    """
+
+    def __init__(self, campsites):
+        """
+        Builds the calendar from the current occupancy of the campsites and starts observing them.
+
+        :param campsites: CampsiteInventory or list of Campsite objects.
+        """
+        self.site_counts = {}  # Size -> number of campsites of that size
+        self._booked = {}  # (size, week_ordinal) -> number of booked campsites
+        self._lock = threading.Lock()
+        self.version = 0
+        for campsite in campsites:
+            self.site_counts[campsite.size] = self.site_counts.get(campsite.size, 0) + 1
+            for week in _weeks_in_mask(campsite.occupied_weeks):
+                key = (campsite.size, week)
+                self._booked[key] = self._booked.get(key, 0) + 1
+            campsite.observers.append(self._on_change)
+
+    def _on_change(self, campsite, mask, booked):
+        """
+        Updates the counts when a campsite's weeks are booked or released.
+
+        :param campsite: Campsite that changed.
+        :param mask: Bitmask of the weeks that changed.
+        :param booked: True if the weeks were booked, False if they were released.
+        """
+        step = 1 if booked else -1
+        with self._lock:
+            for week in _weeks_in_mask(mask):
+                key = (campsite.size, week)
+                self._booked[key] = self._booked.get(key, 0) + step
+            self.version += 1
+
+    @staticmethod
+    def week_of(arrival_date):
+        """
+        Returns the week ordinal a booking arriving on a date would be allocated to.
+
+        :param arrival_date: Arrival date as a date, datetime or 'YYYY-MM-DD' string.
+        :return: Week ordinal of the Saturday-adjusted week.
+        """
+        if isinstance(arrival_date, str):
+            arrival_date = datetime.strptime(arrival_date, '%Y-%m-%d')
+        return week_ordinal(Booking.adjust_to_saturday(arrival_date))
+
+    def free_count(self, size, arrival_date):
+        """
+        Returns how many campsites of a size are free for the week a booking arriving on a date would get.
+
+        :param size: Campsite size category.
+        :param arrival_date: Arrival date as a date, datetime or 'YYYY-MM-DD' string.
+        :return: Number of free campsites (0 for unknown sizes).
+        """
+        week = self.week_of(arrival_date)
+        return self.site_counts.get(size, 0) - self._booked.get((size, week), 0)
+
+    def free_counts(self, arrival_date):
+        """
+        Returns the free campsites of every size for the week a booking arriving on a date would get.
+
+        :param arrival_date: Arrival date as a date, datetime or 'YYYY-MM-DD' string.
+        :return: Dictionary mapping size to the number of free campsites.
+        """
+        week = self.week_of(arrival_date)
+        return {size: count - self._booked.get((size, week), 0) for size, count in self.site_counts.items()}
@@ -0,0 +1,173 @@
+import numpy as np
+from datetime import datetime, timedelta
+from operator import attrgetter, methodcaller
+from Models.allocation_strategy import allocate_bookings_sequentially
+from Models.campsite import UNIX_EPOCH_ORDINAL, WEEK_EPOCH
+from Utils.logging_config import logger
+
+# Day number of WEEK_EPOCH from the datetime64 epoch
+_EPOCH_DAY = WEEK_EPOCH.toordinal() - UNIX_EPOCH_ORDINAL
+
+def saturday_week_indices(arrival_dates):
+    """
+    Computes the Saturday-adjusted week ordinal of every arrival date in one vectorized step.
+
+    Matches Booking.adjust_to_saturday followed by week_ordinal for each date.
+
+    :param arrival_dates: Sequence of dates/datetimes or a datetime64 array.
+    :return: int64 NumPy array of week ordinals.
+    """
+    if isinstance(arrival_dates, np.ndarray):
+        days = arrival_dates.astype('datetime64[D]').astype(np.int64)
+    else:
+        # toordinal is much faster than NumPy's conversion of Python date objects
+        days = np.fromiter(map(methodcaller('toordinal'), arrival_dates), dtype=np.int64,
+                           count=len(arrival_dates)) - UNIX_EPOCH_ORDINAL
+    weekday = (days + 3) % 7  # 1970-01-01 was a Thursday, Monday is 0 as in date.weekday()
+    saturdays = days + (5 - weekday) % 7
+    return (saturdays - _EPOCH_DAY) // 7
+
+def load_occupancy_matrix(campsites, first_week, week_count):
+    """
+    Loads the occupancy bitmaps of the campsites into a sites x weeks boolean matrix.
+
+    :param campsites: Campsite objects in allocation order.
+    :param first_week: Week ordinal of the first matrix column.
+    :param week_count: Number of week columns.
+    :return: Boolean NumPy array, True where a site is booked for a week.
+    """
+    matrix = np.zeros((len(campsites), week_count), dtype=bool)
+    byte_count = (week_count + 7) // 8
+    window = (1 << week_count) - 1
+    for row, campsite in enumerate(campsites):
+        bits = (campsite.occupied_weeks >> first_week) & window
+        if bits:
+            packed = np.frombuffer(bits.to_bytes(byte_count, 'little'), dtype=np.uint8)
+            matrix[row] = np.unpackbits(packed, bitorder='little')[:week_count].astype(bool)
+    return matrix
+
+def _fill_saturated_group(demands, remaining, success):
+    """
+    Continues greedy first-fit in a group after its first booking that did not fit.
+
+    Only bookings no larger than the remaining capacity can succeed, so this loops at most
+    `remaining` times no matter how many bookings are left in the group.
+
+    :param demands: Campsites requested by the bookings after the first overflow, in order.
+    :param remaining: Free campsites left in the group.
+    :param success: Boolean view into the success flags for those bookings, updated in place.
+    """
+    position = 0
+    while remaining > 0 and position < len(demands):
+        fits = np.flatnonzero(demands[position:] <= remaining)
+        if not len(fits):
+            return
+        position += fits[0]
+        success[position] = True
+        remaining -= demands[position]
+        position += 1
+
+def allocate_bookings_vectorized(bookings, campsites):
+    """
+    Allocates a whole run of bookings with array operations, matching greedy first-fit exactly.
+
+    The result is the same as calling allocate_campsites for each booking in order: every booking
+    receives the lowest free campsites of its size for its Saturday-adjusted week, or nothing if its
+    whole group does not fit. Campsites are booked and bookings updated with the allocation.
+
+    :param bookings: List of Booking objects in processing order.
+    :param campsites: CampsiteInventory or list of Campsite objects, in first-fit order.
+    :return: List aligned with bookings holding the allocated site numbers, or None where allocation failed.
+    :raises ValueError: If a booking's week starts before WEEK_EPOCH, as with week_ordinal.
+    """
+    sites = list(campsites)
+    if not bookings:
+        return []
+    size_names = list(map(attrgetter('campsite_size'), bookings))
+    requested_sizes = set(size_names)
+    if None in requested_sizes:
+        # Bookings without a size compete with every size, which the grouped engine cannot model
+        logger.warning("Bookings without a campsite size found, falling back to per-booking allocation.")
+        return allocate_bookings_sequentially(bookings, campsites)
+
+    # Encode sizes as integers; sizes missing from the inventory can never be allocated
+    size_codes = {}
+    for campsite in sites:
+        size_codes.setdefault(campsite.size, len(size_codes))
+    missing_code = len(size_codes)
+    for size in requested_sizes - set(size_codes):
+        size_codes[size] = missing_code
+    sizes = np.fromiter(map(size_codes.__getitem__, size_names), dtype=np.int64, count=len(bookings))
+    demands = np.fromiter((count or 1 for count in map(attrgetter('num_campsites'), bookings)),
+                          dtype=np.int64, count=len(bookings))
+    weeks = saturday_week_indices(list(map(attrgetter('arrival_date'), bookings)))
+
+    first_week = int(weeks.min())
+    if first_week < 0:
+        # Negative weeks have no bit in the occupancy bitmaps; fail as the per-booking path does
+        raise ValueError(f"Dates before {WEEK_EPOCH} are not supported: {WEEK_EPOCH + timedelta(weeks=first_week)}")
+    week_count = int(weeks.max()) - first_week + 1
+    occupancy = load_occupancy_matrix(sites, first_week, week_count)
+    site_sizes = np.fromiter((size_codes[campsite.size] for campsite in sites), dtype=np.int64, count=len(sites))
+
+    # Free campsites per (size, week) group; the extra row is the empty "missing size" group
+    free_counts = np.zeros((missing_code + 1, week_count), dtype=np.int64)
+    np.add.at(free_counts, site_sizes, ~occupancy)
+
+    # Order bookings by group while keeping their original order inside each group
+    groups = sizes * week_count + (weeks - first_week)
+    order = np.argsort(groups, kind='stable')
+    sorted_groups = groups[order]
+    sorted_demands = demands[order]
+    group_boundaries = np.r_[True, sorted_groups[1:] != sorted_groups[:-1]]
+    group_starts = np.flatnonzero(group_boundaries)
+    group_ends = np.r_[group_starts[1:], len(order)]
+    group_index = np.cumsum(group_boundaries) - 1  # Group number of every sorted booking
+    capacity = free_counts.ravel()[sorted_groups[group_starts]]
+
+    # Bookings whose running demand fits the group capacity all succeed
+    running = np.cumsum(sorted_demands)
+    running_in_group = running - (running[group_starts] - sorted_demands[group_starts])[group_index]
+    success = running_in_group <= capacity[group_index]
+
+    # Groups that overflowed may still fit smaller bookings after the first failure
+    for start, end, cap in zip(group_starts, group_ends, capacity):
+        first_failure = start + np.searchsorted(running_in_group[start:end], cap, side='right')
+        if first_failure < end:
+            used = running_in_group[first_failure - 1] if first_failure > start else 0
+            _fill_saturated_group(sorted_demands[first_failure:end], cap - used, success[first_failure:end])
+
+    # Successful bookings take consecutive slices of their group's free campsite list
+    granted = np.where(success, sorted_demands, 0)
+    granted_running = np.cumsum(granted)
+    slot_starts = granted_running - granted - (granted_running[group_starts] - granted[group_starts])[group_index]
+
+    results = [None] * len(bookings)
+    free_sites = {}
+    for position in np.flatnonzero(success):
+        group = int(sorted_groups[position])
+        if group not in free_sites:
+            size_code, week = divmod(group, week_count)
+            free_sites[group] = np.flatnonzero((site_sizes == size_code) & ~occupancy[:, week])
+        start = slot_starts[position]
+        results[order[position]] = free_sites[group][start:start + sorted_demands[position]].tolist()
+
+    # Book the campsites and record the allocation on each booking
+    week_starts = {}
+    for index in np.sort(order[success]).tolist():
+        rows = results[index]
+        booking = bookings[index]
+        week = int(weeks[index])
+        start_date = week_starts.get(week)
+        if start_date is None:
+            start_date = datetime.combine(WEEK_EPOCH + timedelta(weeks=week), datetime.min.time())
+            week_starts[week] = start_date
+        allocated = [sites[row] for row in rows]
+        for campsite in allocated:
+            campsite.book_week(week, start_date)
+        site_numbers = [campsite.site_number for campsite in allocated]
+        booking.update_campsite_info(site_numbers[0], allocated[0].rate_per_night, site_numbers)
+        results[index] = site_numbers
+
+    logger.info(f"Vectorized allocation placed {int(success.sum())} of {len(bookings)} bookings.")
+    return results
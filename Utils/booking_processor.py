@@ -1,25 +1,58 @@
 from datetime import timedelta
 from Database.cosmos_db import insert_booking_to_cosmos 
-from Models.campsite import allocate_campsite
+from Models.campsite import allocate_campsites
+from Models.allocation_strategy import GreedyStrategy, get_allocation_strategy
 from Models.booking import create_booking_data, Booking
+from Models.booking_frame import BookingFrame
 from Utils.confirmation import generate_confirmation
 from Utils.logging_config import logger
 
-def process_bookings(bookings, campsites, head_office_conn, cosmos_conn, campground_id):
+def process_bookings(bookings, campsites, head_office_conn, cosmos_conn, campground_id, batch=False, strategy=GreedyStrategy.name,
+                     cosmos_bulk=False):
     """
     Processes bookings by allocating campsites and inserting booking data into Cosmos DB.
     
     :param bookings: List of Booking objects.
-    :param campsites: List of Campsite objects available for allocation.
+    :param campsites: List of Campsite objects (or a CampsiteInventory) available for allocation.
     :param cosmos_conn: Connection to the Cosmos DB.
     :param campground_id: The ID of the campground.
+    :param batch: If True, allocate the whole run at once with the vectorized engine (same results as the per-booking path).
+    :param strategy: Name of the allocation strategy ('greedy', 'best_fit' or 'revenue').
+    :param cosmos_bulk: If True, write the allocated bookings to Cosmos DB together at the end, concurrently,
+                        instead of one at a time as each is allocated.
+    :return: Tuple (booking_ids stored in Cosmos DB, including bookings an earlier run already stored,
+             booking_ids that were allocated but whose confirmation or Cosmos DB write failed).
+             Bookings rejected for lack of free campsites are in neither list.
+    :raises ValueError: If the strategy is unknown, or batch is requested for a strategy other than greedy.
     """
+    # Resolve the strategy first so a bad name fails before anything is booked
+    allocator = get_allocation_strategy(strategy, vectorized=batch)
+
+    valid_bookings = []
     for booking in bookings:
         # Ensure the booking is an instance of the Booking class
         if not isinstance(booking, Booking):
             logger.error(f"Expected Booking object but got {type(booking)}. Skipping this record.")
             continue
-        
+        valid_bookings.append(booking)
+
+    # Booking documents waiting for the bulk write, or None to write each as it is allocated
+    pending = [] if cosmos_bulk else None
+    allocated, stored = [], []
+
+    if batch or strategy != GreedyStrategy.name:
+        # Allocate every booking in one pass, then confirm and store the successful ones
+        allocations = allocator.allocate(valid_bookings, campsites)
+        for booking, site_numbers in zip(valid_bookings, allocations):
+            if site_numbers:
+                allocated.append(booking.booking_id)
+                if complete_booking(booking, site_numbers, cosmos_conn, campground_id, pending) and pending is None:
+                    stored.append(booking.booking_id)
+            else:
+                log_failed_booking(booking)
+        return finish_writes(allocated, stored, pending)
+
+    for booking in valid_bookings:
         # Adjust booking dates to start on Saturday and end a week later
         adjusted_start_date = Booking.adjust_to_saturday(booking.arrival_date)
         adjusted_end_date = adjusted_start_date + timedelta(days=7)
@@ -27,37 +60,151 @@ def process_bookings(bookings, campsites, head_office_conn, cosmos_conn, campgro
         # Log processing attempt for the current booking
         logger.info(f"Processing Booking {booking.booking_id}...")
 
-        # Attempt to allocate a campsite for the booking
-        allocated_campsite = allocate_campsite(campsites, adjusted_start_date, adjusted_end_date, booking)
-        if allocated_campsite:
-            try:
-                # **NO UPDATE to Head Office**, just switch the `campground_id` locally
-                booking.campground_id = campground_id
-                
-                # Update the booking object with allocated campsite details
-                booking.update_campsite_info(allocated_campsite.site_number, allocated_campsite.rate_per_night)
-                
-                # Generate a confirmation document (PDF) for the booking
-                generate_confirmation(booking)
-                
-                # Prepare booking data and insert it into Cosmos DB
-                booking_data = create_booking_data(booking)
-                insert_booking_to_cosmos_db(cosmos_conn, booking_data)
-                
-                # Log success message for the processed booking
-                logger.info(f"Booking {booking.booking_id} processed successfully: "
-                            f"allocated to Campsite {allocated_campsite.site_number} and inserted into Cosmos DB.")
-                print(f"Booking {booking.booking_id} processed successfully: "
-                      f"allocated to Campsite {allocated_campsite.site_number} and inserted into Cosmos DB.")
-            except Exception as e:
-                # Log errors encountered during the processing of the booking
-                logger.error(f"Error processing Booking {booking.booking_id}: {e}")
+        # Attempt to reserve every campsite the booking asked for in one operation
+        allocated_campsites = allocate_campsites(campsites, adjusted_start_date, adjusted_end_date, booking)
+        if allocated_campsites:
+            # Update the booking object with allocated campsite details
+            site_numbers = [campsite.site_number for campsite in allocated_campsites]
+            booking.update_campsite_info(site_numbers[0], allocated_campsites[0].rate_per_night, site_numbers)
+            allocated.append(booking.booking_id)
+            if complete_booking(booking, site_numbers, cosmos_conn, campground_id, pending) and pending is None:
+                stored.append(booking.booking_id)
         else:
-            # Log a message if no campsites were available for the booking
-            logger.warning(
-                f"Booking {booking.booking_id} failed: No available campsites for the week starting "
-                f"{adjusted_start_date.strftime('%Y-%m-%d')}."
-            )
+            log_failed_booking(booking)
+    return finish_writes(allocated, stored, pending)
+
+def finish_writes(allocated, stored, pending):
+    """
+    Bulk-writes the booking documents queued by complete_booking, if any.
+
+    :param allocated: List of the booking_ids that were allocated campsites.
+    :param stored: List of the booking_ids already stored one at a time.
+    :param pending: List of queued booking data dictionaries, or None.
+    :return: Tuple (the stored list, extended with the booking_ids the bulk write stored,
+             the allocated booking_ids that were not stored).
+    """
+    if pending:
+        # Imported here so the per-booking path does not need azure.cosmos.aio and aiohttp
+        from Database.cosmos_bulk import bulk_write_bookings
+        reports = bulk_write_bookings(pending)
+        stored.extend(report['booking_id'] for report in reports if report['status'] != 'failed')
+    stored_ids = set(stored)
+    return stored, [booking_id for booking_id in allocated if booking_id not in stored_ids]
+
+def process_booking_stream(booking_batches, campsites, head_office_conn, cosmos_conn, campground_id,
+                           stored_allocations=None, batch=False, strategy=GreedyStrategy.name, on_batch=None,
+                           cosmos_bulk=False):
+    """
+    Processes bookings batch by batch as they arrive, e.g. from stream_booking_batches.
+
+    Each batch is allocated and stored before the next is read, and only a summary view of it is kept,
+    so memory stays flat however long the stream is. Greedy allocation gives the same results as
+    processing the whole run at once; the other strategies optimize within each batch.
+
+    :param booking_batches: Iterable of lists of Booking objects.
+    :param campsites: List of Campsite objects (or a CampsiteInventory) available for allocation.
+    :param head_office_conn: Connection to the Head Office database.
+    :param cosmos_conn: Connection to the Cosmos DB.
+    :param campground_id: The ID of the campground.
+    :param stored_allocations: Allocations from earlier runs; bookings found there are not allocated again (optional).
+    :param batch: If True, allocate each batch with the vectorized engine.
+    :param strategy: Name of the allocation strategy ('greedy', 'best_fit' or 'revenue').
+    :param on_batch: Function called with each processed batch of bookings, the set of their booking_ids that are
+                     stored in Cosmos DB, by this run or an earlier one, and the list of those that were allocated
+                     but failed to confirm or store, e.g. to record allocations (optional).
+    :param cosmos_bulk: If True, write each batch's allocated bookings to Cosmos DB together, concurrently.
+    :return: BookingFrame summary view of every booking in the stream, for generate_summary.
+    """
+    # Resolve the strategy first so a bad name fails before anything is read or booked
+    get_allocation_strategy(strategy, vectorized=batch)
+
+    stored_allocations = stored_allocations or {}
+    frames = []
+    for bookings in booking_batches:
+        new_bookings = filter_new_bookings(bookings, stored_allocations)
+        stored, failed = process_bookings(new_bookings, campsites, head_office_conn, cosmos_conn, campground_id,
+                                          batch=batch, strategy=strategy, cosmos_bulk=cosmos_bulk)
+        if on_batch:
+            stored = set(stored)
+            stored.update(booking.booking_id for booking in bookings if booking.booking_id in stored_allocations)
+            on_batch(bookings, stored, failed)
+        frames.append(BookingFrame.summary_view(bookings))
+    return BookingFrame.concat(frames)
+
+def filter_new_bookings(bookings, stored_allocations):
+    """
+    Separates bookings that still need allocating from those allocated by an earlier run.
+
+    Bookings found in stored_allocations get their stored campsites and cost back so summaries
+    still include them; only the remaining bookings are returned for processing.
+
+    :param bookings: List of Booking objects.
+    :param stored_allocations: Dictionary mapping booking_id to its stored allocation dictionary.
+    :return: List of Booking objects that have not been allocated yet.
+    """
+    new_bookings = []
+    for booking in bookings:
+        record = stored_allocations.get(booking.booking_id)
+        if record is None:
+            new_bookings.append(booking)
+            continue
+        booking.campsite_id = record.get('campsite_id')
+        booking.campsite_allocations = list(record.get('campsite_allocations') or [booking.campsite_id])
+        booking.total_cost = record.get('total_cost', 0)
+    logger.info(f"{len(bookings) - len(new_bookings)} bookings already allocated, {len(new_bookings)} new.")
+    return new_bookings
+
+def complete_booking(booking, site_numbers, cosmos_conn, campground_id, pending=None):
+    """
+    Confirms an allocated booking and inserts it into Cosmos DB.
+
+    :param booking: Booking object that has been allocated campsites.
+    :param site_numbers: Site numbers allocated to the booking.
+    :param cosmos_conn: Connection to the Cosmos DB.
+    :param campground_id: The ID of the campground.
+    :param pending: List to add the booking data to for a later bulk write, instead of inserting it now (optional).
+    :return: True if the booking was stored in Cosmos DB (or queued for the bulk write), False otherwise.
+    """
+    try:
+        # **NO UPDATE to Head Office**, just switch the `campground_id` locally
+        booking.campground_id = campground_id
+
+        # Generate a confirmation document (PDF) for the booking; without one the booking is left for the next run
+        if not generate_confirmation(booking):
+            logger.error(f"Booking {booking.booking_id} was not stored: its confirmation could not be saved.")
+            return False
+
+        # Prepare booking data and insert it into Cosmos DB
+        booking_data = create_booking_data(booking)
+        if pending is not None:
+            pending.append(booking_data)
+        elif not insert_booking_to_cosmos_db(cosmos_conn, booking_data):
+            return False
+
+        # Log success message for the processed booking
+        stored = "queued for Cosmos DB" if pending is not None else "inserted into Cosmos DB"
+        logger.info(f"Booking {booking.booking_id} processed successfully: "
+                    f"allocated to Campsite(s) {site_numbers} and {stored}.")
+        print(f"Booking {booking.booking_id} processed successfully: "
+              f"allocated to Campsite(s) {site_numbers} and {stored}.")
+        return True
+    except Exception as e:
+        # Log errors encountered during the processing of the booking
+        logger.error(f"Error processing Booking {booking.booking_id}: {e}")
+        return False
+
+def log_failed_booking(booking):
+    """
+    Logs a booking that could not be allocated.
+
+    :param booking: Booking object that was not allocated.
+    """
+    adjusted_start_date = Booking.adjust_to_saturday(booking.arrival_date)
+    # Log a message if not enough campsites were available for the booking
+    logger.warning(
+        f"Booking {booking.booking_id} failed: Not enough available campsites for the week starting "
+        f"{adjusted_start_date.strftime('%Y-%m-%d')}."
+    )
 
 # Function to insert booking data into Cosmos DB
 def insert_booking_to_cosmos_db(cosmos_conn, booking_data):
@@ -66,11 +213,15 @@ def insert_booking_to_cosmos_db(cosmos_conn, booking_data):
     
     :param cosmos_conn: Connection to the Cosmos DB.
     :param booking_data: Dictionary containing booking data.
+    :return: True if the booking is stored in Cosmos DB, False otherwise.
     """
     try:
         # Attempt to insert the booking data into Cosmos DB
-        insert_booking_to_cosmos(cosmos_conn, booking_data)
+        if not insert_booking_to_cosmos(cosmos_conn, booking_data):
+            return False
         logger.info(f"Booking {booking_data['booking_id']} inserted into Cosmos DB successfully.")
+        return True
     except Exception as e:
         # Log any errors encountered during the insert operation
-        logger.error(f"An error occurred while inserting booking {booking_data['booking_id']}: {e}")
\ No newline at end of file
+        logger.error(f"An error occurred while inserting booking {booking_data['booking_id']}: {e}")
+        return False
\ No newline at end of file
@@ -1,28 +1,155 @@
-from Models.campsite import Campsite
+import json
+import os
+from datetime import datetime, timedelta
+from Database.cosmos_db import fetch_allocation_stats, fetch_booked_allocations
+from Models.booking import Booking
+from Models.campsite import Campsite, CampsiteInventory
 from Utils.logging_config import logger
 
-def initialize_campsites():
+# Default campground layout as (size, number of sites, nightly rate)
+DEFAULT_CAMPSITE_LAYOUT = (
+    ('Small', 10, 50),
+    ('Medium', 10, 60),
+    ('Large', 10, 70),
+)
+
+def initialize_campsites(layout=DEFAULT_CAMPSITE_LAYOUT):
     """
-    Initializes a list of campsites with predefined sizes and rates.
+    Initializes the campsites with predefined sizes and rates.
+
+    Site numbers are assigned consecutively from 1 in layout order.
 
-    :return: A list of Campsite objects.
+    :param layout: Sequence of (size, count, rate_per_night) tuples.
+    :return: A CampsiteInventory holding the Campsite objects.
     """
     campsites = []  # List to hold the initialized campsites
 
-    # Add 10 Small campsites with a nightly rate of 50
-    for i in range(1, 11):
-        campsites.append(Campsite(site_number=i, size='Small', rate_per_night=50))
+    # Add each block of campsites with its size and nightly rate
+    for size, count, rate_per_night in layout:
+        first_site = len(campsites) + 1
+        for i in range(first_site, first_site + count):
+            campsites.append(Campsite(site_number=i, size=size, rate_per_night=rate_per_night))
 
-    # Add 10 Medium campsites with a nightly rate of 60
-    for i in range(11, 21):
-        campsites.append(Campsite(site_number=i, size='Medium', rate_per_night=60))
+    # Log the initialization of campsites
+    breakdown = ", ".join(f"{count} {size}" for size, count, _ in layout)
+    logger.info(f"Initialized {len(campsites)} campsites: {breakdown}.")
 
-    # Add 10 Large campsites with a nightly rate of 70
-    for i in range(21, 31):
-        campsites.append(Campsite(site_number=i, size='Large', rate_per_night=70))
+    return CampsiteInventory(campsites)
 
-    # Log the initialization of campsites
-    logger.info(f"Initialized {len(campsites)} campsites: 10 Small, 10 Medium, 10 Large.")
-    
-    return campsites
+def allocation_record(booking):
+    """
+    Builds the stored form of a booking's allocation, as kept in snapshots and Cosmos DB.
+
+    :param booking: Allocated Booking object.
+    :return: Dictionary with booking_id, arrival_date, campsite_id, campsite_allocations and total_cost.
+    """
+    return {
+        "booking_id": booking.booking_id,
+        "arrival_date": booking.arrival_date.strftime('%Y-%m-%d'),
+        "campsite_id": booking.campsite_id,
+        "campsite_allocations": booking.campsite_allocations,
+        "total_cost": booking.total_cost
+    }
+
+def restore_allocations(campsites, allocations):
+    """
+    Books the campsites of previously stored allocations so they are no longer free.
+
+    :param campsites: CampsiteInventory or list of Campsite objects.
+    :param allocations: Iterable of allocation dictionaries (see allocation_record).
+    :return: Dictionary mapping booking_id to its allocation dictionary.
+    """
+    sites_by_number = {campsite.site_number: campsite for campsite in campsites}
+    restored = {}
+    for record in allocations:
+        site_numbers = record.get('campsite_allocations') or [record.get('campsite_id')]
+        arrival_date = record['arrival_date']
+        if isinstance(arrival_date, str):
+            arrival_date = datetime.strptime(arrival_date, '%Y-%m-%d')
+        start_date = Booking.adjust_to_saturday(arrival_date)
+        end_date = start_date + timedelta(days=7)
+
+        for site_number in site_numbers:
+            campsite = sites_by_number.get(site_number)
+            if campsite is None:
+                logger.warning(f"Stored allocation of Booking {record['booking_id']} refers to unknown Campsite {site_number}.")
+            elif not campsite.book_campsite(start_date, end_date):
+                logger.warning(f"Stored allocation of Booking {record['booking_id']} overlaps Campsite {site_number}.")
+        restored[record['booking_id']] = record
+    return restored
+
+def save_allocation_snapshot(snapshot_path, bookings, stored_allocations=None):
+    """
+    Writes the allocations of the allocated bookings to a local JSON snapshot file.
+
+    The file is replaced atomically so an interrupted run never leaves a partial snapshot.
+
+    :param snapshot_path: Path of the snapshot file.
+    :param bookings: Iterable of Booking objects; unallocated bookings are skipped.
+    :param stored_allocations: Allocations loaded at warm start, kept even if their bookings were not fetched this run.
+    """
+    allocations = dict(stored_allocations or {})
+    for booking in bookings:
+        if booking.campsite_id is not None:
+            allocations[booking.booking_id] = allocation_record(booking)
+    records = list(allocations.values())
+    temp_path = f"{snapshot_path}.tmp"
+    with open(temp_path, 'w') as file:
+        json.dump(records, file)
+    os.replace(temp_path, snapshot_path)
+    logger.info(f"Saved {len(records)} allocations to snapshot {snapshot_path}.")
+
+def load_allocation_snapshot(snapshot_path):
+    """
+    Reads the allocations stored in a local JSON snapshot file.
+
+    :param snapshot_path: Path of the snapshot file.
+    :return: List of allocation dictionaries, or None if the file does not exist or cannot be read.
+    """
+    if not os.path.exists(snapshot_path):
+        return None
+    try:
+        with open(snapshot_path, 'r') as file:
+            return json.load(file)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error reading allocation snapshot {snapshot_path}: {e}")
+        return None
+
+def warm_start_campsites(cosmos_conn=None, snapshot_path=None, layout=DEFAULT_CAMPSITE_LAYOUT, campground_id=None):
+    """
+    Initializes the campsites with the occupancy of allocations made by earlier runs.
+
+    The local snapshot is used when it exists and still matches Cosmos DB; otherwise the allocations
+    stored in the Cosmos DB Bookings container are loaded. A snapshot is only written at the end of a
+    run, so after a crash it misses bookings already stored; it is checked against the number and the
+    highest booking_id of the stored allocations, and Cosmos DB is used when they differ. Without
+    either source the campsites start empty.
+
+    :param cosmos_conn: Cosmos DB container client for the Bookings container (optional).
+    :param snapshot_path: Path of a local allocation snapshot file (optional).
+    :param layout: Sequence of (size, count, rate_per_night) tuples.
+    :param campground_id: Only load Cosmos DB allocations for this campground (optional).
+    :return: Tuple (CampsiteInventory, dictionary mapping booking_id to its stored allocation).
+    :raises exceptions.CosmosHttpResponseError: If the allocations cannot be read from Cosmos DB.
+    """
+    campsites = initialize_campsites(layout)
+    allocations = load_allocation_snapshot(snapshot_path) if snapshot_path else None
+    source = f"snapshot {snapshot_path}"
+    if allocations is not None and cosmos_conn is not None:
+        booking_ids = {allocation['booking_id'] for allocation in allocations}
+        snapshot_stats = (len(booking_ids), max(booking_ids, default=None))
+        stored_stats = fetch_allocation_stats(cosmos_conn, campground_id)
+        if snapshot_stats != stored_stats:
+            logger.warning(f"Snapshot {snapshot_path} holds {snapshot_stats[0]} allocations up to booking "
+                           f"{snapshot_stats[1]}, Cosmos DB {stored_stats[0]} up to booking {stored_stats[1]}; "
+                           f"loading the allocations from Cosmos DB.")
+            allocations = None
+    if allocations is None and cosmos_conn is not None:
+        allocations = fetch_booked_allocations(cosmos_conn, campground_id)
+        source = "Cosmos DB"
+    if not allocations:
+        return campsites, {}
 
+    restored = restore_allocations(campsites, allocations)
+    logger.info(f"Warm-started campsites with {len(restored)} allocations from {source}.")
+    return campsites, restored
@@ -0,0 +1,233 @@
+import logging
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from Database.head_office_db import fetch_bookings
+from Models.allocation_strategy import GreedyStrategy, get_allocation_strategy
+from Models.booking import Booking
+from Models.campsite import week_ordinal
+from Utils.campsite_manager import DEFAULT_CAMPSITE_LAYOUT, initialize_campsites
+from Utils.logging_config import logger
+
+# Booking records shared with worker processes, set once per worker by _init_worker
+_worker_records = None
+
+class Scenario:
+    """
+    A what-if scenario: a campground layout, optional demand changes and an allocation strategy.
+    """
+
+    def __init__(self, name, layout=DEFAULT_CAMPSITE_LAYOUT, demand_multipliers=None, strategy=GreedyStrategy.name):
+        """
+        Initializes a Scenario.
+
+        :param name: Label shown in the results.
+        :param layout: Sequence of (size, count, rate_per_night) tuples, as for initialize_campsites.
+        :param demand_multipliers: Dictionary mapping arrival month (1-12) to a demand factor, e.g. {1: 2.0}
+                                   doubles January bookings (optional).
+        :param strategy: Name of the allocation strategy (see ALLOCATION_STRATEGIES).
+        """
+        self.name = name
+        self.layout = tuple(layout)
+        self.demand_multipliers = dict(demand_multipliers or {})
+        self.strategy = strategy
+
+    def __repr__(self):
+        """Provides a string representation of the Scenario object."""
+        return f"<Scenario {self.name}>"
+
+    def with_extra_sites(self, size, count, rate_per_night=None, name=None):
+        """
+        Creates a copy of the scenario with extra campsites of one size.
+
+        :param size: Size category of the new campsites.
+        :param count: Number of campsites to add.
+        :param rate_per_night: Nightly rate of the new campsites (defaults to the existing rate for the size).
+        :param name: Name of the new scenario (defaults to a description of the change).
+        :return: New Scenario object.
+        """
+        layout = list(self.layout)
+        for index, (block_size, block_count, block_rate) in enumerate(layout):
+            if block_size == size and rate_per_night in (None, block_rate):
+                layout[index] = (block_size, block_count + count, block_rate)
+                break
+        else:
+            if rate_per_night is None:
+                raise ValueError(f"A rate is required to add campsites of new size '{size}'.")
+            layout.append((size, count, rate_per_night))
+        return Scenario(name or f"{self.name} +{count} {size}", layout, self.demand_multipliers, self.strategy)
+
+    def with_demand(self, month, factor, name=None):
+        """
+        Creates a copy of the scenario with demand in one arrival month scaled.
+
+        :param month: Arrival month (1-12).
+        :param factor: Demand factor for the month, multiplied with any existing factor.
+        :param name: Name of the new scenario (defaults to a description of the change).
+        :return: New Scenario object.
+        """
+        multipliers = dict(self.demand_multipliers)
+        multipliers[month] = multipliers.get(month, 1.0) * factor
+        return Scenario(name or f"{self.name} x{factor:g} month {month}", self.layout, multipliers, self.strategy)
+
+def synthetic_booking_records(count, seed=0, season_start=datetime(2026, 1, 3), weeks=52,
+                              size_weights=(('Small', 5), ('Medium', 3), ('Large', 2)), group_sizes=(1, 1, 1, 2, 3)):
+    """
+    Generates booking records in the fetch_bookings row format.
+
+    :param count: Number of booking records.
+    :param seed: Random seed for a reproducible booking set.
+    :param season_start: First possible arrival date.
+    :param weeks: Number of weeks the arrivals are spread over.
+    :param size_weights: Sequence of (size, weight) pairs for the requested campsite size.
+    :param group_sizes: Campsite counts to draw from for each booking.
+    :return: List of record tuples accepted by Booking.from_db_record.
+    """
+    rng = random.Random(seed)
+    sizes = [size for size, _ in size_weights]
+    weights = [weight for _, weight in size_weights]
+    records = []
+    for booking_id in range(1, count + 1):
+        arrival_date = season_start + timedelta(days=rng.randrange(weeks * 7))
+        records.append((booking_id, rng.randrange(1, count + 1), arrival_date - timedelta(days=rng.randrange(1, 120)),
+                        arrival_date, 1, rng.choices(sizes, weights)[0], rng.choice(group_sizes), None))
+    return records
+
+def head_office_booking_records(conn, campground_id=1):
+    """
+    Loads a booking set for replay from the Head Office database. Nothing is written back.
+
+    :param conn: Connection to the Head Office SQL database.
+    :param campground_id: The Head Office campground whose bookings are loaded.
+    :return: List of record tuples accepted by Booking.from_db_record.
+    """
+    return [tuple(row) for row in fetch_bookings(conn, campground_id)]
+
+def apply_demand(records, demand_multipliers, seed=0):
+    """
+    Scales the number of bookings arriving in given months.
+
+    A factor of 2.5 keeps every booking of the month, adds one copy of each and a second copy of
+    half of them at random; a factor of 0.5 keeps a random half. Copies get new booking IDs.
+
+    :param records: List of booking record tuples.
+    :param demand_multipliers: Dictionary mapping arrival month (1-12) to a demand factor.
+    :param seed: Random seed for the fractional part of each factor.
+    :return: New list of booking record tuples.
+    """
+    if not demand_multipliers:
+        return records
+    rng = random.Random(seed)
+    next_id = max((record[0] for record in records), default=0) + 1
+    scaled = []
+    for record in records:
+        factor = demand_multipliers.get(record[3].month, 1.0)
+        copies = int(factor) + (rng.random() < factor - int(factor))
+        for copy in range(copies):
+            if copy == 0:
+                scaled.append(record)
+            else:
+                scaled.append((next_id,) + tuple(record[1:]))
+                next_id += 1
+    return scaled
+
+def simulate_scenario(scenario, records):
+    """
+    Replays a booking set against the scenario's campground with the real allocation code.
+
+    :param scenario: Scenario object.
+    :param records: List of booking record tuples.
+    :return: Result dictionary with the allocation rate, revenue and utilization of the scenario.
+    """
+    bookings = Booking.from_db_records(apply_demand(records, scenario.demand_multipliers))
+    campsites = initialize_campsites(scenario.layout)
+    strategy = get_allocation_strategy(scenario.strategy, vectorized=scenario.strategy == GreedyStrategy.name)
+    allocations = strategy.allocate(bookings, campsites) if bookings else []
+
+    allocated = sum(1 for sites in allocations if sites)
+    revenue = sum(booking.total_cost for booking, sites in zip(bookings, allocations) if sites)
+
+    # Utilization is the share of site-weeks booked over the weeks the booking set covers
+    utilization = {}
+    if bookings:
+        # Week ordinals grow with the arrival date, so only the earliest and latest arrivals are converted
+        arrival_dates = [booking.arrival_date for booking in bookings]
+        first_week = week_ordinal(Booking.adjust_to_saturday(min(arrival_dates)))
+        week_count = week_ordinal(Booking.adjust_to_saturday(max(arrival_dates))) - first_week + 1
+        window = (1 << week_count) - 1
+        booked_weeks, site_weeks = {}, {}
+        for campsite in campsites:
+            booked = bin((campsite.occupied_weeks >> first_week) & window).count('1')
+            booked_weeks[campsite.size] = booked_weeks.get(campsite.size, 0) + booked
+            site_weeks[campsite.size] = site_weeks.get(campsite.size, 0) + week_count
+        utilization = {size: booked_weeks[size] / site_weeks[size] for size in site_weeks}
+        utilization['overall'] = sum(booked_weeks.values()) / sum(site_weeks.values())
+
+    return {
+        'scenario': scenario.name,
+        'sites': len(campsites),
+        'bookings': len(bookings),
+        'allocated': allocated,
+        'allocation_rate': allocated / len(bookings) if bookings else 0.0,
+        'revenue': revenue,
+        'utilization': utilization
+    }
+
+def _init_worker(records):
+    """
+    Stores the booking set in a worker process and silences logging there.
+
+    :param records: List of booking record tuples.
+    """
+    global _worker_records
+    _worker_records = records
+    logging.disable(logging.CRITICAL)
+
+def _simulate_in_worker(scenario):
+    """
+    Runs one scenario against the worker's booking set.
+
+    :param scenario: Scenario object.
+    :return: Result dictionary from simulate_scenario.
+    """
+    return simulate_scenario(scenario, _worker_records)
+
+def run_scenarios(scenarios, records, max_workers=None):
+    """
+    Runs many scenarios against the same booking set, in parallel worker processes.
+
+    The booking set is sent to each worker once, and allocation logging is silenced while
+    scenarios run so it does not dominate the run time.
+
+    :param scenarios: List of Scenario objects.
+    :param records: List of booking record tuples.
+    :param max_workers: Number of worker processes (defaults to the number of CPUs; 1 runs in this process).
+    :return: List of result dictionaries in scenario order.
+    """
+    scenarios = list(scenarios)
+    logger.info(f"Simulating {len(scenarios)} scenarios against {len(records)} bookings.")
+    if max_workers == 1 or len(scenarios) <= 1:
+        previous_disable = logging.root.manager.disable
+        logging.disable(logging.CRITICAL)
+        try:
+            return [simulate_scenario(scenario, records) for scenario in scenarios]
+        finally:
+            logging.disable(previous_disable)
+
+    # A few chunks per worker keeps the workers busy without sending scenarios one at a time
+    chunksize = max(1, len(scenarios) // (4 * (max_workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(records,)) as executor:
+        return list(executor.map(_simulate_in_worker, scenarios, chunksize=chunksize))
+
+def display_scenario_results(results):
+    """
+    Displays the results of a scenario run as a table.
+
+    :param results: List of result dictionaries from run_scenarios.
+    """
+    print(f"\n{'Scenario':<30} {'Sites':>6} {'Bookings':>9} {'Allocated':>10} {'Rate':>7} {'Revenue':>12} {'Utilization':>12}")
+    for result in results:
+        utilization = result['utilization'].get('overall', 0.0)
+        print(f"{result['scenario']:<30} {result['sites']:>6} {result['bookings']:>9} {result['allocated']:>10} "
+              f"{result['allocation_rate']:>7.1%} {result['revenue']:>12,.0f} {utilization:>12.1%}")
@@ -1,33 +1,56 @@
 import json
 import os
 import re
+import threading
 from Utils.logging_config import logger
 
-def load_config(file_name):
+# Directory holding the configuration files and SQL scripts
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Assets')
+
+# Named placeholder with an example value, e.g. /*campground_id*/1 or /*name*/'Jane', compiled once
+PLACEHOLDER_PATTERN = re.compile(r"/\*(\w+)\*/(?:'[^']*'|[\w.\-]+)")
+
+# Parsed configuration files by path, with the modification time and size they were parsed at
+_config_cache = {}
+_config_lock = threading.Lock()
+
+def load_config(file_name='connection_strings.json'):
     """
-    Loads the configuration JSON file from the assets folder.
+    Loads a configuration JSON file from the Assets folder, parsing it only when it has changed.
 
-    :param file_name: The name of the JSON configuration file.
+    The parsed file is cached and reused until the file's modification time or size changes, so
+    connecting once per booking costs a stat call instead of reading and parsing the file. The
+    returned dictionary is shared by every caller and must not be modified.
+
+    :param file_name: The name of the JSON configuration file (defaults to connection_strings.json).
     :return: A dictionary containing the configuration settings.
     :raises FileNotFoundError: If the configuration file does not exist.
     :raises JSONDecodeError: If the file content is not valid JSON.
     """
-    # Defines the base directory and file path for the configuration file
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    file_path = os.path.join(base_dir, 'assets', file_name)
-    
+    file_path = os.path.join(ASSETS_DIR, file_name)
+
     try:
-        # Open and read the JSON configuration file
-        with open(file_path, 'r') as file:
-            config = json.load(file)
-            logger.info(f"Configuration loaded from {file_name}.")
-            return config
+        stat = os.stat(file_path)
     except FileNotFoundError:
         logger.error(f"Configuration file not found: {file_path}")
         raise
-    except json.JSONDecodeError:
-        logger.error(f"Error decoding JSON from the configuration file: {file_path}")
-        raise
+    version = (stat.st_mtime_ns, stat.st_size)
+
+    with _config_lock:
+        cached = _config_cache.get(file_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        try:
+            # Open and read the JSON configuration file
+            with open(file_path, 'r') as file:
+                config = json.load(file)
+        except json.JSONDecodeError:
+            logger.error(f"Error decoding JSON from the configuration file: {file_path}")
+            raise
+        _config_cache[file_path] = (version, config)
+        logger.info(f"Configuration loaded from {file_name}.")
+        return config
 
 # Helps to normalise connection setup
 def get_connection_string(db_type):
@@ -68,55 +91,34 @@ def prepare_query(sql):
     :return: The SQL query with placeholders replaced by '?'.
     """
     # Replace placeholders (e.g., /*param*/value) in SQL with '?'
-    prepared_sql = re.sub(r'/\*\w+\*/\S+', '?', sql)
+    prepared_sql = PLACEHOLDER_PATTERN.sub('?', sql)
     logger.info("SQL query prepared with placeholders.")
     return prepared_sql
 
 def get_sql_query(filename):
     """
-    Reads a SQL file from the assets/sql directory.
+    Returns the text of a SQL file from the Assets/sql directory, with its placeholders replaced by '?'.
+
+    The text comes from the statement registry, which reads the directory once (see Utils.sql_registry).
 
     :param filename: The name of the SQL file to read.
     :return: The content of the SQL file as a string.
     :raises FileNotFoundError: If the SQL file does not exist.
     """
-    # Define the base directory and file path for the SQL file
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    sql_dir = os.path.join(base_dir, 'assets', 'sql')
-    file_path = os.path.join(sql_dir, filename)
-
-    try:
-        # Open and read the SQL file
-        with open(file_path, 'r') as file:
-            sql_query = file.read()
-            logger.info(f"SQL query loaded from {filename}.")
-            return sql_query
-    except FileNotFoundError:
-        logger.error(f"SQL file not found: {file_path}")
-        raise
+    return load_sql_query(os.path.splitext(filename)[0])
 
 def load_sql_query(query_name):
     """
-    Loads a specific SQL query from the assets/sql directory.
+    Loads a specific SQL query from the Assets/sql directory, with its placeholders replaced by '?'.
 
     :param query_name: The name of the SQL query file without extension.
     :return: The content of the SQL query file as a string.
     :raises FileNotFoundError: If the SQL file does not exist.
-    :raises Exception: For other errors encountered during the file read operation.
     """
-    # Define the base directory and file path for the SQL query file
-    base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    file_path = os.path.join(base_dir, 'assets', 'sql', f"{query_name}.sql")
-    
+    # Imported here because the registry locates its files through this module
+    from Utils.sql_registry import get_statement
     try:
-        # Open and read the SQL query file
-        with open(file_path, 'r') as file:
-            sql_query = file.read()
-            logger.info(f"SQL query {query_name} loaded successfully.")
-            return sql_query
-    except FileNotFoundError:
-        logger.error(f"SQL file not found: {file_path}")
-        raise
-    except Exception as e:
-        logger.error(f"Error loading SQL query {query_name}: {e}")
-        raise
+        return get_statement(query_name).sql
+    except KeyError:
+        logger.error(f"SQL file not found: {query_name}.sql")
+        raise FileNotFoundError(f"SQL file not found: {query_name}.sql")
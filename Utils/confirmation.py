@@ -53,6 +53,7 @@ def generate_confirmation(booking):
     Generates a confirmation PDF for the given booking and inserts it into the Cosmos DB.
 
     :param booking: The booking object containing the details to be included in the PDF.
+    :return: True if the confirmation PDF was stored in Cosmos DB, False otherwise.
     """
     # Define the folder path for saving PDFs
     folder_path = "pdfs"
@@ -69,9 +70,12 @@ def generate_confirmation(booking):
         # Connect to the Cosmos DB container named 'PDFs'
         cosmos_container = connect_to_cosmos("PDFs")
         # Upsert the PDF into Cosmos DB using the specified booking ID
-        upsert_booking_pdf_to_cosmos(cosmos_container, filename, booking.booking_id)
+        if not upsert_booking_pdf_to_cosmos(cosmos_container, filename, booking.booking_id):
+            return False
         logger.info(f"Confirmation PDF {filename} inserted into Cosmos DB successfully.")
+        return True
     except Exception as e:
         # Log any errors encountered during the insertion process
         logger.error(f"An error occurred while inserting the confirmation PDF: {e}")
+        return False
         
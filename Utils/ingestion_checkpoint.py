@@ -0,0 +1,83 @@
+import json
+import os
+from datetime import datetime
+from Utils.logging_config import logger
+
+# Directory holding one high-water-mark file per Head Office campground, under the project's Logs folder
+DEFAULT_CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Logs', 'checkpoints')
+
+def checkpoint_path(campground_id, checkpoint_dir=DEFAULT_CHECKPOINT_DIR):
+    """
+    Returns the checkpoint file of a Head Office campground.
+
+    Each campground has its own file, so campgrounds processed in parallel never write the same file.
+
+    :param campground_id: The Head Office campground the checkpoint belongs to.
+    :param checkpoint_dir: Directory of the checkpoint files.
+    :return: Path of the checkpoint file.
+    """
+    return os.path.join(checkpoint_dir, f"head_office_{campground_id}.json")
+
+def load_checkpoint(campground_id, checkpoint_dir=DEFAULT_CHECKPOINT_DIR):
+    """
+    Reads the last booking_id processed for a Head Office campground.
+
+    :param campground_id: The Head Office campground whose checkpoint is read.
+    :param checkpoint_dir: Directory of the checkpoint files.
+    :return: The last processed booking_id, or None if there is no readable checkpoint.
+    """
+    path = checkpoint_path(campground_id, checkpoint_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as file:
+            return json.load(file)['last_booking_id']
+    except (OSError, ValueError, KeyError) as e:
+        logger.error(f"Error reading ingestion checkpoint {path}, falling back to a full sync: {e}")
+        return None
+
+def save_checkpoint(campground_id, last_booking_id, checkpoint_dir=DEFAULT_CHECKPOINT_DIR):
+    """
+    Records the last booking_id processed for a Head Office campground.
+
+    The file is replaced atomically so an interrupted run never leaves a partial checkpoint.
+
+    :param campground_id: The Head Office campground the checkpoint belongs to.
+    :param last_booking_id: The highest booking_id processed, or None to fetch every booking next time.
+    :param checkpoint_dir: Directory of the checkpoint files.
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    path = checkpoint_path(campground_id, checkpoint_dir)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w') as file:
+        json.dump({
+            "campground_id": campground_id,
+            "last_booking_id": last_booking_id,
+            "updated_at": datetime.now().isoformat(timespec='seconds')
+        }, file)
+    os.replace(temp_path, path)
+    if last_booking_id is None:
+        logger.info(f"Ingestion checkpoint for campground {campground_id} reset; the next run fetches every booking.")
+    else:
+        logger.info(f"Ingestion checkpoint for campground {campground_id} advanced to booking {last_booking_id}.")
+
+def advance_checkpoint(last_booking_id, booking_ids, failed_ids):
+    """
+    Moves a checkpoint over processed bookings, stopping before the first one that failed to store.
+
+    A booking that was allocated but failed to confirm or reach Cosmos DB must be fetched again by the
+    next run, so the checkpoint never passes it, even if later bookings were stored. Bookings rejected
+    for lack of free campsites are passed, so a fully booked week cannot hold the checkpoint back.
+
+    :param last_booking_id: The current checkpoint (None before the first booking).
+    :param booking_ids: IDs of the fetched bookings, following the current checkpoint.
+    :param failed_ids: Collection of the booking IDs that were allocated but failed to confirm or store.
+    :return: Tuple (new checkpoint, True if a booking that failed to store stopped it).
+    """
+    failed_ids = set(failed_ids)
+    for booking_id in sorted(booking_ids):
+        if booking_id in failed_ids:
+            logger.warning(f"Booking {booking_id} was not stored; the ingestion checkpoint stays before it.")
+            return last_booking_id, True
+        last_booking_id = booking_id
+    return last_booking_id, False
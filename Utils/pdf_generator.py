@@ -61,11 +61,12 @@ class PDFGenerator(FPDF):
         logger.info(f"Confirmation PDF generated and saved as {filename}.")
         return filename  # Return the path to the generated PDF
 
-    def generate_summary(self, summary):
+    def generate_summary(self, summary, filename=None):
         """
         Generates a summary PDF for a day's bookings.
 
         :param summary: Summary object containing the summary data.
+        :param filename: Name of the PDF file (defaults to summary_<date>.pdf).
         :return: The path to the generated PDF file.
         """
         self.add_page()  # Add a new page to the PDF
@@ -78,7 +79,7 @@ class PDFGenerator(FPDF):
         self.cell(0, 10, f"Total Bookings: {summary.total_bookings}", ln=True) # Add the total bookings
 
         # Define the filename and save the PDF
-        filename = os.path.join(PDF_FOLDER, f"summary_{summary.summary_date}.pdf")
+        filename = os.path.join(PDF_FOLDER, filename or f"summary_{summary.summary_date}.pdf")
         self.output(filename)  # Output the PDF to the specified file
         logger.info(f"Summary PDF generated and saved as {filename}.")
         return filename  # Return the path to the generated PDF
@@ -0,0 +1,132 @@
+import os
+import threading
+from Utils.config_loader import ASSETS_DIR, PLACEHOLDER_PATTERN
+from Utils.logging_config import logger
+
+# Directory of the SQL statement files; subdirectories hold the versions of statements for other dialects
+SQL_DIR = os.path.join(ASSETS_DIR, 'sql')
+
+# Dialect of the files at the top of SQL_DIR (Azure SQL)
+BASE_DIALECT = 'tsql'
+
+class Statement:
+    """
+    A SQL statement loaded from a file, with its named placeholders replaced by '?'.
+
+    Named placeholders are written /*name*/example_value in the file, so the file still runs as it
+    is in a query editor. Their names are kept in order, so parameters can be bound by name even
+    when dialects put them in different orders. Files may also use plain '?' placeholders.
+    """
+
+    __slots__ = ('name', 'dialect', 'sql', 'param_names')
+
+    def __init__(self, name, dialect, text):
+        """
+        Initializes a Statement.
+
+        :param name: Name of the statement (the file name without extension).
+        :param dialect: SQL dialect the statement is written for.
+        :param text: Content of the SQL file.
+        """
+        names = []
+
+        def placeholder(match):
+            names.append(match.group(1))
+            return '?'
+
+        self.name = name
+        self.dialect = dialect
+        self.sql = PLACEHOLDER_PATTERN.sub(placeholder, text).strip()
+        self.param_names = tuple(names)
+
+    def __repr__(self):
+        """Provides a string representation of the Statement object."""
+        return f"<Statement {self.dialect}/{self.name} {self.param_names}>"
+
+    def bind(self, values=()):
+        """
+        Returns the parameters of the statement in placeholder order.
+
+        :param values: Dictionary of parameters by name for statements with named placeholders,
+                       or a sequence of parameters in order for statements with '?' placeholders.
+        :return: Tuple of parameters for cursor.execute.
+        :raises KeyError: If a named parameter is missing.
+        """
+        if self.param_names:
+            return tuple(values[name] for name in self.param_names)
+        return tuple(values)
+
+class StatementRegistry:
+    """
+    Every SQL statement in a directory, read and prepared once and handed out by name.
+
+    Handing out the same text on every call keeps the statements identical, so the server can
+    reuse their cached plans, and no file is read on the query path.
+    """
+
+    def __init__(self, sql_dir=SQL_DIR):
+        """
+        Initializes a StatementRegistry and loads every .sql file of the directory and its dialect subdirectories.
+
+        :param sql_dir: Directory of the SQL files.
+        """
+        self.sql_dir = sql_dir
+        self._statements = {}
+        for dialect, directory in [(BASE_DIALECT, sql_dir)] + [
+                (entry.name, entry.path) for entry in os.scandir(sql_dir) if entry.is_dir()]:
+            for entry in os.scandir(directory):
+                name, extension = os.path.splitext(entry.name)
+                if entry.is_file() and extension == '.sql':
+                    with open(entry.path, 'r') as file:
+                        self._statements[(dialect, name)] = Statement(name, dialect, file.read())
+        logger.info(f"Loaded {len(self._statements)} SQL statements from {sql_dir}.")
+
+    def get(self, name, dialect=BASE_DIALECT):
+        """
+        Returns a statement by name, in the version for a dialect if there is one.
+
+        :param name: Name of the statement (the file name without extension).
+        :param dialect: SQL dialect of the connection, e.g. 'tsql' or 'sqlite'.
+        :return: Statement object.
+        :raises KeyError: If there is no statement with that name.
+        """
+        statement = self._statements.get((dialect, name)) or self._statements.get((BASE_DIALECT, name))
+        if statement is None:
+            raise KeyError(f"Unknown SQL statement '{name}'.")
+        return statement
+
+    def names(self):
+        """
+        Returns the names of the loaded statements.
+
+        :return: Sorted list of statement names.
+        """
+        return sorted({name for _, name in self._statements})
+
+# Registry of Assets/sql, loaded on first use
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    """
+    Returns the registry of the Assets/sql statements, loading every file the first time.
+
+    :return: StatementRegistry object.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = StatementRegistry()
+    return _registry
+
+def get_statement(name, dialect=BASE_DIALECT):
+    """
+    Returns a statement of Assets/sql by name, in the version for a dialect if there is one.
+
+    :param name: Name of the statement (the file name without extension).
+    :param dialect: SQL dialect of the connection, e.g. 'tsql' or 'sqlite'.
+    :return: Statement object.
+    :raises KeyError: If there is no statement with that name.
+    """
+    return get_registry().get(name, dialect)
@@ -2,26 +2,33 @@ from datetime import datetime
 import logging
 from Database.sql_db import connect_to_sql
 from Database.head_office_db import connect_to_head_office
+from Database.connection_pool import get_pool
+from Models.booking_frame import as_booking_frame
 from Models.summary import Summary
 from Utils.pdf_generator import PDFGenerator
 from Database.cosmos_db import connect_to_cosmos, upsert_summary_pdf_to_cosmos
 from Utils.logging_config import logger
+from Utils.sql_registry import get_statement
 
-def create_and_insert_summary(bookings):
+def create_and_insert_summary(bookings, campground_id=1121132, sql_conn=None, head_office_conn=None):
     """
     Creates and inserts a daily summary of bookings into the local SQL database and the Head Office database.
     Also generates a PDF confirmation of the summary and inserts it into Cosmos DB.
 
-    :param bookings: List of processed Booking objects.
+    :param bookings: List of processed Booking objects or a BookingFrame.
+    :param campground_id: The ID of the campground the summary is for.
+    :param sql_conn: Open local SQL connection to use (optional; checked out from the pool otherwise).
+    :param head_office_conn: Open Head Office connection to use (optional; checked out from the pool otherwise).
     """
     try:
         # Calculate total sales and count of successful bookings
-        total_sales = sum(booking.total_cost for booking in bookings if booking.campsite_id is not None)
-        total_bookings = len([booking for booking in bookings if booking.campsite_id is not None])
+        frame = as_booking_frame(bookings)
+        total_sales = frame.total_sales()
+        total_bookings = frame.successful_allocations()
 
         # Create a summary object with the calculated data
         summary = Summary(
-            campground_id=1121132,  # Your student ID as campground ID
+            campground_id=campground_id,
             summary_date=datetime.now().date(),
             total_sales=total_sales,
             total_bookings=total_bookings
@@ -32,11 +39,11 @@ def create_and_insert_summary(bookings):
         logger.info(f"Summary validated and created for {summary.summary_date}.")
         
         # Insert summary into local and Head Office databases
-        insert_summary_into_databases(summary)
+        insert_summary_into_databases(summary, sql_conn, head_office_conn)
         
         # Generate and save the summary PDF
         pdf_gen = PDFGenerator("Daily Summary Report")
-        pdf_path = pdf_gen.generate_summary(summary)
+        pdf_path = pdf_gen.generate_summary(summary, f"summary_{campground_id}_{summary.summary_date}.pdf")
         logger.info("Summary PDF generated and saved.")
 
         # Connect to Cosmos DB and upsert the summary PDF
@@ -52,27 +59,36 @@ def create_and_insert_summary(bookings):
         print(f"An error occurred while processing the summary.")
 
 
-def insert_summary_into_databases(summary):
+def insert_summary_into_databases(summary, sql_conn=None, head_office_conn=None):
     """
     Inserts the summary into both the local SQL and Head Office databases.
 
+    Connections that are not given are checked out from the connection pools and returned afterwards,
+    instead of opening and closing a connection for every summary.
+
     :param summary: Summary object containing summary data.
+    :param sql_conn: Open local SQL connection to use (optional).
+    :param head_office_conn: Open Head Office connection to use (optional).
     """
     try:
-        # Connect to the local SQL database and insert the summary
-        sql_conn = connect_to_sql()  # Connect to the local camping SQL database
-        insert_summary(sql_conn, summary.to_dict())  # Insert into local camping database
-        sql_conn.close()
+        # Insert the summary into the local camping SQL database
+        if sql_conn is None:
+            with get_pool('sql', connect_to_sql).connection() as conn:
+                insert_summary(conn, summary.to_dict())
+        else:
+            insert_summary(sql_conn, summary.to_dict())
         logger.info("Summary inserted into the local SQL database.")
 
     except Exception as e:
         logger.error(f"Error inserting into the local SQL database: {e}")
 
     try:
-        # Connect to the Head Office database and write the summary
-        head_office_conn = connect_to_head_office()  # Connect to the Head Office SQL database
-        write_summary_to_head_office(head_office_conn, summary.to_dict())  # Insert into Head Office database
-        head_office_conn.close()
+        # Write the summary to the Head Office SQL database
+        if head_office_conn is None:
+            with get_pool('head_office', connect_to_head_office).connection() as conn:
+                write_summary_to_head_office(conn, summary.to_dict())
+        else:
+            write_summary_to_head_office(head_office_conn, summary.to_dict())
         logger.info("Summary written to the Head Office database.")
 
     except Exception as e:
@@ -89,18 +105,14 @@ def insert_summary(conn, summary_data):
     try:
         cursor = conn.cursor()
         # SQL query to insert summary data into the local camping SQL database
-        query = """
-            INSERT INTO camping.summary (campground_id, summary_date, total_sales, total_bookings)
-            VALUES (?, ?, ?, ?)
-        """
+        statement = get_statement('insert_summary')
         # Execute the query with the summary data
-        cursor.execute(
-            query,
+        cursor.execute(statement.sql, (
             summary_data['campground_id'],
             summary_data['summary_date'],
             summary_data['total_sales'],
             summary_data['total_bookings']
-        )
+        ))
         conn.commit()
         logger.info("Insert into local SQL database successful.")
 
@@ -118,12 +130,9 @@ def write_summary_to_head_office(conn, summary_data):
     try:
         cursor = conn.cursor()
         # SQL query to insert summary data into the Head Office database
-        query = """
-        INSERT INTO camping.summary (campground_id, summary_date, total_sales, total_bookings)
-        VALUES (?, ?, ?, ?)
-        """
+        statement = get_statement('write_summary_to_head_office')
         # Execute the query with the summary data
-        cursor.execute(query, (
+        cursor.execute(statement.sql, (
             summary_data["campground_id"], 
             summary_data["summary_date"],
             summary_data["total_sales"], 
@@ -140,30 +149,26 @@ def generate_summary(bookings, campsites):
     """
     Generates a summary of the booking allocations and campsite utilization.
 
-    :param bookings: List of Booking objects.
+    :param bookings: List of Booking objects or a BookingFrame.
     :param campsites: List of Campsite objects.
     :return: A summary dictionary containing booking statistics and utilization data.
     """
     logger.info("Generating summary from booking data.")
-    
-    # Calculate total sales, successful allocations, and failed allocations
-    total_sales = sum(booking.total_cost for booking in bookings if booking.campsite_id is not None)
-    successful_allocations = sum(1 for booking in bookings if booking.campsite_id is not None)
-    failed_allocations = len(bookings) - successful_allocations
+    frame = as_booking_frame(bookings)
 
-    # Initialize campsite utilization data
-    campsite_utilization = {c.site_number: {'size': c.size, 'rate_per_night': c.rate_per_night, 'bookings_count': 0} for c in campsites}
+    # Calculate total sales, successful allocations, and failed allocations
+    total_sales = frame.total_sales()
+    successful_allocations = frame.successful_allocations()
+    failed_allocations = len(frame) - successful_allocations
 
-    # Update utilization data based on successful bookings
-    for booking in bookings:
-        if booking.campsite_id is not None:
-            campsite_utilization[booking.campsite_id]['bookings_count'] += 1
+    # Count the allocated bookings on every campsite
+    campsite_utilization = frame.site_utilization(campsites)
 
     # Compile summary data into a dictionary
     summary_data = {
         'date': datetime.now().date(),
         'total_sales': total_sales,
-        'total_bookings': len(bookings),
+        'total_bookings': len(frame),
         'successful_allocations': successful_allocations,
         'failed_allocations': failed_allocations,
         'campsite_utilization': campsite_utilization
@@ -190,3 +195,59 @@ def display_summary(summary):
     for site_number, details in summary['campsite_utilization'].items():
         print(f"Campsite {site_number}: Size - {details['size']}, Rate - ${details['rate_per_night']} per night, "
               f"Total Bookings - {details['bookings_count']}")  
+
+
+def consolidate_summaries(summaries):
+    """
+    Merges per-campground summaries into one consolidated report.
+
+    :param summaries: Dictionary mapping campground_id to its summary dictionary from generate_summary,
+                      or to None if the campground failed to process.
+    :return: A report dictionary with overall totals, per-campground totals and the failed campgrounds.
+    """
+    campgrounds = {}
+    failed_campgrounds = []
+    for campground_id in sorted(summaries):
+        summary = summaries[campground_id]
+        if summary is None:
+            failed_campgrounds.append(campground_id)
+            continue
+        campgrounds[campground_id] = {
+            'total_sales': summary['total_sales'],
+            'total_bookings': summary['total_bookings'],
+            'successful_allocations': summary['successful_allocations'],
+            'failed_allocations': summary['failed_allocations']
+        }
+
+    report = {
+        'date': datetime.now().date(),
+        'total_sales': sum(totals['total_sales'] for totals in campgrounds.values()),
+        'total_bookings': sum(totals['total_bookings'] for totals in campgrounds.values()),
+        'successful_allocations': sum(totals['successful_allocations'] for totals in campgrounds.values()),
+        'failed_allocations': sum(totals['failed_allocations'] for totals in campgrounds.values()),
+        'campgrounds': campgrounds,
+        'failed_campgrounds': failed_campgrounds
+    }
+
+    logger.info(f"Consolidated Summary Data: {report}")
+    return report
+
+
+def display_consolidated_summary(report):
+    """
+    Displays the consolidated report of several campgrounds.
+
+    :param report: A report dictionary from consolidate_summaries.
+    """
+    # Print one line per campground, then the overall totals
+    print("\nConsolidated Summary of Booking Allocations:")
+    for campground_id, totals in report['campgrounds'].items():
+        print(f"Campground {campground_id}: Total Bookings - {totals['total_bookings']}, "
+              f"Successful - {totals['successful_allocations']}, Failed - {totals['failed_allocations']}, "
+              f"Sales - ${totals['total_sales']:.2f}")
+    for campground_id in report['failed_campgrounds']:
+        print(f"Campground {campground_id}: processing failed, check the log file for details.")
+    print(f"\nTotal Bookings: {report['total_bookings']}")
+    print(f"Successful Allocations: {report['successful_allocations']}")
+    print(f"Failed Allocations: {report['failed_allocations']}")
+    print(f"Total Sales: ${report['total_sales']:.2f}")
@@ -1,11 +1,22 @@
+import argparse
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from Database.sql_db import connect_to_sql
-from Database.head_office_db import connect_to_head_office, fetch_bookings
+from Database.head_office_db import (connect_to_head_office, fetch_bookings, fetch_bookings_parallel,
+                                     stream_booking_batches, update_booking_campgrounds)
 from Database.cosmos_db import connect_to_cosmos
+from Database.connection_pool import get_pool
+from Database.sql_backend import DATABASE_ERRORS, get_sql_backend
+from Models.allocation_strategy import ALLOCATION_STRATEGIES, GreedyStrategy
 from Models.booking import Booking
-from Utils.booking_processor import process_bookings
-from Utils.campsite_manager import initialize_campsites
-from Utils.summary_manager import generate_summary, display_summary, create_and_insert_summary
+from Models.booking_frame import as_booking_frame
+from Utils.booking_processor import filter_new_bookings, process_booking_stream, process_bookings
+from Utils.campsite_manager import (allocation_record, initialize_campsites, save_allocation_snapshot,
+                                    warm_start_campsites)
+from Utils.ingestion_checkpoint import DEFAULT_CHECKPOINT_DIR, advance_checkpoint, load_checkpoint, save_checkpoint
+from Utils.summary_manager import (generate_summary, display_summary, create_and_insert_summary,
+                                   consolidate_summaries, display_consolidated_summary)
 from Utils.logging_config import logger  
 
 # Configure logging to display only INFO level and above, suppressing verbose logs from external libraries
@@ -13,69 +24,279 @@ logging.basicConfig(level=logging.INFO, format='%(message)s')
 logging.getLogger('azure.cosmos').setLevel(logging.WARNING)  # Suppress detailed Cosmos DB logs
 logging.getLogger('urllib3').setLevel(logging.WARNING)       # Suppress detailed urllib3 logs
 
-def main():
+def process_campground(campground_id=1121132, source_campground_id=None, strategy=GreedyStrategy.name, batch=False,
+                       warm_start=True, snapshot_path=None, display=True, arraysize=None, incremental=False,
+                       checkpoint_dir=DEFAULT_CHECKPOINT_DIR, write_back=False, parallel=None, cosmos_bulk=False):
     """
-    Main function that handles the workflow of connecting to databases, processing bookings,
-    initializing campsites, and generating summaries.
+    Processes the bookings of one campground with its own connections, campsite inventory and summary.
 
-    The function performs the following steps:
-    1. Connects to SQL, Head Office, and Cosmos DB.
-    2. Initializes campsite data.
-    3. Fetches and processes booking records from Head Office.
-    4. Generates and displays a summary of the bookings.
-    5. Creates and inserts the summary data into relevant databases.
+    :param campground_id: The ID the processed bookings and summary are recorded under.
+    :param source_campground_id: The Head Office campground whose bookings are fetched (defaults to campground_id).
+    :param strategy: Name of the campsite allocation strategy (see ALLOCATION_STRATEGIES).
+    :param batch: If True, allocate with the vectorized batch engine (greedy strategy only).
+    :param warm_start: If True, reload earlier allocations and only process bookings that are new.
+    :param snapshot_path: Local allocation snapshot to warm-start from and update (optional).
+    :param display: If True, print the campground's summary.
+    :param arraysize: If given, stream bookings from Head Office in batches of this many rows and process each
+                      batch as it arrives, instead of loading them all first.
+    :param incremental: If True, only fetch bookings after the campground's ingestion checkpoint; if False, re-sync
+                        every booking. Incremental runs need the warm-started allocations of the earlier bookings, so
+                        without them (cold start, or nothing stored) every booking is fetched. The checkpoint is moved
+                        to the last booking stored in Cosmos DB with no unstored booking before it, either way.
+    :param checkpoint_dir: Directory of the per-campground ingestion checkpoints.
+    :param write_back: If True, record the new campground_id of every newly allocated booking in Head Office,
+                       in one bulk transaction at the end of the run.
+    :param parallel: If given (and not streaming), fetch the bookings over this many key ranges at once, each on
+                     its own Head Office connection; meant for backfills and full re-syncs.
+    :param cosmos_bulk: If True, write the allocated bookings to Cosmos DB concurrently with the bulk writer
+                        (per stream batch when streaming) instead of one at a time.
+    :return: Summary dictionary from generate_summary with the campground_id added, or None if processing failed.
+        With incremental ingestion the summary only covers the bookings fetched by this run.
     """
     sql_conn = None
     head_office_conn = None
     cosmos_conn = None
+    database_error = False
+    if source_campground_id is None:
+        source_campground_id = campground_id
+
+    # Connections come from the process's pools, so a worker processing several campgrounds reuses them
+    sql_pool = get_pool('sql', connect_to_sql)
+    head_office_pool = get_pool('head_office', connect_to_head_office)
 
     try:
-        # Connect to SQL, Head Office, and Cosmos DB
-        sql_conn = connect_to_sql()
-        head_office_conn = connect_to_head_office()
+        # Check out SQL and Head Office connections, and connect to Cosmos DB
+        sql_conn = sql_pool.acquire()
+        head_office_conn = head_office_pool.acquire()
         cosmos_conn = connect_to_cosmos("Bookings")
 
-        # Initialize campsites and fetch all bookings from Head Office database
-        campsites = initialize_campsites()
-        raw_bookings = fetch_bookings(head_office_conn)
+        # Initialize campsites with earlier allocations and fetch the campground's bookings from Head Office database
+        if warm_start:
+            campsites, stored_allocations = warm_start_campsites(cosmos_conn, snapshot_path, campground_id=campground_id)
+        else:
+            campsites, stored_allocations = initialize_campsites(), {}
 
-        # Convert raw booking records into Booking objects
-        bookings = []
-        for record in raw_bookings:
-            try:
-                booking = Booking.from_db_record(record)  # Convert database record to Booking object
-                bookings.append(booking)  # Add to bookings list
-            except Exception as e:
-                logger.error(f"Error processing booking record: {e}")
+        # Only bookings after the checkpoint are fetched when asked for. The earlier bookings' campsites are then
+        # only known from the stored allocations, so without them every booking is fetched to avoid double-booking
+        previous_checkpoint = load_checkpoint(source_campground_id, checkpoint_dir)
+        after_booking_id = previous_checkpoint if incremental else None
+        if after_booking_id is not None and not stored_allocations:
+            logger.warning(f"No stored allocations for campground {campground_id}; fetching every booking "
+                           f"instead of those after booking {after_booking_id}.")
+            after_booking_id = None
+        if after_booking_id is not None:
+            logger.info(f"Fetching bookings of campground {source_campground_id} after booking {after_booking_id}.")
+        campground_updates = []  # (booking_id, campground_id) of the newly allocated bookings, for write-back
+
+        # The checkpoint moves over processed bookings and stops at the first one that failed to store,
+        # so the next run retries it; bookings rejected for lack of campsites do not hold it back
+        checkpoint, blocked = after_booking_id, False
 
-        # Process bookings, allocate campsites, and update databases
-        campground_id = 1121132  # Set campground ID to my student ID
-        process_bookings(bookings, campsites, head_office_conn, cosmos_conn, campground_id)
+        def record_processed(bookings, failed_ids):
+            nonlocal checkpoint, blocked
+            if bookings and not blocked:
+                checkpoint, blocked = advance_checkpoint(checkpoint, [booking.booking_id for booking in bookings],
+                                                         failed_ids)
+
+        if arraysize:
+            # Allocate each batch of bookings while the next one is fetched, keeping only what the summary needs
+            snapshot_allocations = dict(stored_allocations)
+
+            def after_batch(processed, stored_ids, failed_ids):
+                # Bookings that were allocated but not stored are allocated again by the next run
+                record_processed(processed, failed_ids)
+                if write_back:
+                    campground_updates.extend((booking.booking_id, campground_id) for booking in processed
+                                              if booking.booking_id in stored_ids
+                                              and booking.booking_id not in stored_allocations)
+                if snapshot_path:
+                    snapshot_allocations.update((booking.booking_id, allocation_record(booking))
+                                                for booking in processed if booking.booking_id in stored_ids)
+
+            batches = stream_booking_batches(head_office_conn, source_campground_id, arraysize,
+                                             after_booking_id=after_booking_id)
+            frame = process_booking_stream(batches, campsites, head_office_conn, cosmos_conn, campground_id,
+                                           stored_allocations, batch=batch, strategy=strategy, on_batch=after_batch,
+                                           cosmos_bulk=cosmos_bulk)
+            if snapshot_path:
+                save_allocation_snapshot(snapshot_path, (), snapshot_allocations)
+        else:
+            if parallel:
+                # Extraction connections come from their own pool per parallelism, since a pool keeps its first size
+                extract_pool = get_pool(f'head_office_extract_{parallel}', connect_to_head_office, max_size=parallel)
+                raw_bookings = fetch_bookings_parallel(extract_pool, source_campground_id, parallel, after_booking_id,
+                                                       dialect=get_sql_backend().dialect)
+            else:
+                raw_bookings = fetch_bookings(head_office_conn, source_campground_id, after_booking_id)
+
+            # Convert raw booking records into Booking objects; records that fail to convert are logged and skipped
+            bookings = Booking.from_db_records(raw_bookings)
+
+            # Process bookings, allocate campsites, and update databases
+            new_bookings = filter_new_bookings(bookings, stored_allocations)
+            stored_ids, failed_ids = process_bookings(new_bookings, campsites, head_office_conn, cosmos_conn,
+                                                      campground_id, batch=batch, strategy=strategy,
+                                                      cosmos_bulk=cosmos_bulk)
+            record_processed(bookings, failed_ids)
+            stored_ids = set(stored_ids)
+
+            # Bookings that were allocated but not stored are allocated again by the next run
+            stored_bookings = [booking for booking in new_bookings if booking.booking_id in stored_ids]
+            if write_back:
+                campground_updates.extend((booking.booking_id, campground_id) for booking in stored_bookings)
+            if snapshot_path:
+                save_allocation_snapshot(snapshot_path, stored_bookings, stored_allocations)
+
+            # Summarize from one columnar copy of the bookings
+            frame = as_booking_frame(bookings)
+
+        # Write the allocations back to Head Office in one transaction, once any booking stream is done with the connection
+        if campground_updates:
+            update_booking_campgrounds(head_office_conn, campground_updates, get_sql_backend().dialect)
+
+        # Save the checkpoint only once the fetched bookings have been processed
+        if len(frame) and checkpoint != previous_checkpoint:
+            save_checkpoint(source_campground_id, checkpoint, checkpoint_dir)
 
         # Generate and display a summary of the bookings
-        summary = generate_summary(bookings, campsites)
-        display_summary(summary)
+        summary = generate_summary(frame, campsites)
+        summary['campground_id'] = campground_id
+        if display:
+            display_summary(summary)
 
-        # Create and insert the summary into the relevant databases
-        create_and_insert_summary(bookings)
+        # Create and insert the summary into the relevant databases, reusing this run's connections
+        create_and_insert_summary(frame, campground_id, sql_conn=sql_conn, head_office_conn=head_office_conn)
+        return summary
 
     except Exception as e:
-        # Log any errors that occur during the main process
-        logger.error(f"An error occurred during the main process: {e}")
+        # Log any errors that occur while processing the campground
+        logger.error(f"An error occurred while processing campground {campground_id}: {e}")
         print("An error occurred. Check the log file for details.")
+        database_error = isinstance(e, DATABASE_ERRORS)
+        return None
 
     finally:
-        # Close all database connections and log the closure
+        # Return the database connections to their pools, closing them instead after a database error
         if sql_conn:
-            sql_conn.close()
-            logger.info("SQL connection closed.")
+            sql_pool.release(sql_conn, discard=database_error)
+            logger.info("SQL connection returned to the pool.")
         if head_office_conn:
-            head_office_conn.close()
-            logger.info("Head Office connection closed.")
+            head_office_pool.release(head_office_conn, discard=database_error)
+            logger.info("Head Office connection returned to the pool.")
         logger.info("Cosmos connection closed.")
 
+def main(strategy=GreedyStrategy.name, batch=False, warm_start=True, snapshot_path=None, arraysize=None,
+         incremental=False, write_back=False, parallel=None, cosmos_bulk=False):
+    """
+    Main function that handles the workflow of connecting to databases, processing bookings,
+    initializing campsites, and generating summaries.
+
+    :param strategy: Name of the campsite allocation strategy (see ALLOCATION_STRATEGIES).
+    :param batch: If True, allocate with the vectorized batch engine (greedy strategy only).
+    :param warm_start: If True, reload earlier allocations and only process bookings that are new.
+    :param snapshot_path: Local allocation snapshot to warm-start from and update (optional).
+    :param arraysize: If given, stream bookings from Head Office in batches of this many rows.
+    :param incremental: If True, only fetch bookings after the last one stored; if False, re-sync every booking.
+    :param write_back: If True, record the campground of newly allocated bookings in Head Office in one bulk transaction.
+    :param parallel: If given, fetch the bookings over this many key ranges at once.
+    :param cosmos_bulk: If True, write the allocated bookings to Cosmos DB concurrently with the bulk writer.
+    :return: Summary dictionary, or None if processing failed.
+
+    The function performs the following steps:
+    1. Connects to SQL, Head Office, and Cosmos DB.
+    2. Initializes campsite data, reloading allocations from earlier runs.
+    3. Fetches and processes booking records from Head Office.
+    4. Generates and displays a summary of the bookings.
+    5. Creates and inserts the summary data into relevant databases.
+    """
+    # Head Office campground 1 is processed under my student ID as the campground ID
+    return process_campground(1121132, 1, strategy=strategy, batch=batch, warm_start=warm_start,
+                              snapshot_path=snapshot_path, arraysize=arraysize, incremental=incremental,
+                              write_back=write_back, parallel=parallel, cosmos_bulk=cosmos_bulk)
+
+def run_campgrounds(campground_ids, max_workers=None, strategy=GreedyStrategy.name, batch=False, warm_start=True,
+                    snapshot_dir=None, arraysize=None, incremental=False, write_back=False, parallel=None,
+                    cosmos_bulk=False):
+    """
+    Processes several campgrounds in parallel, one worker process per campground at a time.
+
+    Each worker has its own connection pools and builds its own campsite inventory and summary, so the
+    campgrounds share no state. The per-campground summaries are merged into one report.
+
+    :param campground_ids: Head Office campground IDs to process; each is also the ID its bookings are recorded under.
+    :param max_workers: Number of worker processes (defaults to the number of CPUs).
+    :param strategy: Name of the campsite allocation strategy (see ALLOCATION_STRATEGIES).
+    :param batch: If True, allocate with the vectorized batch engine (greedy strategy only).
+    :param warm_start: If True, reload earlier allocations and only process bookings that are new.
+    :param snapshot_dir: Directory for per-campground allocation snapshots (optional).
+    :param arraysize: If given, each worker streams its bookings from Head Office in batches of this many rows.
+    :param incremental: If True, each worker only fetches bookings after its campground's checkpoint.
+    :param write_back: If True, each worker writes its new allocations back to Head Office in one bulk transaction.
+    :param parallel: If given, each worker fetches its bookings over this many key ranges at once.
+    :param cosmos_bulk: If True, each worker writes its allocated bookings to Cosmos DB with the bulk writer.
+    :return: Consolidated report dictionary from consolidate_summaries.
+    """
+    summaries = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for campground_id in campground_ids:
+            snapshot_path = os.path.join(snapshot_dir, f"allocations_{campground_id}.json") if snapshot_dir else None
+            future = executor.submit(process_campground, campground_id, campground_id, strategy, batch,
+                                     warm_start, snapshot_path, False, arraysize, incremental,
+                                     DEFAULT_CHECKPOINT_DIR, write_back, parallel, cosmos_bulk)
+            futures[future] = campground_id
+
+        # Collect summaries as campgrounds finish; a crashed worker only fails its own campground
+        for future in as_completed(futures):
+            campground_id = futures[future]
+            try:
+                summaries[campground_id] = future.result()
+            except Exception as e:
+                logger.error(f"Worker for campground {campground_id} failed: {e}")
+                summaries[campground_id] = None
+
+    report = consolidate_summaries(summaries)
+    display_consolidated_summary(report)
+    return report
+
 if __name__ == '__main__':
+    # Choose how campsites are allocated from the command line
+    parser = argparse.ArgumentParser(description="Process Head Office bookings for the campground.")
+    parser.add_argument('--strategy', choices=list(ALLOCATION_STRATEGIES), default=GreedyStrategy.name,
+                        help="Campsite allocation strategy.")
+    parser.add_argument('--batch', action='store_true',
+                        help="Use the vectorized batch engine (greedy strategy only).")
+    parser.add_argument('--cold-start', action='store_true',
+                        help="Ignore allocations from earlier runs and allocate every booking (implies a full sync).")
+    parser.add_argument('--snapshot', metavar='PATH',
+                        help="Local allocation snapshot to warm-start from and update after the run.")
+    parser.add_argument('--campgrounds', type=int, nargs='+', metavar='ID',
+                        help="Process these Head Office campgrounds in parallel instead of the default campground.")
+    parser.add_argument('--workers', type=int,
+                        help="Number of worker processes for --campgrounds (defaults to the number of CPUs).")
+    parser.add_argument('--snapshot-dir', metavar='DIR',
+                        help="Directory of per-campground allocation snapshots for --campgrounds.")
+    parser.add_argument('--arraysize', type=int, metavar='N',
+                        help="Stream bookings from Head Office in batches of N rows, allocating each batch as it arrives.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only fetch bookings after the last run's checkpoint; the summary then only covers those.")
+    parser.add_argument('--write-back', action='store_true',
+                        help="Record the campground of newly allocated bookings in Head Office, in one bulk transaction.")
+    parser.add_argument('--parallel', type=int, metavar='N',
+                        help="Fetch bookings over N key ranges at once, each on its own connection (for backfills).")
+    parser.add_argument('--cosmos-bulk', action='store_true',
+                        help="Write allocated bookings to Cosmos DB concurrently, in bulk, instead of one at a time.")
+    args = parser.parse_args()
+
     # Set logger to INFO level to suppress DEBUG-level messages
     logger.setLevel(logging.INFO)
-    main()
+    if args.campgrounds:
+        run_campgrounds(args.campgrounds, max_workers=args.workers, strategy=args.strategy, batch=args.batch,
+                        warm_start=not args.cold_start, snapshot_dir=args.snapshot_dir, arraysize=args.arraysize,
+                        incremental=args.incremental and not args.cold_start, write_back=args.write_back, parallel=args.parallel,
+                        cosmos_bulk=args.cosmos_bulk)
+    else:
+        main(strategy=args.strategy, batch=args.batch, warm_start=not args.cold_start, snapshot_path=args.snapshot,
+             arraysize=args.arraysize, incremental=args.incremental and not args.cold_start, write_back=args.write_back, parallel=args.parallel,
+             cosmos_bulk=args.cosmos_bulk)
     
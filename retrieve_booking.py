@@ -1,13 +1,12 @@
 import sys
-import json
 from azure.cosmos import CosmosClient, exceptions
+from Utils.config_loader import load_config as load_connection_strings
 from Utils.logging_config import logger  
 
-# loads connection string
+# loads connection string (cached until the file changes)
 def load_config():
     try:
-        with open('Assets/connection_strings.json', 'r') as file:
-            return json.load(file)['cosmos_db']
+        return load_connection_strings()['cosmos_db']
     except FileNotFoundError:
         logger.error("Configuration file not found.")
         sys.exit(1)